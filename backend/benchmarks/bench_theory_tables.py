@@ -0,0 +1,52 @@
+"""Micro-benchmark: roman-numeral resolution via lookup tables vs. parsing per call.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_theory_tables [--number N]
+
+The "parsed" column re-creates the pre-table path: split the key string,
+run the symbol regex and rebuild the chord on every call.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from mind_api.mind_core.theory.key import _parse_key_uncached, parse_key
+from mind_api.mind_core.theory.roman import _chord_pcs, _degree_from_symbol, roman_chord_pcs
+
+KEYS = ("C major", "A minor", "F# minor", "Bb major", "E minor", "Ab major")
+ROMANS = ("I", "ii", "iii", "IV", "V", "vi", "vii", "V7", "i", "iv")
+STYLES = ("triads", "7ths", "9ths_soft")
+
+
+def _parsed() -> None:
+    for key_text in KEYS:
+        for roman in ROMANS:
+            for style in STYLES:
+                key = _parse_key_uncached(key_text)
+                _chord_pcs(key.tonic, key.mode, _degree_from_symbol(roman), roman.strip().startswith("V"), style)
+
+
+def _tabled() -> None:
+    for key_text in KEYS:
+        for roman in ROMANS:
+            for style in STYLES:
+                roman_chord_pcs(parse_key(key_text), roman, style)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+    calls = len(KEYS) * len(ROMANS) * len(STYLES) * args.number
+    parsed = min(timeit.repeat(_parsed, number=args.number, repeat=3))
+    tabled = min(timeit.repeat(_tabled, number=args.number, repeat=3))
+    print(f"parsed: {parsed / calls * 1e9:8.1f} ns/chord")
+    print(f"tabled: {tabled / calls * 1e9:8.1f} ns/chord")
+    print(f"speedup: {parsed / tabled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
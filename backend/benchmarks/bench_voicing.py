@@ -0,0 +1,65 @@
+"""Micro-benchmark: voicing a 64-slot progression, closed-form vs. octave loops.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_voicing [--number N]
+
+The "looped" column re-creates the earlier path: voicing each slot's pitch
+classes and then applying the register, each folding notes with while-loops.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import List, Sequence
+
+from mind_api.mind_core.theory import parse_key, roman_chord_pcs
+from mind_api.mind_core.theory.voicing import voice_progression
+
+KEY = parse_key("D minor")
+ROMANS = ("i", "iv", "VII", "III", "VI", "ii", "V7", "i")
+PROGRESSION = [roman_chord_pcs(KEY, ROMANS[slot % len(ROMANS)], "7ths") for slot in range(64)]
+LOW, HIGH = 48, 84
+
+
+def _looped_chord(pcs: Sequence[int], low: int, high: int) -> List[int]:
+    voiced = []
+    for pc in pcs:
+        midi = low + ((pc - low) % 12)
+        while midi < low:
+            midi += 12
+        while midi > high:
+            midi -= 12
+        voiced.append(max(0, min(127, midi)))
+    adjusted = []
+    for pitch in voiced:
+        while pitch < low:
+            pitch += 12
+        while pitch > high:
+            pitch -= 12
+        adjusted.append(max(0, min(127, pitch)))
+    return adjusted
+
+
+def _looped() -> None:
+    [_looped_chord(pcs, LOW, HIGH) for pcs in PROGRESSION]
+
+
+def _closed_form() -> None:
+    voice_progression(PROGRESSION, LOW, HIGH)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+    looped = min(timeit.repeat(_looped, number=args.number, repeat=3)) / args.number
+    closed = min(timeit.repeat(_closed_form, number=args.number, repeat=3)) / args.number
+    print(f"looped:      {looped * 1e6:7.1f} us/progression")
+    print(f"closed-form: {closed * 1e6:7.1f} us/progression")
+    print(f"speedup: {looped / closed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,27 @@ and documentation.  When run via ``uvicorn`` the backend will listen on
 the configured port and serve both the API under ``/api`` and the
 frontend user interface at the root path.
 
-The API consists of three endpoints:
+The main API endpoints are:
 
 * ``POST /api/parse`` – validate a single node script and return a
   structured representation along with any diagnostics.
 * ``POST /api/compile`` – given the current session state (seed, bpm,
   bar index and an array of nodes) compile events for the current bar
   of the 16‑bar loop.
+* ``POST /api/compile/range`` – like ``/api/compile`` but advances
+  ``barCount`` bars in one request, returning per‑bar events and
+  runtime states so the client can schedule several bars ahead.
+* ``POST /api/sessions`` – open a server‑held playback session; then
+  ``POST /api/sessions/{id}/compile`` compiles a bar from just the bar
+  index and graph revision, ``POST /api/sessions/{id}/delta`` applies
+  graph edits without resending the graph, ``POST /api/sessions/{id}/seek``
+  jumps to an absolute bar, ``GET /api/sessions/{id}/trace``
+  returns the last bars of runtime trace, and ``DELETE /api/sessions/{id}``
+  closes it.
+* ``WS /api/stream`` – long‑lived playback channel; the server pushes
+  compiled bars a configurable number of bars ahead of the client's
+  acknowledged playhead and accepts graph edits as deltas.
+* ``GET /api/telemetry`` – runtime counters and cache hit rates.
 * ``GET /api/presets`` – return a list of available preset IDs and
   human friendly names.  These values populate the preset dropdown in
   the frontend.
@@ -27,11 +41,15 @@ imported by ``uvicorn`` with the typical ``module:app`` syntax.
 from __future__ import annotations
 
 import json
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator, Mapping, Optional, Union
+
 from fastapi import FastAPI
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from .mind_core.telemetry import configure_logging
 from .routes import api_router
 
 
@@ -54,9 +72,20 @@ import mimetypes  # noqa: E402
 mimetypes.add_type("audio/sf2", ".sf2")
 
 
-def create_app() -> FastAPI:
-    """Create and configure the FastAPI application."""
-    app = FastAPI(title="MIND Backend", version="0.1")
+def create_app(log_levels: Optional[Mapping[str, Union[int, str]]] = None) -> FastAPI:
+    """Create and configure the FastAPI application.
+
+    ``log_levels`` maps logger names to levels; by default the backend
+    logs warnings and above.  Levels are applied when the server starts
+    the application, so importing this module leaves logging alone.
+    """
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        configure_logging(log_levels)
+        yield
+
+    app = FastAPI(title="MIND Backend", version="0.1", lifespan=lifespan)
 
     # Include API routes under the "/api" prefix
     app.include_router(api_router, prefix="/api")
@@ -9,11 +9,11 @@ from typing import Dict, List, Optional, Set, Tuple
 from ..models import (
     CompileRequest,
     CompileResponse,
-    Event,
     Diagnostic,
     NodeInput,
     RenderSpec,
 )
+from .note_event import NoteEvent, to_event_models
 from .post.chain import apply_render_chain
 from .parser import parse_text
 from .notes import parse_notes_spec, parse_sequence_spec
@@ -112,7 +112,7 @@ def _compile_theory_node(
     bpm: float,
     diagnostics: List[Diagnostic],
     debug_lines: Optional[List[str]] = None,
-) -> List[Event]:
+) -> List[NoteEvent]:
 
     node_text = (node.text or "").strip()
     try:
@@ -186,7 +186,7 @@ def _compile_theory_node(
         hits = _hits_by_segment(pat_norm, steps_per_bar, bar_count)
         base_hit_idx = _compute_base_hit_index(bar_offset, bar_count, hits)
 
-    events: List[Event] = []
+    events: List[NoteEvent] = []
     local_hit = 0
 
     for idx, ch in enumerate(bar_pat):
@@ -209,7 +209,7 @@ def _compile_theory_node(
         duration = max(0.05, step_len_beats * (1 + sustain) * 0.95)
 
         events.append(
-            Event(
+            NoteEvent(
                 tBeat=tbeat,
                 lane=ast.lane,
                 note=pitches[0],
@@ -237,7 +237,7 @@ def _coerce_render_spec(value: object) -> RenderSpec:
 
 def compile_request(req: CompileRequest) -> CompileResponse:
     diagnostics: List[Diagnostic] = []
-    events: List[Event] = []
+    events: List[NoteEvent] = []
 
     nodes = {n.id: n for n in req.nodes if n.enabled}
     outgoing: Dict[str, List[str]] = {node_id: [] for node_id in nodes}
@@ -381,7 +381,7 @@ def compile_request(req: CompileRequest) -> CompileResponse:
                 Diagnostic(level="error", message=f"Render node '{node_id}' is missing a child edge.", line=1, col=1)
             )
 
-    compiled: Dict[str, List[Event]] = {}
+    compiled: Dict[str, List[NoteEvent]] = {}
 
     for node_id in execution_plan:
         node = nodes.get(node_id)
@@ -389,7 +389,7 @@ def compile_request(req: CompileRequest) -> CompileResponse:
             continue
         children = outgoing.get(node_id, [])
         if node.kind == "start":
-            aggregated: List[Event] = []
+            aggregated: List[NoteEvent] = []
             for child_id in children:
                 aggregated.extend(compiled.get(child_id, []))
             compiled[node_id] = aggregated
@@ -413,5 +413,5 @@ def compile_request(req: CompileRequest) -> CompileResponse:
         diagnostics=diagnostics,
         barIndex=req.barIndex,
         loopBars=16,
-        events=events,
+        events=to_event_models(events),
     )
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List
 
-from ..models import Event
+from .note_event import NoteEvent
 
 
 def steps_per_bar_from_grid(grid: str) -> int:
@@ -48,13 +48,13 @@ class Lattice:
             )
         )
 
-    def to_events(self, lane: str, preset: str | None) -> List[Event]:
-        events: List[Event] = []
+    def to_events(self, lane: str, preset: str | None) -> List[NoteEvent]:
+        events: List[NoteEvent] = []
         for onset in self.onsets:
             tbeat = (onset.step / self.steps_per_bar) * 4.0
             duration_beats = (onset.dur_steps / self.steps_per_bar) * 4.0
             events.append(
-                Event(
+                NoteEvent(
                     tBeat=tbeat,
                     lane=lane,
                     note=onset.pitches[0] if onset.pitches else None,
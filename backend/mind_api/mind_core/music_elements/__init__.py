@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from .harmony_plan import HarmonyPlan, HarmonyStep
 from .phrase_plan import PhrasePlan
-from .texture_engine import generate_events
+from .texture_engine import generate_bar_events, generate_events
 from .texture_recipe import TextureRecipe
 
 __all__ = [
@@ -10,5 +10,6 @@ __all__ = [
     "HarmonyStep",
     "PhrasePlan",
     "TextureRecipe",
+    "generate_bar_events",
     "generate_events",
 ]
@@ -1,21 +1,58 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+Chord = Tuple[int, ...]
+
+_EMPTY_CHORD: Chord = ()
 
 
 @dataclass(frozen=True)
 class HarmonyStep:
     bar_index: int
     step: int
-    chord: List[int]
+    chord: Chord
     pedal: bool = False
 
+    def __post_init__(self) -> None:
+        if not isinstance(self.chord, tuple):
+            object.__setattr__(self, "chord", tuple(self.chord))
+
+
+class _BarIndex:
+    """Change steps of one bar plus a dense per-step chord table."""
+
+    __slots__ = ("change_steps", "chords", "table")
+
+    def __init__(self, entries: Sequence[HarmonyStep], steps_per_bar: int) -> None:
+        self.change_steps: Tuple[int, ...] = tuple(entry.step for entry in entries)
+        self.chords: Tuple[Chord, ...] = tuple(entry.chord for entry in entries)
+        self.table: Tuple[Chord, ...] = tuple(self.lookup(step) for step in range(max(0, steps_per_bar)))
+
+    def lookup(self, step: int) -> Chord:
+        # Last change at or before ``step``; equal steps resolve to the later entry.
+        pos = bisect_right(self.change_steps, step)
+        return self.chords[pos - 1] if pos else _EMPTY_CHORD
+
 
 class HarmonyPlan:
+    """Chord timeline indexed by bar and grid step.
+
+    Chords are stored as tuples and handed out without copying; lookups inside
+    a bar are O(1) table reads, with a bisect fallback for off-grid steps.
+    """
+
     def __init__(self, *, steps_per_bar: int, steps: Iterable[HarmonyStep]) -> None:
         self.steps_per_bar = steps_per_bar
-        self.steps = sorted(list(steps), key=lambda s: (s.bar_index, s.step))
+        self.steps: Tuple[HarmonyStep, ...] = tuple(sorted(steps, key=lambda s: (s.bar_index, s.step)))
+        grouped: Dict[int, List[HarmonyStep]] = {}
+        for entry in self.steps:
+            grouped.setdefault(entry.bar_index, []).append(entry)
+        self._bars: Dict[int, _BarIndex] = {
+            bar_index: _BarIndex(entries, steps_per_bar) for bar_index, entries in grouped.items()
+        }
 
     @classmethod
     def from_chords(
@@ -27,30 +64,43 @@ class HarmonyPlan:
     ) -> "HarmonyPlan":
         steps: List[HarmonyStep] = []
         for bar_index, chord in enumerate(chords_by_bar):
+            bar_chord = tuple(chord)
             bar_changes = change_steps[bar_index] if change_steps else [0]
             for step in sorted(set(bar_changes)):
                 steps.append(
                     HarmonyStep(
                         bar_index=bar_index,
                         step=step,
-                        chord=list(chord),
+                        chord=bar_chord,
                         pedal=False,
                     )
                 )
         return cls(steps_per_bar=steps_per_bar, steps=steps)
 
-    def chord_at_step(self, bar_index: int, step: int) -> List[int]:
-        last: List[int] | None = None
-        for entry in self.steps:
-            if entry.bar_index != bar_index:
-                continue
-            if entry.step <= step:
-                last = entry.chord
-            else:
-                break
-        return list(last or [])
+    def chord_at_step(self, bar_index: int, step: int) -> Chord:
+        bar = self._bars.get(bar_index)
+        if bar is None:
+            return _EMPTY_CHORD
+        if 0 <= step < len(bar.table):
+            return bar.table[step]
+        return bar.lookup(step)
+
+    def chords_for_bar(self, bar_index: int, steps_per_bar: int | None = None) -> Tuple[Chord, ...]:
+        """Chord sounding at each step of ``bar_index``.
+
+        ``steps_per_bar`` defaults to the plan's own grid; other step counts
+        are resolved against the same change points.
+        """
+        count = self.steps_per_bar if steps_per_bar is None else max(0, steps_per_bar)
+        bar = self._bars.get(bar_index)
+        if bar is None:
+            return (_EMPTY_CHORD,) * count
+        if count == len(bar.table):
+            return bar.table
+        return tuple(bar.lookup(step) for step in range(count))
 
     def change_steps_for_bar(self, bar_index: int) -> List[int]:
-        return [
-            entry.step for entry in self.steps if entry.bar_index == bar_index
-        ] or [0]
+        bar = self._bars.get(bar_index)
+        if bar is None or not bar.change_steps:
+            return [0]
+        return list(bar.change_steps)
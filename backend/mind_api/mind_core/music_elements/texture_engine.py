@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+from typing import Iterable, List, Sequence
 
-from ..determinism import stable_seed
+from ..determinism import roll_steps, seed_key
 from ..lattice import Lattice, steps_per_bar_from_grid
-from ...models import Event
+from ..note_event import NoteEvent
 from .harmony_plan import HarmonyPlan
 from .phrase_plan import PhrasePlan
 from .texture_recipe import TextureRecipe
@@ -27,44 +27,19 @@ def generate_events(
     grid: str = "1/12",
     seed: int = 0,
     piece_id: str = "piece",
-) -> List[Event]:
-    steps_per_bar = steps_per_bar_from_grid(grid)
-    events: List[Event] = []
-
+) -> List[NoteEvent]:
+    events: List[NoteEvent] = []
     for bar_index in range(bars):
-        lattice = Lattice(steps_per_bar)
-        density = phrase.density_for_bar(bar_index, bars=bars)
-        pattern = texture.pattern_for_bar(seed=seed, piece_id=piece_id, bar_index=bar_index)
-        pattern_steps = _PATTERN_MAP.get(pattern, _PATTERN_MAP["low-mid-high"])
-        pattern_offset = stable_seed(f"{piece_id}:{seed}:{bar_index}:offset") % len(pattern_steps)
-
-        chord_by_step = [
-            harmony.chord_at_step(bar_index, step) for step in range(steps_per_bar)
-        ]
-
-        for step in range(steps_per_bar):
-            if not _should_emit_step(seed, piece_id, bar_index, step, density):
-                continue
-            chord = chord_by_step[step]
-            offset_step = step + pattern_offset
-            pitches = _select_pattern_pitches(
-                chord,
-                pattern_steps,
-                offset_step,
-                rotation_seed=seed,
-            )
-            if pitches:
-                lattice.add_onset(step=step, pitches=pitches, velocity=96, dur_steps=1)
-
-        if texture.sustain_policy in {"hold_until_change", "pedal_hold"}:
-            _apply_sustain_layer(
-                lattice,
-                chord_by_step=chord_by_step,
-                steps_per_bar=steps_per_bar,
-                policy=texture.sustain_policy,
-            )
-
-        bar_events = lattice.to_events(lane="note", preset=None)
+        bar_events = generate_bar_events(
+            harmony,
+            texture,
+            phrase,
+            bar_index=bar_index,
+            bars=bars,
+            grid=grid,
+            seed=seed,
+            piece_id=piece_id,
+        )
         for event in bar_events:
             event.tBeat += bar_index * 4.0
         events.extend(bar_events)
@@ -72,19 +47,68 @@ def generate_events(
     return sorted(events, key=lambda e: (e.tBeat, e.pitches[0] if e.pitches else -1))
 
 
-def _should_emit_step(
+def generate_bar_events(
+    harmony: HarmonyPlan,
+    texture: TextureRecipe,
+    phrase: PhrasePlan,
+    *,
+    bar_index: int,
+    bars: int | None = None,
+    grid: str = "1/12",
+    seed: int = 0,
+    piece_id: str = "piece",
+) -> List[NoteEvent]:
+    """Generate a single bar with bar-relative ``tBeat`` values."""
+    steps_per_bar = steps_per_bar_from_grid(grid)
+    lattice = Lattice(steps_per_bar)
+    # Curve lookups only depend on bars up to bar_index, so random access
+    # without the full length is equivalent.
+    density = phrase.density_for_bar(bar_index, bars=max(bars or 0, bar_index + 1))
+    pattern = texture.pattern_for_bar(seed=seed, piece_id=piece_id, bar_index=bar_index)
+    pattern_steps = _PATTERN_MAP.get(pattern, _PATTERN_MAP["low-mid-high"])
+    pattern_offset = seed_key(piece_id, seed, bar_index, "offset") % len(pattern_steps)
+
+    chord_by_step = harmony.chords_for_bar(bar_index, steps_per_bar)
+    emit_mask = _emit_mask(seed, piece_id, bar_index, steps_per_bar, density)
+
+    for step in range(steps_per_bar):
+        if not emit_mask[step]:
+            continue
+        chord = chord_by_step[step]
+        offset_step = step + pattern_offset
+        pitches = _select_pattern_pitches(
+            chord,
+            pattern_steps,
+            offset_step,
+            rotation_seed=seed,
+        )
+        if pitches:
+            lattice.add_onset(step=step, pitches=pitches, velocity=96, dur_steps=1)
+
+    if texture.sustain_policy in {"hold_until_change", "pedal_hold"}:
+        _apply_sustain_layer(
+            lattice,
+            chord_by_step=chord_by_step,
+            steps_per_bar=steps_per_bar,
+            policy=texture.sustain_policy,
+        )
+
+    bar_events = lattice.to_events(lane="note", preset=None)
+    return sorted(bar_events, key=lambda e: (e.tBeat, e.pitches[0] if e.pitches else -1))
+
+
+def _emit_mask(
     seed: int,
     piece_id: str,
     bar_index: int,
-    step: int,
+    steps_per_bar: int,
     density: float,
-) -> bool:
+) -> List[bool]:
     density = max(0.0, min(1.0, density))
     if density >= 0.999:
-        return True
+        return [True] * steps_per_bar
     threshold = int(density * 1000)
-    roll = stable_seed(f"{piece_id}:{seed}:{bar_index}:{step}") % 1000
-    return roll < threshold
+    return [roll < threshold for roll in roll_steps((piece_id, seed, bar_index), steps_per_bar, 1000)]
 
 
 def _select_pattern_pitches(
@@ -109,12 +133,12 @@ def _select_pattern_pitches(
 def _apply_sustain_layer(
     lattice: Lattice,
     *,
-    chord_by_step: List[List[int]],
+    chord_by_step: Sequence[Sequence[int]],
     steps_per_bar: int,
     policy: str,
 ) -> None:
     change_steps: List[int] = []
-    last_chord: List[int] | None = None
+    last_chord: Sequence[int] | None = None
     for step, chord in enumerate(chord_by_step):
         if last_chord is None or chord != last_chord:
             change_steps.append(step)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable, Tuple
 
-from ..determinism import stable_seed
+from ..determinism import seed_key
 
 
 @dataclass(frozen=True)
@@ -16,5 +16,5 @@ class TextureRecipe:
     def pattern_for_bar(self, *, seed: int, piece_id: str, bar_index: int) -> str:
         if not self.pattern_family:
             return "low-mid-high"
-        stable = stable_seed(f"{piece_id}:{seed}:{bar_index}")
+        stable = seed_key(piece_id, seed, bar_index)
         return self.pattern_family[stable % len(self.pattern_family)]
@@ -0,0 +1,94 @@
+"""Compact internal note event used between generators and the API boundary."""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Sequence, Union
+
+from ..models import Event
+
+
+class NoteEvent:
+    """Slotted stand-in for ``models.Event`` with the same attribute names.
+
+    Generators, the lattice and the post chain build these; responses convert
+    them with ``to_event_models`` once, so no pydantic validation or
+    ``model_copy`` happens per note inside the runtime.
+    """
+
+    __slots__ = ("tBeat", "lane", "note", "pitches", "velocity", "durationBeats", "preset", "sourceNodeId")
+
+    def __init__(
+        self,
+        tBeat: float,
+        lane: str,
+        note: Optional[int] = None,
+        pitches: Optional[Sequence[int]] = None,
+        velocity: int = 100,
+        durationBeats: float = 0.25,
+        preset: Optional[str] = None,
+        sourceNodeId: Optional[str] = None,
+    ) -> None:
+        self.tBeat = tBeat
+        self.lane = lane
+        self.note = note
+        self.pitches: List[int] = list(pitches) if pitches else []
+        self.velocity = velocity
+        self.durationBeats = durationBeats
+        self.preset = preset
+        self.sourceNodeId = sourceNodeId
+
+    def copy(self) -> "NoteEvent":
+        return NoteEvent(
+            self.tBeat,
+            self.lane,
+            self.note,
+            self.pitches,
+            self.velocity,
+            self.durationBeats,
+            self.preset,
+            self.sourceNodeId,
+        )
+
+    def to_model(self) -> Event:
+        return Event(
+            tBeat=self.tBeat,
+            lane=self.lane,
+            note=self.note,
+            pitches=self.pitches,
+            velocity=self.velocity,
+            durationBeats=self.durationBeats,
+            preset=self.preset,
+            sourceNodeId=self.sourceNodeId,
+        )
+
+    @classmethod
+    def from_model(cls, event: Event) -> "NoteEvent":
+        return cls(
+            event.tBeat,
+            event.lane,
+            event.note,
+            event.pitches,
+            event.velocity,
+            event.durationBeats,
+            event.preset,
+            event.sourceNodeId,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, NoteEvent):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"NoteEvent({fields})"
+
+
+AnyEvent = Union[NoteEvent, Event]
+
+
+def to_event_models(events: Iterable[AnyEvent]) -> List[Event]:
+    """Convert internal events to response models; ``Event`` instances pass through."""
+    return [event.to_model() if isinstance(event, NoteEvent) else event for event in events]
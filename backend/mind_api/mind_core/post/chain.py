@@ -2,16 +2,17 @@ from __future__ import annotations
 
 from typing import List
 
-from ...models import CompileRequest, Event, RenderSpec
+from ...models import CompileRequest, RenderSpec
+from ..note_event import AnyEvent
 from .perc import apply_perc
 from .strum import apply_strum
 
 
 def apply_render_chain(
-    events: List[Event],
+    events: List[AnyEvent],
     render: RenderSpec | None,
     req: CompileRequest,
-) -> List[Event]:
+) -> List[AnyEvent]:
     if render is None:
         return list(events)
 
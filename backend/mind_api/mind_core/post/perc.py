@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional
 
-from ...models import Event, PercSpec
+from ...models import PercSpec
+from ..note_event import AnyEvent, NoteEvent
 
 
 _LANE_TO_NOTE = {
@@ -29,15 +30,15 @@ def _emit_mask_events(
     steps_per_bar: int,
     velocity: int = 100,
     duration: float = 0.1,
-) -> List[Event]:
-    events: List[Event] = []
+) -> List[NoteEvent]:
+    events: List[NoteEvent] = []
     note = _LANE_TO_NOTE[lane]
     for idx, char in enumerate(mask):
         if char.lower() != "x":
             continue
         tbeat = (idx / steps_per_bar) * 4.0
         events.append(
-            Event(
+            NoteEvent(
                 tBeat=tbeat,
                 lane=lane,
                 note=note,
@@ -50,7 +51,7 @@ def _emit_mask_events(
     return events
 
 
-def apply_perc(events: List[Event], spec: PercSpec) -> List[Event]:
+def apply_perc(events: List[AnyEvent], spec: PercSpec) -> List[AnyEvent]:
     """Append percussion events from masks."""
     if not spec.enabled:
         return list(events)
@@ -66,7 +67,7 @@ def apply_perc(events: List[Event], spec: PercSpec) -> List[Event]:
         "hat": spec.hat,
     }
 
-    percussion_events: List[Event] = []
+    percussion_events: List[NoteEvent] = []
     for lane, mask in masks.items():
         if mask:
             percussion_events.extend(_emit_mask_events(lane, mask, steps_per_bar))
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from typing import List
 
-from ...models import Event, StrumSpec
+from ...models import StrumSpec
+from ..note_event import AnyEvent, NoteEvent
 
 
 def _strum_direction(spec: StrumSpec) -> str:
@@ -11,7 +12,7 @@ def _strum_direction(spec: StrumSpec) -> str:
     return "D"
 
 
-def apply_strum(events: List[Event], spec: StrumSpec, bpm: float) -> List[Event]:
+def apply_strum(events: List[AnyEvent], spec: StrumSpec, bpm: float) -> List[AnyEvent]:
     """Split chord events into staggered note events."""
     if not spec.enabled:
         return list(events)
@@ -20,7 +21,7 @@ def apply_strum(events: List[Event], spec: StrumSpec, bpm: float) -> List[Event]
     spread_beats = (spread_ms / 1000.0) * (bpm / 60.0)
     direction = _strum_direction(spec)
 
-    strummed: List[Event] = []
+    strummed: List[AnyEvent] = []
     for event in events:
         if len(event.pitches) < 2 or spread_beats <= 0:
             strummed.append(event)
@@ -32,7 +33,7 @@ def apply_strum(events: List[Event], spec: StrumSpec, bpm: float) -> List[Event]
             offset = per_note * index
             duration = max(0.0, event.durationBeats - offset)
             strummed.append(
-                Event(
+                NoteEvent(
                     tBeat=event.tBeat + offset,
                     lane=event.lane,
                     note=pitch,
@@ -1,5 +1,9 @@
-"""Token-based stream runtime for V9 flow graphs."""
+"""Token-based stream runtime for V9 flow graphs.
 
-from .runtime import run_stream_runtime
+The offline renderer is not re-exported: import ``render_song`` from
+``.offline`` so ``python -m ...stream_runtime.offline`` runs cleanly.
+"""
 
-__all__ = ["run_stream_runtime"]
+from .runtime import run_stream_runtime, run_stream_runtime_range
+
+__all__ = ["run_stream_runtime", "run_stream_runtime_range"]
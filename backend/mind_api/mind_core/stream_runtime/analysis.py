@@ -0,0 +1,61 @@
+"""Static checks on a V9 flow graph, run once per graph revision.
+
+Problems found here are reported when the runtime first sees a revision,
+so the per-bar loop can trust the graph instead of re-checking it.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, List, Set
+
+from ...models import Diagnostic, FlowGraphEdge, FlowGraphNode
+
+RUNTIME_NODE_TYPES = frozenset({"start", "thought", "counter", "switch", "join"})
+
+
+def _warn(message: str) -> Diagnostic:
+    return Diagnostic(level="warn", message=message, line=1, col=1)
+
+
+def _reachable_from_starts(nodes_by_id: Dict[str, FlowGraphNode], outgoing: Dict[str, List[FlowGraphEdge]]) -> Set[str]:
+    seen = {node_id for node_id, node in nodes_by_id.items() if node.type == "start"}
+    pending = deque(seen)
+    while pending:
+        for edge in outgoing.get(pending.popleft(), []):
+            target = edge.to.nodeId
+            if target not in seen:
+                seen.add(target)
+                pending.append(target)
+    return seen
+
+
+def analyze_graph(
+    nodes_by_id: Dict[str, FlowGraphNode],
+    edges: List[FlowGraphEdge],
+    outgoing: Dict[str, List[FlowGraphEdge]],
+    join_inputs: Dict[str, List[str]],
+    thought_diagnostics: Dict[str, List[Diagnostic]],
+) -> List[Diagnostic]:
+    """``outgoing`` must already exclude edges whose endpoints are missing."""
+    diagnostics: List[Diagnostic] = []
+    for edge in edges:
+        for endpoint in (edge.from_.nodeId, edge.to.nodeId):
+            if endpoint not in nodes_by_id:
+                diagnostics.append(_warn(f"Edge '{edge.id}' references missing node '{endpoint}'; ignoring it."))
+                break
+    if not any(node.type == "start" for node in nodes_by_id.values()):
+        diagnostics.append(_warn("Graph has no start node; nothing will play."))
+    reachable = _reachable_from_starts(nodes_by_id, outgoing)
+    for node in nodes_by_id.values():
+        if node.type not in RUNTIME_NODE_TYPES:
+            diagnostics.append(_warn(f"Node '{node.id}' has unsupported type '{node.type}'."))
+        elif node.type == "thought":
+            diagnostics.extend(thought_diagnostics.get(node.id, []))
+            if node.id not in reachable:
+                diagnostics.append(_warn(f"Thought '{node.id}' is not reachable from any start node."))
+        elif node.type == "join" and not join_inputs.get(node.id):
+            diagnostics.append(_warn(f"Join '{node.id}' has no inputs and will never release."))
+        elif node.type == "switch" and not outgoing.get(node.id):
+            diagnostics.append(_warn(f"Switch '{node.id}' has no outgoing edges; its tokens are dropped."))
+    return diagnostics
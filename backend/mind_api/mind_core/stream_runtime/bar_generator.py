@@ -0,0 +1,40 @@
+"""Per-bar generator protocol for stream runtime patterns."""
+
+from __future__ import annotations
+
+import functools
+from typing import Any, Callable, List
+
+from ..note_event import NoteEvent
+from ..music_elements.harmony_plan import HarmonyPlan
+
+BarEmitter = Callable[..., List[NoteEvent]]
+
+
+class BarGenerator:
+    """Pattern generator with random access to any single bar.
+
+    The wrapped function emits the events of one bar with bar-relative
+    ``tBeat`` values.  ``generator.bar(harmony, bar_index, ...)`` returns that
+    bar directly; calling the generator with ``bars=N`` builds the whole
+    timeline on top of it, shifting each bar by ``bar_index * 4`` beats.
+    """
+
+    def __init__(self, emit_bar: BarEmitter) -> None:
+        self.emit_bar = emit_bar
+        functools.update_wrapper(self, emit_bar)
+
+    def bar(self, harmony: HarmonyPlan, bar_index: int, **kwargs: Any) -> List[NoteEvent]:
+        return self.emit_bar(harmony, bar_index, **kwargs)
+
+    def __call__(self, harmony: HarmonyPlan, *, bars: int, **kwargs: Any) -> List[NoteEvent]:
+        events: List[NoteEvent] = []
+        for bar_index in range(bars):
+            for event in self.emit_bar(harmony, bar_index, **kwargs):
+                event.tBeat += bar_index * 4.0
+                events.append(event)
+        return events
+
+
+def bar_generator(emit_bar: BarEmitter) -> BarGenerator:
+    return BarGenerator(emit_bar)
@@ -0,0 +1,153 @@
+"""Runtime-state checkpoints for seeking within a playback.
+
+The runtime is deterministic: the state entering absolute bar N depends
+only on the graph, the seed and the start filter.  ``seek_runtime_state``
+rebuilds it in-process from the nearest earlier checkpoint, advancing the
+runtime without compiling any Thought.  Every ``interval`` bars it passes
+it stores a snapshot, so later seeks into the same region replay at most
+a stride of bars (``interval``, doubled each time a playback fills up).
+Seeks past ``MAX_SEEK_BAR`` are capped there.  Live playback never writes checkpoints: after graph
+edits its state no longer follows from bar 0.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+from ...models import CompileRequest, FlowGraph, StreamRuntimeState
+from .compiled_graph import COMPILED_GRAPH_CACHE, CompiledGraph
+from .constants import LOOP_BARS, MAX_SEEK_BAR
+from .runtime import run_stream_runtime
+from .runtime_state import is_exhausted
+
+DEFAULT_CHECKPOINT_INTERVAL = LOOP_BARS
+DEFAULT_CHECKPOINT_PLAYBACKS = 32
+DEFAULT_CHECKPOINTS_PER_PLAYBACK = 256
+
+# (graph hash, seed, start filter)
+CheckpointKey = Tuple[str, int, Tuple[str, ...]]
+
+
+def checkpoint_key(graph_hash_value: str, seed: int, start_node_ids: Optional[Sequence[str]]) -> CheckpointKey:
+    return graph_hash_value, int(seed), tuple(sorted(set(start_node_ids or ())))
+
+
+class _Playback:
+    __slots__ = ("stride", "checkpoints")
+
+    def __init__(self, stride: int) -> None:
+        self.stride = stride
+        self.checkpoints: Dict[int, StreamRuntimeState] = {}
+
+
+class CheckpointStore:
+    """LRU of playbacks, each holding the state entering every ``interval``-th bar.
+
+    A playback that reaches ``max_checkpoints`` drops every other checkpoint
+    and from then on keeps one per doubled stride, so seeks anywhere in a long
+    playback still replay a bounded number of bars.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+        max_playbacks: int = DEFAULT_CHECKPOINT_PLAYBACKS,
+        max_checkpoints: int = DEFAULT_CHECKPOINTS_PER_PLAYBACK,
+    ) -> None:
+        self.interval = max(1, int(interval))
+        self.max_playbacks = max(1, int(max_playbacks))
+        self.max_checkpoints = max(2, int(max_checkpoints))
+        self._playbacks: "OrderedDict[CheckpointKey, _Playback]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(playback.checkpoints) for playback in self._playbacks.values())
+
+    def nearest(self, key: CheckpointKey, bar: int) -> Tuple[int, Optional[StreamRuntimeState]]:
+        """Latest checkpoint at or before ``bar``; ``(0, None)`` when there is none."""
+        playback = self._playbacks.get(key)
+        if playback is not None:
+            self._playbacks.move_to_end(key)
+            best = (bar // playback.stride) * playback.stride
+            while best > 0:
+                state = playback.checkpoints.get(best)
+                if state is not None:
+                    self.hits += 1
+                    return best, state.model_copy(deep=True)
+                best -= playback.stride
+        self.misses += 1
+        return 0, None
+
+    def put(self, key: CheckpointKey, bar: int, state: StreamRuntimeState) -> None:
+        playback = self._playbacks.get(key)
+        if playback is None:
+            playback = self._playbacks[key] = _Playback(self.interval)
+        self._playbacks.move_to_end(key)
+        if bar <= 0 or bar % playback.stride or bar in playback.checkpoints:
+            return
+        if len(playback.checkpoints) >= self.max_checkpoints:
+            playback.stride *= 2
+            playback.checkpoints = {
+                kept: snapshot for kept, snapshot in playback.checkpoints.items() if kept % playback.stride == 0
+            }
+            if bar % playback.stride:
+                return
+        playback.checkpoints[bar] = state.model_copy(deep=True)
+        while len(self._playbacks) > self.max_playbacks:
+            self._playbacks.popitem(last=False)
+
+    def clear(self) -> None:
+        self._playbacks.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+CHECKPOINT_STORE = CheckpointStore()
+
+
+def seek_runtime_state(
+    graph: FlowGraph,
+    bar: int,
+    *,
+    seed: int = 0,
+    bpm: float = 120.0,
+    start_node_ids: Optional[Sequence[str]] = None,
+    compiled: Optional[CompiledGraph] = None,
+    store: Optional[CheckpointStore] = None,
+) -> Optional[StreamRuntimeState]:
+    """State the runtime holds entering absolute ``bar`` when played from bar 0.
+
+    ``None`` for bar 0, which starts from a fresh state.  The returned state
+    belongs to the caller.
+    """
+    bar = max(0, min(MAX_SEEK_BAR, int(bar)))
+    if bar == 0:
+        return None
+    compiled = compiled or COMPILED_GRAPH_CACHE.get(graph)
+    store = CHECKPOINT_STORE if store is None else store
+    key = checkpoint_key(compiled.graph_hash, seed, start_node_ids)
+    current, state = store.nearest(key, bar)
+    while current < bar:
+        if is_exhausted(state):
+            # Nothing is left to fire; only the bar index would still change.
+            state.barIndex = (bar - 1) % LOOP_BARS
+            break
+        # model_construct: the graph was validated once, not on every bar.
+        req = CompileRequest.model_construct(
+            seed=seed,
+            bpm=bpm,
+            barIndex=current % LOOP_BARS,
+            nodes=[],
+            edges=[],
+            startNodeIds=list(start_node_ids or []),
+            flowGraph=graph,
+            runtimeState=state,
+            debug=False,
+        )
+        state = run_stream_runtime(req, compiled=compiled, render=False).runtimeState
+        current += 1
+        store.put(key, current, state)
+    return state
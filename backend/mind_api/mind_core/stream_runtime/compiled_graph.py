@@ -0,0 +1,170 @@
+"""Content-addressed cache of per-graph runtime indexes."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AbstractSet, Dict, List, Optional, Tuple
+
+from ...models import Diagnostic, FlowGraph, FlowGraphEdge, FlowGraphNode
+from .analysis import analyze_graph
+from .melody import _thought_total_bars
+from .thought_spec import ThoughtSpec, build_thought_spec
+from .switch_table import SwitchTable, compile_switch
+from .utils import _coerce_number
+
+DEFAULT_GRAPH_CACHE_SIZE = 64
+
+# Editor-only fields that never affect compilation.
+_HASH_EXCLUDE = {"selection": True, "viewport": True, "nodes": {"__all__": {"ui"}}}
+
+
+def graph_hash(graph: FlowGraph) -> str:
+    payload = graph.model_dump_json(by_alias=True, exclude=_HASH_EXCLUDE)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _required_join_inputs(node: FlowGraphNode, incoming: List[FlowGraphEdge]) -> List[str]:
+    if node.ports and node.ports.inputs:
+        return [port.id for port in node.ports.inputs if port.id]
+    port_ids = [edge.to.portId for edge in incoming if edge.to.portId]
+    return list(dict.fromkeys(port_ids))
+
+
+@dataclass(frozen=True)
+class CompiledGraph:
+    """Indexes and firing plan ``run_stream_runtime`` needs for one graph; treat as read-only.
+
+    Edges with a missing endpoint are left out of every index and reported in
+    ``diagnostics`` instead.  ``thought_specs`` is ``None`` for Thoughts that
+    can never produce events; they still hold the flow for their duration.
+
+    Passing ``previous`` (and the ``touched`` ids from ``apply_graph_delta``)
+    to ``build`` reuses the Thought specs of unchanged nodes and the switch
+    tables and join inputs of untouched ones; only the adjacency indexes and
+    the static checks are redone.
+    """
+
+    graph_hash: str
+    nodes_by_id: Dict[str, FlowGraphNode]
+    outgoing: Dict[str, List[FlowGraphEdge]]
+    incoming: Dict[str, List[FlowGraphEdge]]
+    edge_index: Dict[str, FlowGraphEdge]
+    start_edges_by_id: Dict[str, List[FlowGraphEdge]]
+    join_inputs: Dict[str, List[str]]
+    join_ids: Tuple[str, ...]
+    # Join id -> {input port id: bit}; arrivals are stored as a mask of these bits.
+    join_port_bits: Dict[str, Dict[str, int]]
+    thought_bars: Dict[str, int]
+    thought_specs: Dict[str, Optional[ThoughtSpec]]
+    thought_diagnostics: Dict[str, List[Diagnostic]]
+    counter_steps: Dict[str, Tuple[int, int]]
+    switch_tables: Dict[str, SwitchTable]
+    diagnostics: Tuple[Diagnostic, ...]
+
+    @classmethod
+    def build(
+        cls,
+        graph: FlowGraph,
+        *,
+        graph_hash_value: Optional[str] = None,
+        previous: Optional["CompiledGraph"] = None,
+        touched: AbstractSet[str] = frozenset(),
+    ) -> "CompiledGraph":
+        nodes_by_id = {node.id: node for node in graph.nodes}
+        edges = [edge for edge in graph.edges if edge.from_.nodeId in nodes_by_id and edge.to.nodeId in nodes_by_id]
+        outgoing: Dict[str, List[FlowGraphEdge]] = {}
+        incoming: Dict[str, List[FlowGraphEdge]] = {}
+        for edge in edges:
+            outgoing.setdefault(edge.from_.nodeId, []).append(edge)
+            incoming.setdefault(edge.to.nodeId, []).append(edge)
+        join_inputs: Dict[str, List[str]] = {}
+        thought_bars: Dict[str, int] = {}
+        thought_specs: Dict[str, Optional[ThoughtSpec]] = {}
+        thought_diagnostics: Dict[str, List[Diagnostic]] = {}
+        counter_steps: Dict[str, Tuple[int, int]] = {}
+        switch_tables: Dict[str, SwitchTable] = {}
+        for node in nodes_by_id.values():
+            # Edge edits touch both endpoints, so untouched entries are still valid.
+            reuse = previous is not None and node.id not in touched
+            if node.type == "join":
+                if reuse and node.id in previous.join_inputs:
+                    join_inputs[node.id] = previous.join_inputs[node.id]
+                else:
+                    join_inputs[node.id] = _required_join_inputs(node, incoming.get(node.id, []))
+            elif node.type == "thought":
+                # Specs depend only on the node itself, so edge edits keep them.
+                unchanged = reuse or (previous is not None and previous.nodes_by_id.get(node.id) == node)
+                if unchanged and node.id in previous.thought_specs:
+                    thought_bars[node.id] = previous.thought_bars[node.id]
+                    thought_specs[node.id] = previous.thought_specs[node.id]
+                    thought_diagnostics[node.id] = previous.thought_diagnostics[node.id]
+                else:
+                    thought_bars[node.id] = max(1, _thought_total_bars(node))
+                    thought_specs[node.id], thought_diagnostics[node.id] = build_thought_spec(node)
+            elif node.type == "switch":
+                if reuse and node.id in previous.switch_tables:
+                    switch_tables[node.id] = previous.switch_tables[node.id]
+                else:
+                    switch_tables[node.id] = compile_switch(node, outgoing.get(node.id, []))
+            elif node.type == "counter":
+                params = node.params or {}
+                counter_steps[node.id] = (_coerce_number(params.get("start"), 0), _coerce_number(params.get("step"), 1))
+        return cls(
+            graph_hash=graph_hash_value or graph_hash(graph),
+            nodes_by_id=nodes_by_id,
+            outgoing=outgoing,
+            incoming=incoming,
+            edge_index={edge.id: edge for edge in edges},
+            start_edges_by_id={
+                node.id: outgoing.get(node.id, []) for node in nodes_by_id.values() if node.type == "start"
+            },
+            join_inputs=join_inputs,
+            join_ids=tuple(join_inputs),
+            join_port_bits={
+                node_id: {port_id: 1 << index for index, port_id in enumerate(dict.fromkeys(port_ids))}
+                for node_id, port_ids in join_inputs.items()
+            },
+            thought_bars=thought_bars,
+            thought_specs=thought_specs,
+            thought_diagnostics=thought_diagnostics,
+            counter_steps=counter_steps,
+            switch_tables=switch_tables,
+            diagnostics=tuple(analyze_graph(nodes_by_id, graph.edges, outgoing, join_inputs, thought_diagnostics)),
+        )
+
+
+class CompiledGraphCache:
+    """LRU of ``CompiledGraph`` keyed by ``graph_hash``."""
+
+    def __init__(self, max_entries: int = DEFAULT_GRAPH_CACHE_SIZE) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, CompiledGraph]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, graph: FlowGraph, *, graph_hash_value: Optional[str] = None) -> CompiledGraph:
+        key = graph_hash_value or graph_hash(graph)
+        compiled = self._entries.get(key)
+        if compiled is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return compiled
+        self.misses += 1
+        compiled = CompiledGraph.build(graph, graph_hash_value=key)
+        self._entries[key] = compiled
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+COMPILED_GRAPH_CACHE = CompiledGraphCache()
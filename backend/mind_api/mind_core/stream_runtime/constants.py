@@ -10,5 +10,11 @@ LANE_TO_MIDI_NOTE = {
 ALLOWED_GRIDS = {"1/4", "1/8", "1/12", "1/16", "1/24"}
 
 MAX_NODE_FIRINGS_PER_BAR = 256
+# Node types reported in ``CompileResponse.activeNodeIds`` when they fire.
+ACTIVE_NODE_TYPES = frozenset({"start", "thought", "counter", "switch", "join"})
 MAX_TOKENS_PER_BAR = 512
+LOOP_BARS = 16
+MAX_RANGE_BARS = 32
+# Furthest absolute bar playback can start from; reaching it replays every bar before it.
+MAX_SEEK_BAR = 8192
 DEFAULT_PATTERN_FAMILY = ("low-mid-high",)
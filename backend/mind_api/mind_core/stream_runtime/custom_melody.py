@@ -0,0 +1,122 @@
+"""Custom (hand-written) Thought melodies, compiled once per graph revision.
+
+Each bar's rhythm string and note tokens are parsed into an onset table
+when the Thought's spec is built, along with the diagnostics the bar
+reports.  Compiling a bar then only turns table rows into events.
+"""
+
+from __future__ import annotations
+
+from typing import List, NamedTuple, Optional, Tuple
+
+from ...models import Diagnostic, FlowGraphNode
+from ..note_event import NoteEvent
+from ..notes import note_name_to_midi
+from .utils import _intensity_to_velocity, _steps_per_bar_for_grid
+
+
+def _parse_custom_notes(raw: object) -> List[int]:
+    tokens: List[str] = []
+    if raw is None:
+        return tokens
+    if isinstance(raw, str):
+        tokens = [tok for tok in raw.split() if tok]
+    elif isinstance(raw, list):
+        tokens = [str(tok) for tok in raw if tok is not None]
+    values: List[int] = []
+    for tok in tokens:
+        try:
+            values.append(int(tok))
+            continue
+        except (TypeError, ValueError):
+            pass
+        try:
+            values.append(note_name_to_midi(tok))
+            continue
+        except Exception:
+            continue
+    return values
+
+
+class CustomMelodyBar(NamedTuple):
+    # One (tBeat, durationBeats, note, velocity) row per onset.
+    onsets: Tuple[Tuple[float, float, int, int], ...]
+    diagnostics: Tuple[Diagnostic, ...]
+
+
+class CustomMelody(NamedTuple):
+    """Onset tables of a custom melody; ``bars`` is empty when it cannot play."""
+
+    bars: Tuple[CustomMelodyBar, ...]
+    diagnostics: Tuple[Diagnostic, ...]
+
+    def bar_events(
+        self, bar_offset: int, node_id: str, preset: Optional[str], diagnostics: List[Diagnostic]
+    ) -> List[NoteEvent]:
+        if not self.bars:
+            diagnostics.extend(self.diagnostics)
+            return []
+        bar = self.bars[bar_offset % len(self.bars)]
+        diagnostics.extend(bar.diagnostics)
+        return [
+            NoteEvent(
+                tBeat=tbeat,
+                lane="note",
+                note=note,
+                pitches=[note],
+                velocity=velocity,
+                durationBeats=duration_beats,
+                preset=preset,
+                sourceNodeId=node_id,
+            )
+            for tbeat, duration_beats, note, velocity in bar.onsets
+        ]
+
+
+def _warn(node: FlowGraphNode, message: str) -> Diagnostic:
+    return Diagnostic(level="warn", message=f"Thought '{node.id}': {message}", line=1, col=1)
+
+
+def _compile_bar(node: FlowGraphNode, entry: object, step_len: float) -> CustomMelodyBar:
+    rhythm = str(entry.get("rhythm") or "") if isinstance(entry, dict) else ""
+    if not rhythm:
+        return CustomMelodyBar((), (_warn(node, "empty rhythm for custom melody; skipping."),))
+
+    notes = _parse_custom_notes(entry.get("notes"))
+    onsets: List[Tuple[float, float, int, int]] = []
+    diagnostics: Tuple[Diagnostic, ...] = ()
+    # Walk backwards so each onset knows how many "-" holds follow it.
+    holds = 0
+    starts: List[Tuple[int, int, str]] = []
+    for idx in range(len(rhythm) - 1, -1, -1):
+        ch = rhythm[idx]
+        if ch == "-":
+            holds += 1
+            continue
+        if ch != ".":
+            starts.append((idx, holds, ch))
+        holds = 0
+    starts.reverse()
+    if len(starts) > len(notes):
+        starts = starts[: len(notes)]
+        diagnostics = (_warn(node, "insufficient notes for custom melody; truncating."),)
+    for (idx, hold_steps, ch), note in zip(starts, notes):
+        velocity = _intensity_to_velocity(ch) if ch.isdigit() else 96
+        onsets.append((idx * step_len, (1 + hold_steps) * step_len, note, velocity))
+    return CustomMelodyBar(tuple(onsets), diagnostics)
+
+
+def compile_custom_melody(node: FlowGraphNode) -> CustomMelody:
+    params = node.params or {}
+    custom = params.get("customMelody") or {}
+    grid = str(custom.get("grid") or params.get("rhythmGrid") or "1/16")
+    steps_per_bar = _steps_per_bar_for_grid(grid)
+    if steps_per_bar <= 0:
+        problem = Diagnostic(level="error", message=f"Thought '{node.id}': invalid custom grid '{grid}'", line=1, col=1)
+        return CustomMelody((), (problem,))
+
+    bars = custom.get("bars") or []
+    if not isinstance(bars, list) or not bars:
+        return CustomMelody((), (_warn(node, "missing custom melody bars; skipping."),))
+    step_len = 4.0 / steps_per_bar
+    return CustomMelody(tuple(_compile_bar(node, entry, step_len) for entry in bars), ())
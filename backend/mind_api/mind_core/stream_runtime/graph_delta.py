@@ -0,0 +1,173 @@
+"""Incremental edits to a V9 flow graph and the runtime state playing it."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ...models import FlowGraph, FlowGraphEdge, FlowGraphNode, StreamRuntimeState
+from .compiled_graph import CompiledGraph
+from .runtime_state import compact_runtime_state, join_mask_ports
+from .scheduler import _token_from_edge
+
+GraphDeltaOp = Dict[str, Any]
+
+
+class GraphDeltaError(ValueError):
+    """A delta op is malformed or references a missing node/edge."""
+
+
+def apply_graph_delta(graph: FlowGraph, ops: Iterable[GraphDeltaOp]) -> Tuple[FlowGraph, Set[str]]:
+    """Apply ``ops`` to ``graph`` and return the new graph plus touched node ids.
+
+    Supported ops::
+
+        {"op": "set_params", "nodeId": ..., "params": {...}}   # shallow merge
+        {"op": "upsert_node", "node": {...}}
+        {"op": "remove_node", "nodeId": ...}                  # drops its edges too
+        {"op": "upsert_edge", "edge": {...}}
+        {"op": "remove_edge", "edgeId": ...}
+
+    The input graph is not modified.
+    """
+    nodes: Dict[str, FlowGraphNode] = {node.id: node for node in graph.nodes}
+    edges: Dict[str, FlowGraphEdge] = {edge.id: edge for edge in graph.edges}
+    touched: Set[str] = set()
+
+    for op in ops:
+        kind = op.get("op") if isinstance(op, dict) else None
+        if kind == "set_params":
+            node_id = str(op.get("nodeId") or "")
+            node = nodes.get(node_id)
+            if node is None:
+                raise GraphDeltaError(f"set_params: unknown node '{node_id}'.")
+            params = op.get("params") or {}
+            if not isinstance(params, dict):
+                raise GraphDeltaError(f"set_params: params for '{node_id}' must be an object.")
+            nodes[node_id] = node.model_copy(update={"params": {**(node.params or {}), **params}})
+            touched.add(node_id)
+        elif kind == "upsert_node":
+            node = FlowGraphNode.model_validate(op.get("node") or {})
+            nodes[node.id] = node
+            touched.add(node.id)
+        elif kind == "remove_node":
+            node_id = str(op.get("nodeId") or "")
+            if nodes.pop(node_id, None) is None:
+                raise GraphDeltaError(f"remove_node: unknown node '{node_id}'.")
+            for edge_id in [eid for eid, edge in edges.items() if node_id in (edge.from_.nodeId, edge.to.nodeId)]:
+                edge = edges.pop(edge_id)
+                touched.update((edge.from_.nodeId, edge.to.nodeId))
+            touched.add(node_id)
+        elif kind == "upsert_edge":
+            edge = FlowGraphEdge.model_validate(op.get("edge") or {})
+            previous = edges.get(edge.id)
+            if previous is not None:
+                touched.update((previous.from_.nodeId, previous.to.nodeId))
+            edges[edge.id] = edge
+            touched.update((edge.from_.nodeId, edge.to.nodeId))
+        elif kind == "remove_edge":
+            edge_id = str(op.get("edgeId") or "")
+            edge = edges.pop(edge_id, None)
+            if edge is None:
+                raise GraphDeltaError(f"remove_edge: unknown edge '{edge_id}'.")
+            touched.update((edge.from_.nodeId, edge.to.nodeId))
+        else:
+            raise GraphDeltaError(f"unsupported graph delta op {kind!r}.")
+
+    updated_nodes: List[FlowGraphNode] = list(nodes.values())
+    updated_edges: List[FlowGraphEdge] = list(edges.values())
+    return graph.model_copy(update={"nodes": updated_nodes, "edges": updated_edges}), touched
+
+
+def delta_revision(revision: str, ops: Sequence[GraphDeltaOp]) -> str:
+    """Revision of the graph ``ops`` produce from ``revision``, without rehashing the graph."""
+    payload = json.dumps(list(ops), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(f"{revision}:{payload}".encode("utf-8")).hexdigest()
+
+
+def _rebase_start_position(old_edges: List[FlowGraphEdge], new_edges: List[FlowGraphEdge], pos: int) -> int:
+    # Resume after the last edge already taken, wherever it moved to.
+    taken = {edge.id for edge in old_edges[:pos]}
+    return max((index + 1 for index, edge in enumerate(new_edges) if edge.id in taken), default=0)
+
+
+def rebase_runtime_state(
+    state: StreamRuntimeState, previous: CompiledGraph, compiled: CompiledGraph, touched: Set[str]
+) -> StreamRuntimeState:
+    """Carry ``state`` from ``previous`` over to the edited graph ``compiled``.
+
+    Tokens and active Thoughts whose node still exists are kept.  The rest are
+    dropped and their start chains released, so a start whose flow ran into a
+    removed node queues its next edge for the coming bar.  Active Thoughts in
+    ``touched`` are refitted to their new duration.
+    """
+    nodes_by_id = compiled.nodes_by_id
+    start_edges_by_id = compiled.start_edges_by_id
+    released: List[Optional[str]] = []
+
+    active_tokens = []
+    for token in state.activeTokens:
+        if token.nodeId in nodes_by_id:
+            active_tokens.append(token.model_copy())
+        else:
+            released.append(token.startId)
+
+    active_thoughts = {}
+    for node_id, thought_state in state.activeThoughts.items():
+        if node_id not in compiled.thought_bars:
+            released.append(thought_state.startId)
+            continue
+        thought_state = thought_state.model_copy()
+        if node_id in touched:
+            # Already past the new end: finish at the next bar boundary.
+            thought_state.remainingBars = max(1, compiled.thought_bars[node_id] - thought_state.barOffset)
+        active_thoughts[node_id] = thought_state
+
+    start_positions = {
+        start_id: (
+            _rebase_start_position(previous.start_edges_by_id.get(start_id, []), start_edges_by_id[start_id], pos)
+            if start_id in touched
+            else pos
+        )
+        for start_id, pos in state.startEdgePositions.items()
+        if start_id in start_edges_by_id
+    }
+    start_chains = {
+        start_id: count for start_id, count in state.startActiveChains.items() if start_id in start_edges_by_id
+    }
+    for start_id in released:
+        if start_id not in start_chains:
+            continue
+        start_chains[start_id] = max(0, start_chains[start_id] - 1)
+        if start_chains[start_id] > 0:
+            continue
+        edges = start_edges_by_id[start_id]
+        pos = start_positions.get(start_id, 0)
+        if pos < len(edges):
+            active_tokens.append(_token_from_edge(edges[pos], start_id=start_id))
+            start_chains[start_id] = 1
+            start_positions[start_id] = pos + 1
+
+    joins = dict(state.joins)
+    for node_id in touched & joins.keys() & previous.join_port_bits.keys() & compiled.join_port_bits.keys():
+        # The join's inputs may have been reordered; carry arrivals over by port id.
+        port_bits = compiled.join_port_bits[node_id]
+        arrived = join_mask_ports(joins[node_id], previous.join_port_bits[node_id])
+        joins[node_id] = sum(port_bits.get(port_id, 0) for port_id in arrived)
+
+    rebased = StreamRuntimeState(
+        barIndex=state.barIndex,
+        activeTokens=active_tokens,
+        activeThoughts=active_thoughts,
+        startQueues={start_id: list(edge_ids) for start_id, edge_ids in state.startQueues.items()},
+        startEdgePositions=start_positions,
+        startActiveChains=start_chains,
+        counters=dict(state.counters),
+        joins=joins,
+        lastSwitchRoutes=dict(state.lastSwitchRoutes),
+        started=state.started,
+        graphRevision=state.graphRevision,
+    )
+    compact_runtime_state(rebased, compiled)
+    return rebased
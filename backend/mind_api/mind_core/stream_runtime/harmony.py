@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
-from typing import List
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
 
 from ..music_elements.harmony_plan import HarmonyPlan, HarmonyStep
 from ..notes import note_name_to_midi, parse_notes_spec
 from ..progression_presets import get_progression_preset
-from ..theory import parse_key, resolve_roman_chord
+from ..theory import parse_key, roman_chord_pcs
+from ..theory.voicing import fit_register, voice_progression
 from .utils import (
     _coerce_chords_per_bar,
     _coerce_number,
     _normalize_note_name,
     _parse_roman_sequence,
-    _pitch_classes_to_midi,
     _resolve_progression_length,
     _steps_per_bar_for_grid,
 )
@@ -48,20 +51,100 @@ def _normalize_harmony_mode(params: dict) -> str:
 
 
 def _apply_register(pitches: List[int], *, register_min: int, register_max: int) -> List[int]:
-    if not pitches:
-        return []
-    adjusted: List[int] = []
-    for pitch in pitches:
-        value = pitch
-        while value < register_min:
-            value += 12
-        while value > register_max:
-            value -= 12
-        adjusted.append(max(0, min(127, value)))
-    return adjusted
+    return fit_register(pitches, register_min, register_max)
+
+
+DEFAULT_HARMONY_CACHE_SIZE = 512
+
+# Params read while resolving a progression (including the single-chord fallback).
+_HARMONY_PARAMS = (
+    "progressionPresetId",
+    "progressionVariantId",
+    "progressionCustom",
+    "progressionCustomVariantStyle",
+    "progressionLength",
+    "fillBehavior",
+    "key",
+    "chordNotes",
+    "chordRoot",
+    "chordQuality",
+    "voiceLeading",
+)
+
+HarmonyCacheKey = Tuple[Hashable, ...]
+
+
+def _hashable_param(value: Any) -> Hashable:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def harmony_cache_key(params: dict, duration_bars: int, grid: str) -> HarmonyCacheKey:
+    """Normalized harmony inputs; Thoughts with equal keys share one plan."""
+    return (
+        _normalize_harmony_mode(params),
+        _coerce_chords_per_bar(params.get("chordsPerBar")),
+        _coerce_number(params.get("registerMin"), 48),
+        _coerce_number(params.get("registerMax"), 84),
+        int(duration_bars),
+        grid,
+    ) + tuple(_hashable_param(params.get(name)) for name in _HARMONY_PARAMS)
+
+
+class HarmonyPlanCache:
+    """LRU of resolved progression ``HarmonyPlan``s, shared by every Thought and session.
+
+    Plans are immutable, so hits hand out the cached object.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_HARMONY_CACHE_SIZE) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[HarmonyCacheKey, HarmonyPlan]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: HarmonyCacheKey) -> Optional[HarmonyPlan]:
+        with self._lock:
+            plan = self._entries.get(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return plan
+
+    def put(self, key: HarmonyCacheKey, plan: HarmonyPlan) -> None:
+        with self._lock:
+            self._entries[key] = plan
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+HARMONY_CACHE = HarmonyPlanCache()
 
 
 def _resolve_progression_harmony(params: dict, duration_bars: int, grid: str) -> HarmonyPlan:
+    key = harmony_cache_key(params, duration_bars, grid)
+    plan = HARMONY_CACHE.get(key)
+    if plan is None:
+        plan = _build_progression_harmony(params, duration_bars, grid)
+        HARMONY_CACHE.put(key, plan)
+    return plan
+
+
+def _build_progression_harmony(params: dict, duration_bars: int, grid: str) -> HarmonyPlan:
     chords_per_bar = _coerce_chords_per_bar(params.get("chordsPerBar"))
     fill_behavior = params.get("fillBehavior") or "repeat"
     harmony_mode = _normalize_harmony_mode(params)
@@ -109,7 +192,7 @@ def _resolve_progression_harmony(params: dict, duration_bars: int, grid: str) ->
     register_min = _coerce_number(params.get("registerMin"), 48)
     register_max = _coerce_number(params.get("registerMax"), 84)
 
-    slot_chords: List[List[int]] = []
+    slot_pcs: List[Tuple[int, ...]] = []
     for slot_index in range(total_slots):
         roman = None
         if slot_index < slots_per_progression:
@@ -120,12 +203,10 @@ def _resolve_progression_harmony(params: dict, duration_bars: int, grid: str) ->
             roman = slot_romans[-1]
         elif fill_behavior == "rest":
             roman = None
-        if not roman:
-            slot_chords.append([])
-            continue
-        pcs = resolve_roman_chord(key, roman, variant_style)
-        chord = _pitch_classes_to_midi(pcs, register_min, register_max)
-        slot_chords.append(_apply_register(chord, register_min=register_min, register_max=register_max))
+        slot_pcs.append(roman_chord_pcs(key, roman, variant_style) if roman else ())
+    slot_chords = voice_progression(
+        slot_pcs, register_min, register_max, voice_leading=bool(params.get("voiceLeading"))
+    )
 
     steps_per_bar = _steps_per_bar_for_grid(grid)
     if chords_per_bar == 2.0:
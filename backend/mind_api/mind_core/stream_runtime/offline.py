@@ -0,0 +1,150 @@
+"""Offline whole-song rendering for V9 flow graphs.
+
+Runs the stream runtime bar after bar in-process, threading
+``StreamRuntimeState`` through, and flattens the result into one event
+timeline.  Usage::
+
+    python -m mind_api.mind_core.stream_runtime.offline graph.json --bars 64 -o song.json
+
+The input file holds either a bare flow graph or a compile request with a
+``flowGraph`` key (``seed``, ``bpm`` and ``startNodeIds`` are then read too).
+Without ``--bars`` rendering stops once every start chain is exhausted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from pydantic import ValidationError
+
+from ...models import CompileRequest, Diagnostic, Event, FlowGraph, StreamRuntimeState
+from .compiled_graph import COMPILED_GRAPH_CACHE
+from .constants import LOOP_BARS
+from .runtime import run_stream_runtime
+from .runtime_state import is_exhausted
+
+BEATS_PER_BAR = 4.0
+# Upper bound when rendering "until exhausted"; looping graphs never run dry.
+MAX_RENDER_BARS = 1024
+
+
+@dataclass
+class SongRender:
+    bpm: float
+    seed: int
+    bars: int
+    exhausted: bool
+    events: List[Event] = field(default_factory=list)
+    diagnostics: Dict[int, List[Diagnostic]] = field(default_factory=dict)
+    runtime_state: Optional[StreamRuntimeState] = None
+
+    @property
+    def ok(self) -> bool:
+        return not any(d.level == "error" for items in self.diagnostics.values() for d in items)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "bpm": self.bpm,
+            "seed": self.seed,
+            "bars": self.bars,
+            "exhausted": self.exhausted,
+            "events": [event.model_dump() for event in self.events],
+            "diagnostics": {
+                str(bar): [d.model_dump() for d in items] for bar, items in self.diagnostics.items()
+            },
+        }
+
+
+def render_song(
+    graph: FlowGraph,
+    *,
+    bars: Optional[int] = None,
+    seed: int = 0,
+    bpm: float = 120.0,
+    start_node_ids: Optional[Sequence[str]] = None,
+    executor: Optional[Executor] = None,
+) -> SongRender:
+    """Render ``bars`` bars from bar 0, or until no start chain has work left.
+
+    Event ``tBeat`` values are absolute (``bar * 4 + tBeat``).  The runtime's
+    own ``barIndex`` wraps at ``LOOP_BARS`` exactly as in live playback.
+    """
+    limit = MAX_RENDER_BARS if bars is None else max(0, int(bars))
+    compiled = COMPILED_GRAPH_CACHE.get(graph)
+    render = SongRender(bpm=bpm, seed=seed, bars=0, exhausted=False)
+    state: Optional[StreamRuntimeState] = None
+    for bar in range(limit):
+        # model_construct: the graph was validated once, not on every bar.
+        req = CompileRequest.model_construct(
+            seed=seed,
+            bpm=bpm,
+            barIndex=bar % LOOP_BARS,
+            nodes=[],
+            edges=[],
+            startNodeIds=list(start_node_ids or []),
+            flowGraph=graph,
+            runtimeState=state,
+            debug=False,
+        )
+        res = run_stream_runtime(req, compiled=compiled, executor=executor)
+        offset = bar * BEATS_PER_BAR
+        for event in res.events:
+            event.tBeat += offset
+        render.events.extend(res.events)
+        if res.diagnostics:
+            render.diagnostics[bar] = res.diagnostics
+        render.bars = bar + 1
+        state = res.runtimeState
+        if bars is None and is_exhausted(state):
+            render.exhausted = True
+            break
+    render.runtime_state = state
+    return render
+
+
+def _load_input(path: str) -> Dict[str, Any]:
+    text = sys.stdin.read() if path == "-" else Path(path).read_text(encoding="utf-8")
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("input must be a JSON object.")
+    return data
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render a V9 flow graph to an event timeline.")
+    parser.add_argument("input", help="flow graph or compile request JSON ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output JSON path ('-' for stdout)")
+    parser.add_argument("--bars", type=int, default=None, help="bars to render (default: until exhausted)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--bpm", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        data = _load_input(args.input)
+        graph = FlowGraph.model_validate(data.get("flowGraph", data))
+    except (ValueError, ValidationError) as exc:
+        parser.error(f"invalid input: {exc}")
+    if graph.graphVersion != 9:
+        parser.error("offline rendering requires a V9 flowGraph.")
+    seed = args.seed if args.seed is not None else int(data.get("seed") or 0)
+    bpm = args.bpm if args.bpm is not None else float(data.get("bpm") or 120.0)
+    start_node_ids = [str(item) for item in data.get("startNodeIds") or [] if item]
+
+    render = render_song(graph, bars=args.bars, seed=seed, bpm=bpm, start_node_ids=start_node_ids)
+    payload = json.dumps(render.to_dict(), indent=2)
+    if args.output == "-":
+        sys.stdout.write(payload + "\n")
+    else:
+        Path(args.output).write_text(payload + "\n", encoding="utf-8")
+    return 0 if render.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
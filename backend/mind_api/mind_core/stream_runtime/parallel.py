@@ -0,0 +1,77 @@
+"""Optional pooled compilation of the Thoughts that sound in one bar.
+
+Token handling stays on the caller's thread; ``run_stream_runtime`` records
+one ``ThoughtJob`` per Thought it fires and compiles them afterwards, either
+serially or through an ``Executor``.  Events are merged in job order and each
+job's diagnostics are spliced back at the point the job was recorded, so the
+response is identical whichever way the jobs ran.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from ...models import Diagnostic, FlowGraphNode
+from ..note_event import NoteEvent
+from .melody import _compile_thought_bar
+from .thought_spec import ThoughtSpec
+
+# Below this many Thoughts in a bar, pool overhead outweighs the work.
+PARALLEL_MIN_THOUGHTS = 4
+
+
+class ThoughtJob(NamedTuple):
+    node: FlowGraphNode
+    spec: ThoughtSpec
+    bar_offset: int
+    bpm: float
+    seed: int
+    # len(diagnostics) when the job was recorded; where its diagnostics belong.
+    diagnostic_position: int
+
+
+ThoughtResult = Tuple[List[NoteEvent], List[Diagnostic]]
+
+
+def _compile_thought_job(job: ThoughtJob) -> ThoughtResult:
+    diagnostics: List[Diagnostic] = []
+    events = _compile_thought_bar(job.node, job.bar_offset, job.bpm, diagnostics, job.seed, job.spec)
+    return events, diagnostics
+
+
+def compile_thought_jobs(jobs: Sequence[ThoughtJob], executor: Optional[Executor] = None) -> List[ThoughtResult]:
+    if executor is None or len(jobs) < PARALLEL_MIN_THOUGHTS:
+        return [_compile_thought_job(job) for job in jobs]
+    return list(executor.map(_compile_thought_job, jobs))
+
+
+def merge_thought_results(
+    jobs: Sequence[ThoughtJob],
+    results: Sequence[ThoughtResult],
+    events: List[NoteEvent],
+    diagnostics: List[Diagnostic],
+) -> List[Diagnostic]:
+    """Append job events to ``events``; return ``diagnostics`` with job diagnostics spliced in."""
+    merged: List[Diagnostic] = []
+    cursor = 0
+    for job, (job_events, job_diagnostics) in zip(jobs, results):
+        events.extend(job_events)
+        merged.extend(diagnostics[cursor : job.diagnostic_position])
+        cursor = job.diagnostic_position
+        merged.extend(job_diagnostics)
+    merged.extend(diagnostics[cursor:])
+    return merged
+
+
+def make_thought_executor(mode: str = "thread", max_workers: Optional[int] = None) -> Executor:
+    """Build a pool for ``run_stream_runtime(..., executor=...)``.
+
+    Threads share the pattern cache.  Processes sidestep the GIL but keep a
+    cache per worker, so they pay off only for heavy, mostly single-bar Thoughts.
+    """
+    if mode == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mind-thought")
+    if mode == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"unknown executor mode {mode!r}; expected 'thread' or 'process'.")
@@ -0,0 +1,98 @@
+"""Compiled-pattern cache for multi-bar Thoughts."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..note_event import NoteEvent
+
+DEFAULT_PATTERN_CACHE_SIZE = 256
+
+# (node id, params fingerprint, seed, grid)
+PatternCacheKey = Tuple[str, str, int, str]
+
+
+def params_fingerprint(params: dict | None) -> str:
+    payload = json.dumps(params or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class CompiledPattern:
+    """Bar-relative event slices of a Thought, rendered on first request.
+
+    ``render_bar`` emits one bar in O(steps_per_bar); each bar is rendered at
+    most once and later requests are a dictionary lookup.  Safe to share
+    between threads compiling the same bar.
+    """
+
+    def __init__(self, *, bar_count: int, render_bar: Callable[[int], List[NoteEvent]]) -> None:
+        self.bar_count = max(0, int(bar_count))
+        self._render_bar = render_bar
+        self._bars: Dict[int, Tuple[NoteEvent, ...]] = {}
+        self._lock = threading.Lock()
+
+    def events_for_bar(self, bar_offset: int) -> List[NoteEvent]:
+        if bar_offset < 0 or bar_offset >= self.bar_count:
+            return []
+        bar = self._bars.get(bar_offset)
+        if bar is None:
+            with self._lock:
+                bar = self._bars.get(bar_offset)
+                if bar is None:
+                    bar = tuple(self._render_bar(bar_offset))
+                    self._bars[bar_offset] = bar
+        # Hand out copies so callers can mutate events without touching the cache.
+        return [event.copy() for event in bar]
+
+
+class PatternCache:
+    """LRU cache of compiled Thought patterns.
+
+    Keys carry the params fingerprint and seed, so an edited Thought simply
+    misses and its old entry ages out under LRU pressure; callers playing the
+    same node with other params or seeds keep their own entries.  All
+    operations take one lock, so pooled Thought compilation can share the cache.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_PATTERN_CACHE_SIZE) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[PatternCacheKey, CompiledPattern]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: PatternCacheKey) -> bool:
+        return key in self._entries
+
+    def get(self, key: PatternCacheKey) -> Optional[CompiledPattern]:
+        with self._lock:
+            pattern = self._entries.get(key)
+            if pattern is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pattern
+
+    def put(self, key: PatternCacheKey, pattern: CompiledPattern) -> None:
+        with self._lock:
+            self._entries[key] = pattern
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+PATTERN_CACHE = PatternCache()
@@ -0,0 +1,108 @@
+"""Registry mapping note pattern ids to bar generators."""
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+from .bar_generator import BarGenerator, bar_generator
+
+# Relative names resolve against this package; third-party modules use absolute names.
+_BUILTIN_PATTERN_MODULES = (
+    ".patterns",
+    ".patterns_extra",
+    ".patterns_extra_more",
+)
+
+
+@dataclass(frozen=True)
+class PatternSpec:
+    pattern_id: str
+    generator: BarGenerator
+    needs_grid: bool = True
+    needs_piece_id: bool = False
+    needs_register: bool = False
+    bass_offset: int = 0
+
+    def generator_kwargs(
+        self,
+        *,
+        grid: str,
+        seed: int,
+        piece_id: str,
+        register_min: int,
+        register_max: int,
+    ) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"seed": seed}
+        if self.needs_grid:
+            kwargs["grid"] = grid
+        if self.needs_piece_id:
+            kwargs["piece_id"] = piece_id
+        if self.needs_register:
+            kwargs["register_min"] = max(0, register_min - self.bass_offset)
+            kwargs["register_max"] = max(register_min, register_max)
+        return kwargs
+
+
+_REGISTRY: Dict[str, PatternSpec] = {}
+_PATTERN_MODULES: List[str] = list(_BUILTIN_PATTERN_MODULES)
+_loaded_modules: set[str] = set()
+
+
+def register_pattern(
+    pattern_id: str,
+    *,
+    needs_grid: bool = True,
+    needs_piece_id: bool = False,
+    needs_register: bool = False,
+    bass_offset: int = 0,
+) -> Callable[[Callable[..., Any]], BarGenerator]:
+    """Register a per-bar generator under ``pattern_id``.
+
+    The decorated function receives ``(harmony, bar_index, *, seed, ...)``
+    plus the keyword arguments its declared capabilities ask for.
+    """
+
+    def decorator(emit: Callable[..., Any]) -> BarGenerator:
+        generator = emit if isinstance(emit, BarGenerator) else bar_generator(emit)
+        _REGISTRY[pattern_id] = PatternSpec(
+            pattern_id=pattern_id,
+            generator=generator,
+            needs_grid=needs_grid,
+            needs_piece_id=needs_piece_id,
+            needs_register=needs_register,
+            bass_offset=bass_offset,
+        )
+        return generator
+
+    return decorator
+
+
+def register_pattern_module(module_name: str) -> None:
+    """Add a module of ``@register_pattern`` generators to the lazy load list."""
+    if module_name not in _PATTERN_MODULES:
+        _PATTERN_MODULES.append(module_name)
+
+
+def _ensure_loaded() -> None:
+    if len(_loaded_modules) == len(_PATTERN_MODULES):
+        return
+    for module_name in _PATTERN_MODULES:
+        if module_name in _loaded_modules:
+            continue
+        importlib.import_module(module_name, __package__)
+        _loaded_modules.add(module_name)
+
+
+def get_pattern(pattern_id: str) -> Optional[PatternSpec]:
+    spec = _REGISTRY.get(pattern_id)
+    if spec is None:
+        _ensure_loaded()
+        spec = _REGISTRY.get(pattern_id)
+    return spec
+
+
+def supported_pattern_ids() -> FrozenSet[str]:
+    _ensure_loaded()
+    return frozenset(_REGISTRY)
@@ -3,118 +3,70 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, Iterable, List, Optional
+from concurrent.futures import Executor
+from typing import Dict, List, Optional
 
 from ...models import (
+    CompileRangeRequest,
+    CompileRangeResponse,
     CompileRequest,
     CompileResponse,
     Diagnostic,
-    Event,
-    FlowGraph,
-    FlowGraphEdge,
     FlowGraphNode,
     StreamRuntimeState,
     StreamRuntimeToken,
     StreamRuntimeThoughtState,
 )
-from .constants import MAX_NODE_FIRINGS_PER_BAR, MAX_TOKENS_PER_BAR
-from .melody import _compile_thought_bar, _thought_total_bars
-from .utils import _compare, _coerce_number, _seeded_random
+from ..note_event import NoteEvent, to_event_models
+from ..telemetry import TELEMETRY
+from .constants import ACTIVE_NODE_TYPES, LOOP_BARS, MAX_RANGE_BARS
+from .compiled_graph import COMPILED_GRAPH_CACHE, CompiledGraph
+from .parallel import ThoughtJob, compile_thought_jobs, merge_thought_results
+from .runtime_state import compact_runtime_state, runtime_state_size
+from .scheduler import TokenScheduler
+from .trace import (
+    COUNTER_FIRED,
+    JOIN_RELEASED,
+    JOIN_WAITING,
+    NODE_UNSUPPORTED,
+    NULL_TRACE,
+    START_EMITTED,
+    START_EMPTY,
+    START_INITIAL,
+    SWITCH_ROUTED,
+    THOUGHT_ALREADY_ACTIVE,
+    THOUGHT_COMPLETED,
+    THOUGHT_SINGLE_BAR,
+    THOUGHT_STARTED,
+    RuntimeTrace,
+)
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def _build_edge_index(edges: Iterable[FlowGraphEdge]) -> Dict[str, FlowGraphEdge]:
-    return {edge.id: edge for edge in edges}
-
-
-def _build_adjacency(graph: FlowGraph) -> tuple[Dict[str, List[FlowGraphEdge]], Dict[str, List[FlowGraphEdge]]]:
-    outgoing: Dict[str, List[FlowGraphEdge]] = {}
-    incoming: Dict[str, List[FlowGraphEdge]] = {}
-    for edge in graph.edges:
-        from_id = edge.from_.nodeId
-        to_id = edge.to.nodeId
-        outgoing.setdefault(from_id, []).append(edge)
-        incoming.setdefault(to_id, []).append(edge)
-    return outgoing, incoming
-
-
-def _token_from_edge(edge: FlowGraphEdge, *, start_id: Optional[str] = None) -> StreamRuntimeToken:
-    return StreamRuntimeToken(nodeId=edge.to.nodeId, viaEdgeId=edge.id, viaPortId=edge.to.portId, startId=start_id)
-
-
-def _required_join_inputs(node: FlowGraphNode, incoming: List[FlowGraphEdge]) -> List[str]:
-    if node.ports and node.ports.inputs:
-        return [port.id for port in node.ports.inputs if port.id]
-    port_ids = [edge.to.portId for edge in incoming if edge.to.portId]
-    return list(dict.fromkeys(port_ids))
-
-
-def _evaluate_switch(
-    node: FlowGraphNode,
-    outgoing: List[FlowGraphEdge],
-    state: StreamRuntimeState,
+def run_stream_runtime(
     req: CompileRequest,
-) -> tuple[List[FlowGraphEdge], List[str]]:
-    params = node.params or {}
-    branches = params.get("branches") or []
-    mode = params.get("mode") or "first"
-    default_branch = str(params.get("defaultBranch") or "default")
-    manual_selection = str(params.get("manualSelection") or "")
-    matched_edges: List[FlowGraphEdge] = []
-    matched_labels: List[str] = []
-
-    for branch in branches:
-        branch_id = str(branch.get("id") or "")
-        condition = branch.get("condition") or {"type": "always", "value": True}
-        ctype = condition.get("type") or "always"
-        ok = False
-        if ctype == "always":
-            ok = condition.get("value", True) is not False
-        elif ctype == "manual":
-            ok = manual_selection and manual_selection == str(condition.get("value") or "")
-        elif ctype == "counter":
-            counter_id = str(condition.get("counterId") or "")
-            current = state.counters.get(counter_id, 0)
-            op = condition.get("op") or ">="
-            value = _coerce_number(condition.get("value"), 0)
-            ok = _compare(op, current, value)
-        elif ctype == "barIndex":
-            op = condition.get("op") or ">="
-            value = _coerce_number(condition.get("value"), 0)
-            ok = _compare(op, req.barIndex, value)
-        elif ctype == "random":
-            threshold = condition.get("threshold")
-            if threshold is None:
-                threshold = condition.get("value")
-            try:
-                threshold_value = float(threshold)
-            except (TypeError, ValueError):
-                threshold_value = 0.5
-            salt = sum(ord(ch) for ch in node.id + branch_id)
-            ok = _seeded_random(req.seed, salt + req.barIndex) < threshold_value
-
-        if ok:
-            edges = [edge for edge in outgoing if edge.from_.portId == branch_id]
-            matched_edges.extend(edges)
-            matched_labels.append(branch_id)
-            if mode != "all":
-                return matched_edges, matched_labels
-
-    default_edges = [edge for edge in outgoing if edge.from_.portId == default_branch]
-    if default_edges:
-        return default_edges, [default_branch]
-    if outgoing:
-        fallback = outgoing[0]
-        return [fallback], [fallback.from_.portId or default_branch]
-    return [], [default_branch]
-
-
-def run_stream_runtime(req: CompileRequest) -> CompileResponse:
+    *,
+    compiled: Optional[CompiledGraph] = None,
+    executor: Optional[Executor] = None,
+    trace: Optional[RuntimeTrace] = None,
+    render: bool = True,
+) -> CompileResponse:
+    """Advance the runtime one bar.
+
+    ``compiled`` lets callers that hold a graph across bars (sessions, streams)
+    skip hashing it; otherwise the indexes come from ``COMPILED_GRAPH_CACHE``.
+    ``executor`` compiles the bar's Thoughts on a pool (see ``parallel``);
+    the response is the same as without it.  Trace records go to ``trace``
+    when given (sessions keep them unformatted), else are collected only
+    for ``req.debug``; ``debugTrace`` is filled only for ``req.debug``.
+    ``render=False`` advances the state without compiling any Thought, so
+    the response carries no events or Thought diagnostics.
+    """
     diagnostics: List[Diagnostic] = []
-    events: List[Event] = []
-    debug_trace: List[str] = []
+    events: List[NoteEvent] = []
+    if trace is None:
+        trace = RuntimeTrace(req.barIndex) if req.debug else NULL_TRACE
 
     if not req.flowGraph:
         diagnostics.append(Diagnostic(level="error", message="Missing flowGraph for V9 runtime.", line=1, col=1))
@@ -124,17 +76,15 @@ def run_stream_runtime(req: CompileRequest) -> CompileResponse:
             barIndex=req.barIndex,
             loopBars=16,
             events=[],
-            debugTrace=debug_trace,
+            debugTrace=[],
             runtimeState=req.runtimeState,
         )
 
-    graph = req.flowGraph
-    nodes_by_id = {node.id: node for node in graph.nodes}
-    outgoing, incoming = _build_adjacency(graph)
-    edge_index = _build_edge_index(graph.edges)
-    start_edges_by_id: Dict[str, List[FlowGraphEdge]] = {
-        node.id: outgoing.get(node.id, []) for node in nodes_by_id.values() if node.type == "start"
-    }
+    compiled = compiled or COMPILED_GRAPH_CACHE.get(req.flowGraph)
+    nodes_by_id = compiled.nodes_by_id
+    outgoing = compiled.outgoing
+    edge_index = compiled.edge_index
+    start_edges_by_id = compiled.start_edges_by_id
 
     state = req.runtimeState or StreamRuntimeState()
     next_state = StreamRuntimeState(
@@ -145,17 +95,25 @@ def run_stream_runtime(req: CompileRequest) -> CompileResponse:
         startEdgePositions=dict(state.startEdgePositions),
         startActiveChains=dict(state.startActiveChains),
         counters=dict(state.counters),
-        joins={key: list(value) for key, value in state.joins.items()},
+        joins=dict(state.joins),
         lastSwitchRoutes=dict(state.lastSwitchRoutes),
         started=state.started,
+        graphRevision=state.graphRevision,
+        legacyJoinPorts=state.legacyJoinPorts,
     )
+    if next_state.graphRevision != compiled.graph_hash:
+        # Static problems are reported once per revision, not every bar.
+        diagnostics.extend(compiled.diagnostics)
+        next_state.graphRevision = compiled.graph_hash
+        compact_runtime_state(next_state, compiled)
+    elif next_state.legacyJoinPorts:
+        compact_runtime_state(next_state, compiled)
     for start_id in start_edges_by_id:
         next_state.startActiveChains.setdefault(start_id, 0)
         next_state.startEdgePositions.setdefault(start_id, 0)
         next_state.startQueues.setdefault(start_id, [])
 
     current_tokens = list(state.activeTokens)
-    next_bar_tokens: List[StreamRuntimeToken] = []
 
     if not state.started:
         next_state.counters = {}
@@ -185,58 +143,14 @@ def run_stream_runtime(req: CompileRequest) -> CompileResponse:
             next_state.startActiveChains[node.id] = 0
             current_tokens.append(StreamRuntimeToken(nodeId=node.id))
         next_state.started = True
-        debug_trace.append("Start: emitted initial tokens.")
-
-    node_firings = 0
-    tokens_created = 0
+        trace.add(START_INITIAL)
 
-    def _increment_start_chain(start_id: Optional[str], delta: int) -> None:
-        if not start_id:
-            return
-        current = next_state.startActiveChains.get(start_id, 0)
-        updated = current + delta
-        if updated < 0:
-            updated = 0
-        next_state.startActiveChains[start_id] = updated
-        if updated == 0:
-            _queue_next_start_edge(start_id)
-
-    def _queue_next_start_edge(start_id: str) -> None:
-        edges = start_edges_by_id.get(start_id, [])
-        pos = next_state.startEdgePositions.get(start_id, 0)
-        if pos >= len(edges):
-            return
-        next_edge = edges[pos]
-        next_state.startEdgePositions[start_id] = pos + 1
-        enqueue_deferred([next_edge], start_id=start_id)
-        debug_trace.append(f"Start {start_id}: queued next edge {next_edge.id} after completion.")
-
-    def enqueue_immediate(edges: List[FlowGraphEdge], *, start_id: Optional[str]) -> None:
-        nonlocal tokens_created
-        for edge in edges:
-            queue.append(_token_from_edge(edge, start_id=start_id))
-            _increment_start_chain(start_id, 1)
-        tokens_created += len(edges)
-
-    def enqueue_deferred(edges: List[FlowGraphEdge], *, start_id: Optional[str]) -> None:
-        nonlocal tokens_created
-        for edge in edges:
-            next_bar_tokens.append(_token_from_edge(edge, start_id=start_id))
-            _increment_start_chain(start_id, 1)
-        tokens_created += len(edges)
+    scheduler = TokenScheduler(next_state, start_edges_by_id, trace)
+    enqueue_immediate = scheduler.enqueue_immediate
+    enqueue_deferred = scheduler.enqueue_deferred
+    release = scheduler.release
 
     def process_token(token: StreamRuntimeToken) -> None:
-        nonlocal node_firings, tokens_created
-        if node_firings >= MAX_NODE_FIRINGS_PER_BAR or tokens_created >= MAX_TOKENS_PER_BAR:
-            diagnostics.append(
-                Diagnostic(
-                    level="warn",
-                    message="Safety cap reached; runtime halted for this bar.",
-                    line=1,
-                    col=1,
-                )
-            )
-            return
         node = nodes_by_id.get(token.nodeId)
         if not node:
             diagnostics.append(
@@ -244,19 +158,21 @@ def run_stream_runtime(req: CompileRequest) -> CompileResponse:
             )
             return
 
-        node_firings += 1
+        scheduler.record_firing()
+        if node.type in ACTIVE_NODE_TYPES:
+            active_node_ids[node.id] = None
 
         if node.type == "thought":
             if node.id in activated_thoughts:
-                debug_trace.append(f"Thought {node.id}: already active, ignoring extra token.")
-                _increment_start_chain(token.startId, -1)
+                trace.add(THOUGHT_ALREADY_ACTIVE, node.id)
+                release(token.startId)
                 return
-            total_bars = max(1, _thought_total_bars(node))
-            events.extend(_compile_thought_bar(node, 0, req.bpm, diagnostics, req.seed))
+            total_bars = compiled.thought_bars[node.id]
+            queue_thought(node, 0)
             if total_bars <= 1:
                 edges = outgoing.get(node.id, [])
                 enqueue_deferred(edges, start_id=token.startId)
-                debug_trace.append(f"Thought {node.id}: single-bar, emitted {len(edges)} tokens.")
+                trace.add(THOUGHT_SINGLE_BAR, node.id, len(edges))
             else:
                 next_state.activeThoughts[node.id] = StreamRuntimeThoughtState(
                     remainingBars=total_bars - 1,
@@ -264,92 +180,84 @@ def run_stream_runtime(req: CompileRequest) -> CompileResponse:
                     viaEdgeId=token.viaEdgeId,
                     startId=token.startId,
                 )
-                _increment_start_chain(token.startId, 1)
-                debug_trace.append(f"Thought {node.id}: started ({total_bars} bars).")
+                scheduler.retain(token.startId)
+                trace.add(THOUGHT_STARTED, node.id, total_bars)
             activated_thoughts.add(node.id)
-            _increment_start_chain(token.startId, -1)
+            release(token.startId)
             return
 
         if node.type == "start":
-            queue_edges = list(next_state.startQueues.get(node.id, []))
-            if not queue_edges:
-                debug_trace.append(f"Start {node.id}: no queued edges.")
+            next_edge_id = scheduler.pop_start_edge(node.id)
+            if next_edge_id is None:
+                trace.add(START_EMPTY, node.id)
                 return
-            next_edge_id = queue_edges.pop(0)
             next_edge = edge_index.get(next_edge_id)
             if next_edge:
                 enqueue_immediate([next_edge], start_id=node.id)
-                debug_trace.append(f"Start {node.id}: emitted edge {next_edge_id}.")
-            next_state.startQueues[node.id] = queue_edges
+                trace.add(START_EMITTED, node.id, next_edge_id)
             return
 
         if node.type == "counter":
-            params = node.params or {}
-            start_value = _coerce_number(params.get("start"), 0)
-            step = _coerce_number(params.get("step"), 1)
+            start_value, step = compiled.counter_steps[node.id]
             current = next_state.counters.get(node.id, start_value)
             current += step
             next_state.counters[node.id] = current
             edges = outgoing.get(node.id, [])
             enqueue_immediate(edges, start_id=token.startId)
-            debug_trace.append(f"Counter {node.id}: value {current}, emitted {len(edges)} tokens.")
-            _increment_start_chain(token.startId, -1)
+            trace.add(COUNTER_FIRED, node.id, current, len(edges))
+            release(token.startId)
             return
 
         if node.type == "switch":
-            edges, branches = _evaluate_switch(node, outgoing.get(node.id, []), next_state, req)
-            if not edges:
-                diagnostics.append(
-                    Diagnostic(
-                        level="warn",
-                        message=f"Switch '{node.id}' has no matching branch and no default edge.",
-                        line=1,
-                        col=1,
-                    )
-                )
+            edges, branches = compiled.switch_tables[node.id].evaluate(next_state.counters, req.barIndex, req.seed)
             enqueue_immediate(edges, start_id=token.startId)
             if branches:
                 next_state.lastSwitchRoutes[node.id] = branches[-1]
-            debug_trace.append(f"Switch {node.id}: branch {', '.join(branches)}, emitted {len(edges)} tokens.")
-            _increment_start_chain(token.startId, -1)
+            trace.add(SWITCH_ROUTED, node.id, branches, len(edges))
+            release(token.startId)
             return
 
         if node.type == "join":
-            required_inputs = _required_join_inputs(node, incoming.get(node.id, []))
-            arrived = set(next_state.joins.get(node.id, []))
-            if token.viaPortId:
-                arrived.add(token.viaPortId)
-            if required_inputs and all(req_id in arrived for req_id in required_inputs):
+            port_bits = compiled.join_port_bits[node.id]
+            arrived = next_state.joins.get(node.id, 0) | port_bits.get(token.viaPortId, 0)
+            if port_bits and arrived == (1 << len(port_bits)) - 1:
                 edges = outgoing.get(node.id, [])
                 enqueue_immediate(edges, start_id=token.startId)
-                next_state.joins[node.id] = []
-                debug_trace.append(f"Join {node.id}: released, emitted {len(edges)} tokens.")
+                next_state.joins[node.id] = 0
+                trace.add(JOIN_RELEASED, node.id, len(edges))
             else:
-                next_state.joins[node.id] = list(arrived)
-                debug_trace.append(
-                    f"Join {node.id}: waiting ({len(arrived)}/{len(required_inputs)}) [{', '.join(sorted(arrived))}]."
-                )
-            _increment_start_chain(token.startId, -1)
+                next_state.joins[node.id] = arrived
+                trace.add(JOIN_WAITING, node.id, arrived, port_bits)
+            release(token.startId)
             return
 
-        debug_trace.append(f"Node {node.id}: unsupported type '{node.type}'.")
-        _increment_start_chain(token.startId, -1)
+        trace.add(NODE_UNSUPPORTED, node.id, node.type)
+        release(token.startId)
 
     activated_thoughts = set()
+    # Ordered set of the nodes the canvas highlights for this bar.
+    active_node_ids: Dict[str, None] = {}
+    thought_jobs: List[ThoughtJob] = []
+
+    def queue_thought(node: FlowGraphNode, bar_offset: int) -> None:
+        spec = compiled.thought_specs.get(node.id)
+        if spec is not None:
+            thought_jobs.append(ThoughtJob(node, spec, bar_offset, req.bpm, req.seed, len(diagnostics)))
 
     for node_id, thought_state in state.activeThoughts.items():
         node = nodes_by_id.get(node_id)
         if not node or node.type != "thought":
             continue
-        events.extend(_compile_thought_bar(node, thought_state.barOffset, req.bpm, diagnostics, req.seed))
+        queue_thought(node, thought_state.barOffset)
         activated_thoughts.add(node_id)
         remaining = thought_state.remainingBars - 1
         next_offset = thought_state.barOffset + 1
         if remaining <= 0:
             edges = outgoing.get(node_id, [])
             enqueue_deferred(edges, start_id=thought_state.startId)
-            _increment_start_chain(thought_state.startId, -1)
-            debug_trace.append(f"Thought {node_id}: completed, emitted {len(edges)} tokens.")
+            release(thought_state.startId)
+            active_node_ids[node_id] = None
+            trace.add(THOUGHT_COMPLETED, node_id, len(edges))
         else:
             next_state.activeThoughts[node_id] = StreamRuntimeThoughtState(
                 remainingBars=remaining,
@@ -358,22 +266,70 @@ def run_stream_runtime(req: CompileRequest) -> CompileResponse:
                 startId=thought_state.startId,
             )
 
-    queue = list(current_tokens)
-    for token in queue:
+    scheduler.push_ready(current_tokens)
+    while True:
+        token = scheduler.next_token()
+        if token is None:
+            break
+        if scheduler.cap_reached():
+            scheduler.drop_ready()
+            TELEMETRY.incr("runtime.safety_cap_hits")
+            diagnostics.append(
+                Diagnostic(
+                    level="warn",
+                    message="Safety cap reached; runtime halted for this bar.",
+                    line=1,
+                    col=1,
+                )
+            )
+            break
         process_token(token)
+    scheduler.finish()
 
-    next_state.activeTokens = next_bar_tokens
-    for node in nodes_by_id.values():
-        if node.type == "join" and node.id not in next_state.joins:
-            next_state.joins[node.id] = []
+    if render:
+        results = compile_thought_jobs(thought_jobs, executor)
+        diagnostics = merge_thought_results(thought_jobs, results, events, diagnostics)
+    for join_id in compiled.join_ids:
+        if join_id not in next_state.joins:
+            next_state.joins[join_id] = 0
 
     ok = not any(d.level == "error" for d in diagnostics)
+    TELEMETRY.incr("runtime.bars")
+    TELEMETRY.incr("runtime.thought_jobs", len(thought_jobs))
+    # Checked before serializing so the size is only measured for sampled records.
+    if logger.isEnabledFor(logging.DEBUG) and TELEMETRY.should_sample("runtime.state_bytes"):
+        logger.debug("runtime state after bar %s: %d bytes", req.barIndex, runtime_state_size(next_state))
     return CompileResponse(
         ok=ok,
         diagnostics=diagnostics,
         barIndex=req.barIndex,
         loopBars=16,
-        events=events,
-        debugTrace=debug_trace,
+        events=to_event_models(events),
+        debugTrace=trace.lines() if req.debug else [],
+        activeNodeIds=list(active_node_ids),
         runtimeState=next_state,
+        schedulerStats=scheduler.stats() if req.debug else None,
+    )
+
+
+def run_stream_runtime_range(req: CompileRangeRequest, *, executor: Optional[Executor] = None) -> CompileRangeResponse:
+    """Advance the runtime ``barCount`` bars, feeding each bar's state into the next."""
+    bar_count = max(1, min(MAX_RANGE_BARS, req.barCount))
+    bars: List[CompileResponse] = []
+    runtime_state = req.runtimeState
+    compiled = COMPILED_GRAPH_CACHE.get(req.flowGraph) if req.flowGraph else None
+    for offset in range(bar_count):
+        bar_req = req.model_copy(
+            update={"barIndex": (req.barIndex + offset) % LOOP_BARS, "runtimeState": runtime_state}
+        )
+        res = run_stream_runtime(bar_req, compiled=compiled, executor=executor)
+        bars.append(res)
+        runtime_state = res.runtimeState
+    return CompileRangeResponse(
+        ok=all(res.ok for res in bars),
+        barIndex=req.barIndex,
+        barCount=bar_count,
+        loopBars=LOOP_BARS,
+        bars=bars,
+        runtimeState=runtime_state,
     )
@@ -0,0 +1,69 @@
+"""Keeping ``StreamRuntimeState`` proportional to the graph it plays.
+
+The state is serialized every bar, so entries for nodes that were deleted
+from the graph must not linger.  ``compact_runtime_state`` drops them; the
+runtime calls it whenever it sees a new graph revision.  Join arrivals are
+stored as bit masks over ``CompiledGraph.join_port_bits``; joins sent in
+the older list form are converted here too.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+from ...models import StreamRuntimeState
+from .compiled_graph import CompiledGraph
+
+
+def join_mask_ports(mask: int, port_bits: Dict[str, int]) -> List[str]:
+    return [port_id for port_id, bit in port_bits.items() if mask & bit]
+
+
+def join_ports_mask(port_ids: Iterable[str], port_bits: Dict[str, int]) -> int:
+    mask = 0
+    for port_id in port_ids:
+        mask |= port_bits.get(port_id, 0)
+    return mask
+
+
+def compact_runtime_state(state: StreamRuntimeState, compiled: CompiledGraph) -> None:
+    """Drop, in place, every keyed entry whose node or edge is not in ``compiled``."""
+    start_edges_by_id = compiled.start_edges_by_id
+    state.counters = {node_id: value for node_id, value in state.counters.items() if node_id in compiled.counter_steps}
+    if state.legacyJoinPorts:
+        joins = dict(state.joins)
+        for node_id, ports in state.legacyJoinPorts.items():
+            port_bits = compiled.join_port_bits.get(node_id)
+            if port_bits is not None:
+                joins[node_id] = joins.get(node_id, 0) | join_ports_mask(ports, port_bits)
+        state.joins = joins
+        state.legacyJoinPorts = {}
+    state.joins = {
+        node_id: mask & ((1 << len(compiled.join_port_bits[node_id])) - 1)
+        for node_id, mask in state.joins.items()
+        if node_id in compiled.join_port_bits
+    }
+    state.lastSwitchRoutes = {
+        node_id: route for node_id, route in state.lastSwitchRoutes.items() if node_id in compiled.switch_tables
+    }
+    state.startQueues = {
+        start_id: [edge_id for edge_id in edge_ids if edge_id in compiled.edge_index]
+        for start_id, edge_ids in state.startQueues.items()
+        if start_id in start_edges_by_id
+    }
+    state.startEdgePositions = {
+        start_id: pos for start_id, pos in state.startEdgePositions.items() if start_id in start_edges_by_id
+    }
+    state.startActiveChains = {
+        start_id: count for start_id, count in state.startActiveChains.items() if start_id in start_edges_by_id
+    }
+
+
+def is_exhausted(state: Optional[StreamRuntimeState]) -> bool:
+    """True once every start chain has finished; later bars leave the state unchanged."""
+    return state is not None and state.started and not state.activeTokens and not state.activeThoughts
+
+
+def runtime_state_size(state: StreamRuntimeState) -> int:
+    """Bytes of the JSON the state costs on the wire; logged in sampled DEBUG records."""
+    return len(state.model_dump_json().encode("utf-8"))
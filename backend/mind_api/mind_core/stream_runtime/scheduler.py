@@ -0,0 +1,156 @@
+"""Per-bar token scheduler for the V9 stream runtime.
+
+Ordering is explicit and FIFO by arrival:
+
+1. tokens carried over from the previous bar, in the order they were deferred;
+2. initial start tokens on the first bar;
+3. tokens emitted while this bar runs, appended behind everything already ready.
+
+Tokens deferred to the next bar keep their emission order.  Each start node
+owns a FIFO of edge ids plus a chain counter; when the counter drops to zero
+the next outgoing edge of that start is deferred.  Chain bookkeeping is
+iterative, so draining the bar is O(tokens).
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional
+
+from ...models import FlowGraphEdge, StreamRuntimeState, StreamRuntimeToken, StreamSchedulerStats
+from .constants import MAX_NODE_FIRINGS_PER_BAR, MAX_TOKENS_PER_BAR
+from .trace import START_QUEUED_NEXT, RuntimeTrace
+
+
+def _token_from_edge(edge: FlowGraphEdge, *, start_id: Optional[str] = None) -> StreamRuntimeToken:
+    return StreamRuntimeToken(nodeId=edge.to.nodeId, viaEdgeId=edge.id, viaPortId=edge.to.portId, startId=start_id)
+
+
+@dataclass
+class _Counters:
+    processed: int = 0
+    immediate: int = 0
+    deferred: int = 0
+    dropped: int = 0
+    max_ready: int = 0
+
+
+class TokenScheduler:
+    """Ready queue, next-bar queue and start-chain bookkeeping for one bar."""
+
+    def __init__(
+        self,
+        state: StreamRuntimeState,
+        start_edges_by_id: Dict[str, List[FlowGraphEdge]],
+        trace: RuntimeTrace,
+        *,
+        max_node_firings: int = MAX_NODE_FIRINGS_PER_BAR,
+        max_tokens: int = MAX_TOKENS_PER_BAR,
+    ) -> None:
+        self._state = state
+        self._start_edges_by_id = start_edges_by_id
+        self._trace = trace
+        self._ready: Deque[StreamRuntimeToken] = deque()
+        self._next_bar: List[StreamRuntimeToken] = []
+        self._start_queues: Dict[str, Deque[str]] = {
+            start_id: deque(edge_ids) for start_id, edge_ids in state.startQueues.items()
+        }
+        self.max_node_firings = max_node_firings
+        self.max_tokens = max_tokens
+        self.node_firings = 0
+        self.tokens_created = 0
+        self._counters = _Counters()
+
+    # -- queues -----------------------------------------------------------
+
+    def push_ready(self, tokens: Iterable[StreamRuntimeToken]) -> None:
+        """Queue tokens that did not come from an edge (carried or initial)."""
+        self._ready.extend(tokens)
+        self._counters.max_ready = max(self._counters.max_ready, len(self._ready))
+
+    def enqueue_immediate(self, edges: List[FlowGraphEdge], *, start_id: Optional[str]) -> None:
+        for edge in edges:
+            self._ready.append(_token_from_edge(edge, start_id=start_id))
+            self.retain(start_id)
+        self.tokens_created += len(edges)
+        self._counters.immediate += len(edges)
+        self._counters.max_ready = max(self._counters.max_ready, len(self._ready))
+
+    def enqueue_deferred(self, edges: List[FlowGraphEdge], *, start_id: Optional[str]) -> None:
+        for edge in edges:
+            self._next_bar.append(_token_from_edge(edge, start_id=start_id))
+            self.retain(start_id)
+        self.tokens_created += len(edges)
+        self._counters.deferred += len(edges)
+
+    def next_token(self) -> Optional[StreamRuntimeToken]:
+        if not self._ready:
+            return None
+        self._counters.processed += 1
+        return self._ready.popleft()
+
+    def cap_reached(self) -> bool:
+        return self.node_firings >= self.max_node_firings or self.tokens_created >= self.max_tokens
+
+    def drop_ready(self) -> int:
+        """Discard everything still ready; used when the safety cap halts the bar."""
+        dropped = len(self._ready)
+        self._ready.clear()
+        self._counters.dropped += dropped
+        return dropped
+
+    def record_firing(self) -> None:
+        self.node_firings += 1
+
+    # -- start chains -----------------------------------------------------
+
+    def pop_start_edge(self, start_id: str) -> Optional[str]:
+        edge_ids = self._start_queues.get(start_id)
+        if not edge_ids:
+            return None
+        return edge_ids.popleft()
+
+    def retain(self, start_id: Optional[str]) -> None:
+        if not start_id:
+            return
+        chains = self._state.startActiveChains
+        chains[start_id] = chains.get(start_id, 0) + 1
+
+    def release(self, start_id: Optional[str]) -> None:
+        if not start_id:
+            return
+        chains = self._state.startActiveChains
+        updated = max(0, chains.get(start_id, 0) - 1)
+        chains[start_id] = updated
+        if updated == 0:
+            self._defer_next_start_edge(start_id)
+
+    def _defer_next_start_edge(self, start_id: str) -> None:
+        edges = self._start_edges_by_id.get(start_id, [])
+        pos = self._state.startEdgePositions.get(start_id, 0)
+        if pos >= len(edges):
+            return
+        next_edge = edges[pos]
+        self._state.startEdgePositions[start_id] = pos + 1
+        # retain() inside enqueue_deferred only raises the count, so this never recurses.
+        self.enqueue_deferred([next_edge], start_id=start_id)
+        self._trace.add(START_QUEUED_NEXT, start_id, next_edge.id)
+
+    # -- results ----------------------------------------------------------
+
+    def finish(self) -> None:
+        """Write the next-bar tokens and start queues back into the runtime state."""
+        self._state.activeTokens = self._next_bar
+        self._state.startQueues = {start_id: list(edge_ids) for start_id, edge_ids in self._start_queues.items()}
+
+    def stats(self) -> StreamSchedulerStats:
+        counters = self._counters
+        return StreamSchedulerStats(
+            tokensProcessed=counters.processed,
+            tokensImmediate=counters.immediate,
+            tokensDeferred=counters.deferred,
+            tokensDropped=counters.dropped,
+            maxReadyDepth=counters.max_ready,
+            nodeFirings=self.node_firings,
+        )
@@ -0,0 +1,233 @@
+"""Server-held playback sessions for the V9 stream runtime.
+
+A session keeps the graph and the ``StreamRuntimeState`` between bars, so
+clients send only a bar index and graph revision instead of round-tripping
+the whole state through JSON and pydantic validation.
+"""
+
+from __future__ import annotations
+
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence, Set
+
+from ...models import CompileRequest, FlowGraph, SessionCompileResponse, StreamRuntimeState
+from .checkpoints import seek_runtime_state
+from .compiled_graph import COMPILED_GRAPH_CACHE, CompiledGraph, graph_hash
+from .graph_delta import GraphDeltaOp, apply_graph_delta, delta_revision, rebase_runtime_state
+from .runtime import run_stream_runtime
+from .trace import RuntimeTrace, TraceRingBuffer
+
+DEFAULT_MAX_SESSIONS = 64
+DEFAULT_SESSION_IDLE_SECONDS = 15 * 60.0
+MAX_TRACE_BARS = 256
+
+
+class UnknownSessionError(KeyError):
+    """Session id was never issued, expired or was evicted."""
+
+
+class StaleGraphRevisionError(ValueError):
+    """Client referenced a graph revision the session does not hold."""
+
+
+@dataclass
+class PlaybackSession:
+    session_id: str
+    graph: FlowGraph
+    graph_revision: str
+    seed: int = 0
+    bpm: float = 120.0
+    start_node_ids: List[str] = field(default_factory=list)
+    runtime_state: Optional[StreamRuntimeState] = None
+    last_access: float = 0.0
+    compiled: Optional[CompiledGraph] = None
+    trace_buffer: Optional[TraceRingBuffer] = None
+
+    def set_graph(self, graph: FlowGraph, revision: Optional[str] = None) -> None:
+        self.graph = graph
+        self.compiled = COMPILED_GRAPH_CACHE.get(graph)
+        self.graph_revision = revision or self.compiled.graph_hash
+
+    def apply_delta(self, ops: Sequence[GraphDeltaOp]) -> Set[str]:
+        """Edit the held graph in place of resending it; returns the touched node ids.
+
+        Only touched nodes are recompiled; edited Thoughts miss the pattern
+        cache because its keys carry the params fingerprint.  The runtime state keeps every token and active
+        Thought whose node survives, so playback carries on from the next bar.
+        """
+        graph, touched = apply_graph_delta(self.graph, ops)
+        previous = self.compiled or COMPILED_GRAPH_CACHE.get(self.graph)
+        self.compiled = CompiledGraph.build(
+            graph,
+            graph_hash_value=delta_revision(self.graph_revision, ops),
+            previous=previous,
+            touched=touched,
+        )
+        self.graph = graph
+        self.graph_revision = self.compiled.graph_hash
+        if self.runtime_state is not None:
+            self.runtime_state = rebase_runtime_state(self.runtime_state, previous, self.compiled, touched)
+        return touched
+
+    def seek(self, bar: int) -> None:
+        """Restore the state playback from bar 0 would hold entering absolute ``bar``."""
+        if self.compiled is None:
+            self.compiled = COMPILED_GRAPH_CACHE.get(self.graph)
+        self.runtime_state = seek_runtime_state(
+            self.graph,
+            bar,
+            seed=self.seed,
+            bpm=self.bpm,
+            start_node_ids=self.start_node_ids,
+            compiled=self.compiled,
+        )
+
+    def compile_bar(self, bar_index: int, *, debug: bool = False) -> SessionCompileResponse:
+        # model_construct: graph and state were validated when they entered the session.
+        req = CompileRequest.model_construct(
+            seed=self.seed,
+            bpm=self.bpm,
+            barIndex=bar_index,
+            nodes=[],
+            edges=[],
+            startNodeIds=self.start_node_ids,
+            flowGraph=self.graph,
+            runtimeState=self.runtime_state,
+            debug=debug,
+        )
+        if self.compiled is None:
+            self.compiled = COMPILED_GRAPH_CACHE.get(self.graph)
+        trace = RuntimeTrace(bar_index) if self.trace_buffer is not None else None
+        res = run_stream_runtime(req, compiled=self.compiled, trace=trace)
+        if trace is not None:
+            self.trace_buffer.push(trace)
+        self.runtime_state = res.runtimeState
+        return SessionCompileResponse.model_construct(
+            ok=res.ok,
+            diagnostics=res.diagnostics,
+            barIndex=res.barIndex,
+            loopBars=res.loopBars,
+            events=res.events,
+            debugText=res.debugText,
+            debugTrace=res.debugTrace,
+            activeNodeIds=res.activeNodeIds,
+            runtimeState=None,
+            schedulerStats=res.schedulerStats,
+            sessionId=self.session_id,
+            graphRevision=self.graph_revision,
+        )
+
+
+class SessionStore:
+    """LRU-bounded session table with idle expiry."""
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_seconds: float = DEFAULT_SESSION_IDLE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_sessions = max(1, int(max_sessions))
+        self.idle_seconds = float(idle_seconds)
+        self._clock = clock
+        self._sessions: "OrderedDict[str, PlaybackSession]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def create(
+        self,
+        graph: FlowGraph,
+        *,
+        seed: int = 0,
+        bpm: float = 120.0,
+        start_node_ids: Optional[List[str]] = None,
+        revision: Optional[str] = None,
+        trace_bars: int = 0,
+    ) -> PlaybackSession:
+        now = self._clock()
+        self._expire(now)
+        session = PlaybackSession(
+            session_id=secrets.token_urlsafe(12),
+            graph=graph,
+            graph_revision=revision or graph_hash(graph),
+            seed=seed,
+            bpm=bpm,
+            start_node_ids=list(start_node_ids or []),
+            last_access=now,
+            trace_buffer=TraceRingBuffer(min(trace_bars, MAX_TRACE_BARS)) if trace_bars > 0 else None,
+        )
+        self._sessions[session.session_id] = session
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id: str) -> PlaybackSession:
+        now = self._clock()
+        self._expire(now)
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise UnknownSessionError(session_id)
+        session.last_access = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def clear(self) -> None:
+        self._sessions.clear()
+
+    def _expire(self, now: float) -> None:
+        # Sessions are ordered by last access, so expired ones sit at the front.
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_access < self.idle_seconds:
+                break
+            del self._sessions[session_id]
+
+
+def compile_session_bar(
+    session: PlaybackSession,
+    *,
+    bar_index: int,
+    revision: Optional[str] = None,
+    graph: Optional[FlowGraph] = None,
+    seed: Optional[int] = None,
+    bpm: Optional[float] = None,
+    reset: bool = False,
+    debug: bool = False,
+) -> SessionCompileResponse:
+    if graph is not None:
+        session.set_graph(graph, revision)
+    elif revision is not None and revision != session.graph_revision:
+        raise StaleGraphRevisionError(
+            f"session holds graph revision '{session.graph_revision}', got '{revision}'; resend flowGraph."
+        )
+    if seed is not None:
+        session.seed = seed
+    if bpm is not None:
+        session.bpm = bpm
+    if reset:
+        session.runtime_state = None
+    return session.compile_bar(bar_index, debug=debug)
+
+
+def apply_session_delta(
+    session: PlaybackSession, ops: Sequence[GraphDeltaOp], *, revision: Optional[str] = None
+) -> Set[str]:
+    if revision is not None and revision != session.graph_revision:
+        raise StaleGraphRevisionError(
+            f"session holds graph revision '{session.graph_revision}', got '{revision}'; refetch before editing."
+        )
+    return session.apply_delta(ops)
+
+
+SESSION_STORE = SessionStore()
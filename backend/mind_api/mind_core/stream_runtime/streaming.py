@@ -0,0 +1,161 @@
+"""WebSocket playback protocol for the V9 stream runtime.
+
+The socket handler in ``routes`` feeds each client message to
+``StreamPlayback.handle`` and sends back whatever it returns.  Bars are
+compiled ahead of the playhead but never more than ``lookaheadBars`` past
+the last bar the client acknowledged, so a slow client throttles the server.
+
+Client messages::
+
+    {"type": "subscribe", "flowGraph": {...}, "bpm": 120, "seed": 0,
+     "startNodeIds": [...], "lookaheadBars": 4, "fromBar": 0}
+    {"type": "ack", "bar": 3}           # playhead reached absolute bar 3 (capped at the last bar sent)
+    {"type": "graph_delta", "ops": [...]}
+    {"type": "tempo", "bpm": 96}
+    {"type": "seek", "bar": 200}        # restart the stream at absolute bar 200
+
+Server messages are ``{"type": "bar", ...}``, ``{"type": "subscribed", ...}``,
+``{"type": "graph_applied", ...}`` and ``{"type": "error", "error": ...}``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from ...models import FlowGraph
+from .compiled_graph import graph_hash
+from .constants import LOOP_BARS, MAX_SEEK_BAR
+from .graph_delta import GraphDeltaError
+from .sessions import PlaybackSession
+
+DEFAULT_LOOKAHEAD_BARS = 2
+MAX_LOOKAHEAD_BARS = 16
+
+Message = Dict[str, Any]
+
+
+def _error(message: str) -> Message:
+    return {"type": "error", "error": message}
+
+
+class StreamPlayback:
+    """Per-connection playback state; transport-agnostic so it can be tested directly."""
+
+    def __init__(self) -> None:
+        self.session: Optional[PlaybackSession] = None
+        self.lookahead_bars = DEFAULT_LOOKAHEAD_BARS
+        self.next_bar = 0
+        self.acked_bar = -1
+
+    def handle(self, message: Any) -> List[Message]:
+        if not isinstance(message, dict):
+            return [_error("messages must be JSON objects.")]
+        kind = message.get("type")
+        if kind == "subscribe":
+            return self._subscribe(message)
+        if self.session is None:
+            return [_error("send 'subscribe' before other messages.")]
+        if kind == "ack":
+            try:
+                bar = int(message.get("bar"))
+            except (TypeError, ValueError):
+                return [_error("ack requires an integer 'bar'.")]
+            # Only bars already sent can be acknowledged; anything further would
+            # make ``fill`` compile an unbounded run of bars in one call.
+            self.acked_bar = max(self.acked_bar, min(bar, self.next_bar - 1))
+            return self.fill()
+        if kind == "graph_delta":
+            return self._graph_delta(self.session, message)
+        if kind == "seek":
+            try:
+                bar = max(0, min(MAX_SEEK_BAR, int(message.get("bar"))))
+            except (TypeError, ValueError):
+                return [_error("seek requires an integer 'bar'.")]
+            return self._seek(bar)
+        if kind == "tempo":
+            try:
+                self.session.bpm = float(message.get("bpm"))
+            except (TypeError, ValueError):
+                return [_error("tempo requires a numeric 'bpm'.")]
+            return []
+        return [_error(f"unsupported message type {kind!r}.")]
+
+    def fill(self) -> List[Message]:
+        """Compile bars until the lookahead window past the last ack is full."""
+        if self.session is None:
+            return []
+        messages: List[Message] = []
+        limit = self.acked_bar + self.lookahead_bars
+        while self.next_bar <= limit:
+            messages.append(self._compile(self.session, self.next_bar))
+            self.next_bar += 1
+        return messages
+
+    def _subscribe(self, message: Message) -> List[Message]:
+        try:
+            graph = FlowGraph.model_validate(message.get("flowGraph") or {})
+        except ValidationError as exc:
+            return [_error(f"invalid flowGraph: {exc.error_count()} validation errors.")]
+        if graph.graphVersion != 9:
+            return [_error("streaming requires a V9 flowGraph.")]
+        try:
+            lookahead = int(message.get("lookaheadBars") or DEFAULT_LOOKAHEAD_BARS)
+            from_bar = int(message.get("fromBar") or 0)
+            seed = int(message.get("seed") or 0)
+            bpm = float(message.get("bpm") or 120.0)
+        except (TypeError, ValueError):
+            return [_error("subscribe fields must be numeric.")]
+        self.lookahead_bars = max(1, min(MAX_LOOKAHEAD_BARS, lookahead))
+        self.session = PlaybackSession(
+            session_id="stream",
+            graph=graph,
+            graph_revision=graph_hash(graph),
+            seed=seed,
+            bpm=bpm,
+            start_node_ids=[str(item) for item in message.get("startNodeIds") or [] if item],
+        )
+        subscribed: Message = {
+            "type": "subscribed",
+            "graphRevision": self.session.graph_revision,
+            "lookaheadBars": self.lookahead_bars,
+        }
+        return [subscribed] + self._seek(max(0, min(MAX_SEEK_BAR, from_bar)))
+
+    def _seek(self, bar: int) -> List[Message]:
+        # Bars already sent past the new playhead are superseded by the ones that follow.
+        self.session.seek(bar)
+        self.next_bar = bar
+        self.acked_bar = bar - 1
+        return self.fill()
+
+    def _graph_delta(self, session: PlaybackSession, message: Message) -> List[Message]:
+        ops = message.get("ops") or []
+        if not isinstance(ops, list):
+            return [_error("graph_delta requires an 'ops' list.")]
+        try:
+            touched = session.apply_delta(ops)
+        except (GraphDeltaError, ValidationError) as exc:
+            return [_error(f"graph_delta rejected: {exc}")]
+        # Bars already sent keep the old graph; the edit applies from next_bar on.
+        return [
+            {
+                "type": "graph_applied",
+                "graphRevision": session.graph_revision,
+                "nodeIds": sorted(touched),
+                "fromBar": self.next_bar,
+            }
+        ]
+
+    @staticmethod
+    def _compile(session: PlaybackSession, bar: int) -> Message:
+        res = session.compile_bar(bar % LOOP_BARS)
+        return {
+            "type": "bar",
+            "bar": bar,
+            "barIndex": res.barIndex,
+            "ok": res.ok,
+            "events": [event.model_dump() for event in res.events],
+            "diagnostics": [diagnostic.model_dump() for diagnostic in res.diagnostics],
+        }
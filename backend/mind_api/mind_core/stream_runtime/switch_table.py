@@ -0,0 +1,149 @@
+"""Switch nodes compiled into branch tables.
+
+``compile_switch`` reads a switch's params once per graph revision.  It
+produces typed conditions with coerced operands, precomputed random salts
+and outgoing edges grouped by port.  ``SwitchTable.evaluate`` is then a
+plain loop over tuples.
+"""
+
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from ...models import FlowGraphEdge, FlowGraphNode
+from .utils import _coerce_number, _seeded_random
+
+# Condition kinds.
+ALWAYS = 0
+NEVER = 1
+COUNTER = 2
+BAR_INDEX = 3
+RANDOM = 4
+
+_OPS: Dict[str, Callable[[int, int], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+@dataclass(frozen=True)
+class SwitchBranch:
+    branch_id: str
+    kind: int
+    edges: Tuple[FlowGraphEdge, ...]
+    compare: Optional[Callable[[int, int], bool]] = None
+    value: int = 0
+    counter_id: str = ""
+    salt: int = 0
+    threshold: float = 0.5
+
+
+@dataclass(frozen=True)
+class SwitchTable:
+    node_id: str
+    match_all: bool
+    branches: Tuple[SwitchBranch, ...]
+    fallback_edges: Tuple[FlowGraphEdge, ...]
+    fallback_label: str
+
+    def evaluate(
+        self, counters: Mapping[str, int], bar_index: int, seed: int
+    ) -> Tuple[List[FlowGraphEdge], List[str]]:
+        matched_edges: List[FlowGraphEdge] = []
+        matched_labels: List[str] = []
+        for branch in self.branches:
+            kind = branch.kind
+            if kind == ALWAYS:
+                ok = True
+            elif kind == COUNTER:
+                ok = branch.compare(counters.get(branch.counter_id, 0), branch.value)
+            elif kind == BAR_INDEX:
+                ok = branch.compare(bar_index, branch.value)
+            elif kind == RANDOM:
+                ok = _seeded_random(seed, branch.salt + bar_index) < branch.threshold
+            else:
+                ok = False
+            if ok:
+                matched_edges.extend(branch.edges)
+                matched_labels.append(branch.branch_id)
+                if not self.match_all:
+                    return matched_edges, matched_labels
+        return list(self.fallback_edges), [self.fallback_label]
+
+
+def _compile_branch(
+    node: FlowGraphNode, branch: Any, manual_selection: str, edges_by_port: Dict[Optional[str], List[FlowGraphEdge]]
+) -> SwitchBranch:
+    if not isinstance(branch, dict):
+        return SwitchBranch(branch_id="", kind=NEVER, edges=())
+    branch_id = str(branch.get("id") or "")
+    edges = tuple(edges_by_port.get(branch_id, ()))
+    condition = branch.get("condition") or {"type": "always", "value": True}
+    if not isinstance(condition, dict):
+        return SwitchBranch(branch_id=branch_id, kind=NEVER, edges=edges)
+    ctype = condition.get("type") or "always"
+    if ctype == "always":
+        kind = ALWAYS if condition.get("value", True) is not False else NEVER
+        return SwitchBranch(branch_id=branch_id, kind=kind, edges=edges)
+    if ctype == "manual":
+        # The selection is a node param, so the outcome is fixed per revision.
+        selected = bool(manual_selection) and manual_selection == str(condition.get("value") or "")
+        return SwitchBranch(branch_id=branch_id, kind=ALWAYS if selected else NEVER, edges=edges)
+    if ctype in ("counter", "barIndex"):
+        op = condition.get("op") or ">="
+        compare = _OPS.get(op) if isinstance(op, str) else None
+        if compare is None:
+            return SwitchBranch(branch_id=branch_id, kind=NEVER, edges=edges)
+        return SwitchBranch(
+            branch_id=branch_id,
+            kind=COUNTER if ctype == "counter" else BAR_INDEX,
+            edges=edges,
+            compare=compare,
+            value=_coerce_number(condition.get("value"), 0),
+            counter_id=str(condition.get("counterId") or ""),
+        )
+    if ctype == "random":
+        threshold = condition.get("threshold")
+        if threshold is None:
+            threshold = condition.get("value")
+        try:
+            threshold_value = float(threshold)
+        except (TypeError, ValueError):
+            threshold_value = 0.5
+        return SwitchBranch(
+            branch_id=branch_id,
+            kind=RANDOM,
+            edges=edges,
+            salt=sum(ord(ch) for ch in node.id + branch_id),
+            threshold=threshold_value,
+        )
+    return SwitchBranch(branch_id=branch_id, kind=NEVER, edges=edges)
+
+
+def compile_switch(node: FlowGraphNode, outgoing: List[FlowGraphEdge]) -> SwitchTable:
+    params = node.params or {}
+    branches = params.get("branches") or []
+    default_branch = str(params.get("defaultBranch") or "default")
+    manual_selection = str(params.get("manualSelection") or "")
+    edges_by_port: Dict[Optional[str], List[FlowGraphEdge]] = {}
+    for edge in outgoing:
+        edges_by_port.setdefault(edge.from_.portId, []).append(edge)
+
+    fallback_edges: Tuple[FlowGraphEdge, ...] = tuple(edges_by_port.get(default_branch, ()))
+    fallback_label = default_branch
+    if not fallback_edges and outgoing:
+        fallback_edges = (outgoing[0],)
+        fallback_label = outgoing[0].from_.portId or default_branch
+    return SwitchTable(
+        node_id=node.id,
+        match_all=(params.get("mode") or "first") == "all",
+        branches=tuple(_compile_branch(node, branch, manual_selection, edges_by_port) for branch in branches),
+        fallback_edges=fallback_edges,
+        fallback_label=fallback_label,
+    )
@@ -0,0 +1,125 @@
+"""Thought params parsed once per graph revision.
+
+``build_thought_spec`` validates a Thought node and coerces every param the
+compiler reads into a frozen ``ThoughtSpec``.  ``CompiledGraph`` keeps one
+spec per Thought and reuses it until the node changes, so compiling a bar
+reads attributes instead of re-coercing ``node.params`` and re-hashing them;
+custom melodies are compiled into onset tables here as well.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from ..determinism import DEFAULT_SEED_VERSION, SEED_VERSIONS, seed_key, use_seed_version
+from ...models import Diagnostic, FlowGraphNode
+from .constants import ALLOWED_GRIDS
+from .custom_melody import CustomMelody, compile_custom_melody
+from .harmony import _normalize_harmony_mode
+from .pattern_cache import params_fingerprint
+from .pattern_registry import get_pattern
+from .utils import _combined_seed, _coerce_number
+
+
+@dataclass(frozen=True)
+class ThoughtSpec:
+    """Coerced settings of one Thought; custom-melody specs only use the first fields."""
+
+    node_id: str
+    custom_melody: Optional[CustomMelody]
+    fingerprint: str
+    duration_bars: int
+    instrument_preset: Optional[str] = None
+    grid: str = ""
+    seed_version: int = DEFAULT_SEED_VERSION
+    note_pattern_id: str = ""
+    register_min: int = 48
+    register_max: int = 84
+    style_seed: int = 0
+    single_chord: bool = True
+    syncopation: str = "none"
+    timing_warp: str = "none"
+    timing_intensity: float = 0.0
+    lane: str = "note"
+
+    def pattern_seed(self, seed: int) -> int:
+        """Generator seed for the global ``seed``; only derived on pattern-cache misses."""
+        with use_seed_version(self.seed_version):
+            combined_seed = _combined_seed(seed, self.style_seed, self.node_id)
+            return seed_key(combined_seed, self.note_pattern_id) % 2147483647
+
+
+def _coerce_float(value: object) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def build_thought_spec(node: FlowGraphNode) -> Tuple[Optional[ThoughtSpec], List[Diagnostic]]:
+    """Validate ``node``; the spec is ``None`` when it can never produce events."""
+    params = node.params or {}
+    diagnostics: List[Diagnostic] = []
+    fingerprint = params_fingerprint(params)
+    duration_bars = max(1, _coerce_number(params.get("durationBars"), 1))
+    instrument_preset = params.get("instrumentPreset") or None
+    melody_mode = (params.get("melodyMode") or "generated").lower()
+    if melody_mode == "custom":
+        spec = ThoughtSpec(
+            node_id=node.id,
+            custom_melody=compile_custom_melody(node),
+            fingerprint=fingerprint,
+            duration_bars=duration_bars,
+            instrument_preset=instrument_preset,
+        )
+        return spec, diagnostics
+
+    grid = str(params.get("rhythmGrid") or "1/12")
+    if grid not in ALLOWED_GRIDS:
+        diagnostics.append(
+            Diagnostic(level="error", message=f"Thought '{node.id}': invalid grid '{grid}'", line=1, col=1)
+        )
+        return None, diagnostics
+
+    seed_version = _coerce_number(params.get("seedVersion"), DEFAULT_SEED_VERSION)
+    if seed_version not in SEED_VERSIONS:
+        diagnostics.append(
+            Diagnostic(
+                level="warn",
+                message=f"Thought '{node.id}': unknown seed version '{seed_version}'; using {DEFAULT_SEED_VERSION}.",
+                line=1,
+                col=1,
+            )
+        )
+        seed_version = DEFAULT_SEED_VERSION
+    note_pattern_id = (params.get("notePatternId") or "simple_arpeggio").strip().lower()
+    if get_pattern(note_pattern_id) is None:
+        diagnostics.append(
+            Diagnostic(
+                level="error",
+                message=f"Thought '{node.id}': note pattern id '{note_pattern_id}' has no generator.",
+                line=1,
+                col=1,
+            )
+        )
+        return None, diagnostics
+    spec = ThoughtSpec(
+        node_id=node.id,
+        custom_melody=None,
+        fingerprint=fingerprint,
+        duration_bars=duration_bars,
+        instrument_preset=instrument_preset,
+        grid=grid,
+        seed_version=seed_version,
+        note_pattern_id=note_pattern_id,
+        register_min=_coerce_number(params.get("registerMin"), 48),
+        register_max=_coerce_number(params.get("registerMax"), 84),
+        style_seed=_coerce_number(params.get("styleSeed"), 0),
+        single_chord=_normalize_harmony_mode(params) == "single",
+        syncopation=params.get("syncopation") or "none",
+        timing_warp=params.get("timingWarp") or "none",
+        timing_intensity=_coerce_float(params.get("timingIntensity")),
+        lane=str(params.get("lane") or "note"),
+    )
+    return spec, diagnostics
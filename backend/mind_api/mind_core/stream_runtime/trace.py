@@ -0,0 +1,102 @@
+"""Lazily formatted runtime trace.
+
+The runtime records ``TraceRecord`` tuples (a kind plus raw arguments) and
+only turns them into text when a response or a trace pull asks for it.
+Requests without ``debug`` record into ``NULL_TRACE``, which drops
+everything.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Tuple
+
+START_INITIAL = "start_initial"
+START_EMITTED = "start_emitted"
+START_EMPTY = "start_empty"
+START_QUEUED_NEXT = "start_queued_next"
+THOUGHT_ALREADY_ACTIVE = "thought_already_active"
+THOUGHT_SINGLE_BAR = "thought_single_bar"
+THOUGHT_STARTED = "thought_started"
+THOUGHT_COMPLETED = "thought_completed"
+COUNTER_FIRED = "counter_fired"
+SWITCH_ROUTED = "switch_routed"
+JOIN_RELEASED = "join_released"
+JOIN_WAITING = "join_waiting"
+NODE_UNSUPPORTED = "node_unsupported"
+
+_FORMATTERS: Dict[str, Callable[..., str]] = {
+    START_INITIAL: lambda: "Start: emitted initial tokens.",
+    START_EMITTED: lambda node_id, edge_id: f"Start {node_id}: emitted edge {edge_id}.",
+    START_EMPTY: lambda node_id: f"Start {node_id}: no queued edges.",
+    START_QUEUED_NEXT: lambda node_id, edge_id: f"Start {node_id}: queued next edge {edge_id} after completion.",
+    THOUGHT_ALREADY_ACTIVE: lambda node_id: f"Thought {node_id}: already active, ignoring extra token.",
+    THOUGHT_SINGLE_BAR: lambda node_id, count: f"Thought {node_id}: single-bar, emitted {count} tokens.",
+    THOUGHT_STARTED: lambda node_id, bars: f"Thought {node_id}: started ({bars} bars).",
+    THOUGHT_COMPLETED: lambda node_id, count: f"Thought {node_id}: completed, emitted {count} tokens.",
+    COUNTER_FIRED: lambda node_id, value, count: f"Counter {node_id}: value {value}, emitted {count} tokens.",
+    SWITCH_ROUTED: lambda node_id, branches, count: (
+        f"Switch {node_id}: branch {', '.join(branches)}, emitted {count} tokens."
+    ),
+    JOIN_RELEASED: lambda node_id, count: f"Join {node_id}: released, emitted {count} tokens.",
+    JOIN_WAITING: lambda node_id, mask, port_bits: (
+        f"Join {node_id}: waiting ({bin(mask).count('1')}/{len(port_bits)}) "
+        f"[{', '.join(sorted(port_id for port_id, bit in port_bits.items() if mask & bit))}]."
+    ),
+    NODE_UNSUPPORTED: lambda node_id, node_type: f"Node {node_id}: unsupported type '{node_type}'.",
+}
+
+
+class TraceRecord(NamedTuple):
+    kind: str
+    args: Tuple[Any, ...]
+
+    def format(self) -> str:
+        return _FORMATTERS[self.kind](*self.args)
+
+
+class RuntimeTrace:
+    """Trace records for one bar."""
+
+    __slots__ = ("bar_index", "records")
+
+    def __init__(self, bar_index: int = 0) -> None:
+        self.bar_index = bar_index
+        self.records: List[TraceRecord] = []
+
+    def add(self, kind: str, *args: Any) -> None:
+        self.records.append(TraceRecord(kind, args))
+
+    def lines(self) -> List[str]:
+        return [record.format() for record in self.records]
+
+
+class _NullTrace(RuntimeTrace):
+    __slots__ = ()
+
+    def add(self, kind: str, *args: Any) -> None:
+        return None
+
+
+NULL_TRACE: RuntimeTrace = _NullTrace()
+
+
+class TraceRingBuffer:
+    """The last ``max_bars`` bars of unformatted trace."""
+
+    def __init__(self, max_bars: int) -> None:
+        self._bars: Deque[RuntimeTrace] = deque(maxlen=max(1, int(max_bars)))
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    def push(self, trace: RuntimeTrace) -> None:
+        self._bars.append(trace)
+
+    def last(self, bars: int) -> List[RuntimeTrace]:
+        if bars <= 0:
+            return []
+        return list(self._bars)[-bars:]
+
+    def clear(self) -> None:
+        self._bars.clear()
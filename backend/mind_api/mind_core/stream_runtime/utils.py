@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import List
 
-from ..determinism import stable_seed
+from ..determinism import seed_key
 from .constants import DEFAULT_PATTERN_FAMILY
 
 
@@ -17,17 +17,6 @@ def _coerce_number(value: object, fallback: int = 0) -> int:
         return fallback
 
 
-def _compare(op: str, left: int, right: int) -> bool:
-    return {
-        "==": left == right,
-        "!=": left != right,
-        ">": left > right,
-        ">=": left >= right,
-        "<": left < right,
-        "<=": left <= right,
-    }.get(op, False)
-
-
 def _seeded_random(seed: int, salt: int) -> float:
     value = (seed * 9301 + 49297 + salt * 233) % 233280
     return value / 233280.0
@@ -86,7 +75,7 @@ def _coerce_chords_per_bar(value: str | None) -> float:
 
 
 def _combined_seed(global_seed: int, style_seed: int, node_id: str) -> int:
-    return stable_seed(f"{int(global_seed)}:{int(style_seed)}:{node_id}") % 2147483647
+    return seed_key(int(global_seed), int(style_seed), node_id) % 2147483647
 
 
 def _pattern_family_for_type(pattern_type: str, *, seed: int) -> tuple[str, ...]:
@@ -99,7 +88,7 @@ def _pattern_family_for_type(pattern_type: str, *, seed: int) -> tuple[str, ...]
         return DEFAULT_PATTERN_FAMILY
     if len(base) == 1:
         return base
-    idx = stable_seed(f"pattern:{pattern_type}:{seed}") % len(base)
+    idx = seed_key("pattern", pattern_type, seed) % len(base)
     return (base[idx],) + tuple(opt for i, opt in enumerate(base) if i != idx)
 
 
@@ -126,23 +115,6 @@ def _resolve_progression_length(
     return max(1, numeric)
 
 
-def _pitch_classes_to_midi(pitch_classes: List[int], register_min: int, register_max: int) -> List[int]:
-    if not pitch_classes:
-        return []
-    if register_min > register_max:
-        register_min, register_max = register_max, register_min
-    base = register_min
-    voiced: List[int] = []
-    for pc in pitch_classes:
-        midi = base + ((pc - base) % 12)
-        while midi < register_min:
-            midi += 12
-        while midi > register_max:
-            midi -= 12
-        voiced.append(max(0, min(127, midi)))
-    return voiced
-
-
 def _apply_timing_adjustments(
     events: list,
     *,
@@ -170,20 +142,6 @@ def _apply_timing_adjustments(
     return events
 
 
-def _slice_events_to_bar(events: list, *, bar_offset: int) -> list:
-    if not events:
-        return []
-    bar_start = bar_offset * 4.0
-    bar_end = (bar_offset + 1) * 4.0
-    sliced: list = []
-    for event in events:
-        if bar_start <= event.tBeat < bar_end:
-            adjusted = event.model_validate(event.model_dump())
-            adjusted.tBeat = event.tBeat - bar_start
-            sliced.append(adjusted)
-    return sliced
-
-
 def _compute_pattern_bar_count(pat: str, steps_per_bar: int) -> int:
     if len(pat) <= steps_per_bar:
         return 1
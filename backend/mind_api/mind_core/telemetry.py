@@ -0,0 +1,68 @@
+"""Runtime telemetry: counters, sampled debug records and log-level setup.
+
+Hot paths bump counters instead of logging.  Detailed records go through
+``sampled_debug``, which returns before formatting anything unless the
+logger is enabled for DEBUG, and then emits only every Nth record per key.
+Log levels are applied by the application via ``configure_logging``;
+importing a module never changes logging configuration.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from typing import Any, Dict, Mapping, Optional, Union
+
+DEFAULT_LOG_LEVELS: Dict[str, Union[int, str]] = {"mind_api": "WARNING"}
+DEFAULT_DEBUG_SAMPLE_EVERY = 100
+
+
+class RuntimeTelemetry:
+    """Thread-safe named counters plus the sampling state for debug records."""
+
+    def __init__(self, *, sample_every: int = DEFAULT_DEBUG_SAMPLE_EVERY) -> None:
+        self.sample_every = max(1, int(sample_every))
+        self._counters: Counter[str] = Counter()
+        self._samples: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._samples.clear()
+
+    def should_sample(self, key: str) -> bool:
+        with self._lock:
+            count = self._samples[key]
+            self._samples[key] = count + 1
+        return count % self.sample_every == 0
+
+
+TELEMETRY = RuntimeTelemetry()
+
+
+def sampled_debug(logger: logging.Logger, key: str, message: str, *args: Any) -> None:
+    """Log ``message % args`` at DEBUG for every Nth call with this ``key``."""
+    if logger.isEnabledFor(logging.DEBUG) and TELEMETRY.should_sample(key):
+        logger.debug(message, *args)
+
+
+def configure_logging(
+    levels: Optional[Mapping[str, Union[int, str]]] = None,
+    *,
+    sample_every: Optional[int] = None,
+) -> None:
+    """Set per-module log levels (logger name -> level) and the debug sample rate."""
+    for name, level in (DEFAULT_LOG_LEVELS if levels is None else levels).items():
+        logging.getLogger(name).setLevel(level.upper() if isinstance(level, str) else level)
+    if sample_every is not None:
+        TELEMETRY.sample_every = max(1, int(sample_every))
@@ -3,7 +3,7 @@
 from .chord_symbols import parse_chord_symbol
 from .harmony_plan import HarmonyPlan
 from .key import Key, parse_key
-from .roman import resolve_roman, resolve_roman_chord
+from .roman import resolve_roman, resolve_roman_chord, roman_chord_pcs
 from .voicing import voice_chord
 
 __all__ = [
@@ -13,5 +13,6 @@ __all__ = [
     "parse_key",
     "resolve_roman",
     "resolve_roman_chord",
+    "roman_chord_pcs",
     "voice_chord",
 ]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 _NOTE_TO_PC = {
@@ -30,7 +31,13 @@ class Key:
     mode: str
 
 
-def parse_key(key: str) -> Key:
+MODES = ("major", "minor")
+
+# One shared instance per (tonic, mode); parse_key only ever returns these.
+_KEYS = {(tonic, mode): Key(tonic=tonic, mode=mode) for tonic in range(12) for mode in MODES}
+
+
+def _parse_key_uncached(key: str) -> Key:
     parts = key.strip().split()
     if not parts:
         raise ValueError("Empty key")
@@ -41,6 +48,12 @@ def parse_key(key: str) -> Key:
     mode = "major"
     if len(parts) > 1:
         mode = parts[1].lower()
-    if mode not in {"major", "minor"}:
+    if mode not in MODES:
         raise ValueError(f"Unknown mode '{mode}'")
-    return Key(tonic=tonic_pc, mode=mode)
+    return _KEYS[(tonic_pc, mode)]
+
+
+@lru_cache(maxsize=1024)
+def parse_key(key: str) -> Key:
+    # Errors are not cached; lru_cache only stores returned values.
+    return _parse_key_uncached(key)
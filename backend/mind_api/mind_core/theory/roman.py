@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 import re
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
-from .key import Key
+from .key import MODES, Key
 
 
 _MAJOR_SCALE = [0, 2, 4, 5, 7, 9, 11]
 _MINOR_SCALE = [0, 2, 3, 5, 7, 8, 10]
 _HARMONIC_MINOR = [0, 2, 3, 5, 7, 8, 11]
 
+# Variant styles that add chord tones; every other style resolves as "triads".
+VARIANT_STYLES = ("triads", "7ths", "9ths_soft")
+
+PitchClasses = Tuple[int, ...]
+
 
 def _degree_from_symbol(symbol: str) -> int:
     base = symbol.strip().lower().replace("7", "")
@@ -21,31 +27,53 @@ def _degree_from_symbol(symbol: str) -> int:
     raise ValueError(f"Unsupported roman numeral '{symbol}'")
 
 
-def _scale_for_symbol(key: Key, symbol: str) -> List[int]:
-    scale = _MAJOR_SCALE if key.mode == "major" else _MINOR_SCALE
-    if key.mode == "minor" and symbol.strip().startswith("V"):
-        scale = _HARMONIC_MINOR
-    return scale
+def _scale_for(mode: str, harmonic: bool) -> List[int]:
+    if mode == "major":
+        return _MAJOR_SCALE
+    return _HARMONIC_MINOR if harmonic and mode == "minor" else _MINOR_SCALE
 
 
-def resolve_roman(key: Key, symbol: str) -> List[int]:
-    degree = _degree_from_symbol(symbol)
-    scale = _scale_for_symbol(key, symbol)
-    triad_degrees = [degree, (degree + 2) % 7, (degree + 4) % 7]
-    pcs = [(key.tonic + scale[d]) % 12 for d in triad_degrees]
+def _chord_pcs(tonic: int, mode: str, degree: int, harmonic: bool, variant_style: str) -> PitchClasses:
+    scale = _scale_for(mode, harmonic)
+    pcs = [(tonic + scale[d]) % 12 for d in (degree, (degree + 2) % 7, (degree + 4) % 7)]
+    if variant_style in {"7ths", "9ths_soft"}:
+        pcs.append((tonic + scale[(degree + 6) % 7]) % 12)
+    if variant_style == "9ths_soft":
+        pcs.append((tonic + scale[(degree + 1) % 7]) % 12)
+    return tuple(pcs)
+
+
+# (tonic, mode, degree, harmonic minor?, variant style) -> pitch classes, for every key.
+_CHORD_TABLE: Dict[Tuple[int, str, int, bool, str], PitchClasses] = {
+    (tonic, mode, degree, harmonic, style): _chord_pcs(tonic, mode, degree, harmonic, style)
+    for tonic in range(12)
+    for mode in MODES
+    for degree in range(7)
+    for harmonic in (False, True)
+    for style in VARIANT_STYLES
+}
+
+
+@lru_cache(maxsize=1024)
+def _symbol_info(symbol: str) -> Tuple[int, bool]:
+    """Scale degree and whether a minor key borrows the leading tone (upper-case V...)."""
+    return _degree_from_symbol(symbol), symbol.strip().startswith("V")
+
+
+def roman_chord_pcs(key: Key, symbol: str, variant_style: str = "triads") -> PitchClasses:
+    """Pitch classes of ``symbol`` in ``key`` as a shared tuple; a table lookup after the first call per symbol."""
+    degree, harmonic = _symbol_info(symbol)
+    style = variant_style if variant_style in VARIANT_STYLES else "triads"
+    pcs = _CHORD_TABLE.get((key.tonic, key.mode, degree, harmonic, style))
+    if pcs is None:
+        # Hand-built keys outside the table (other modes, unreduced tonics).
+        pcs = _chord_pcs(key.tonic, key.mode, degree, harmonic, style)
     return pcs
 
 
+def resolve_roman(key: Key, symbol: str) -> List[int]:
+    return list(roman_chord_pcs(key, symbol))
+
+
 def resolve_roman_chord(key: Key, symbol: str, variant_style: str = "triads") -> List[int]:
-    pcs = resolve_roman(key, symbol)
-    if not pcs:
-        return []
-    scale = _scale_for_symbol(key, symbol)
-    degree = _degree_from_symbol(symbol)
-    if variant_style in {"7ths", "9ths_soft"}:
-        seventh = (key.tonic + scale[(degree + 6) % 7]) % 12
-        pcs.append(seventh)
-    if variant_style == "9ths_soft":
-        ninth = (key.tonic + scale[(degree + 1) % 7]) % 12
-        pcs.append(ninth)
-    return pcs
+    return list(roman_chord_pcs(key, symbol, variant_style))
@@ -1,6 +1,13 @@
+"""Register voicing shared by the theory helpers and the stream runtime.
+
+Pitches move into a register by whole octaves in one closed-form step
+instead of a loop per note, so voicing a full progression is a single pass
+of integer arithmetic.
+"""
+
 from __future__ import annotations
 
-from typing import List
+from typing import Dict, List, Optional, Sequence, Tuple
 
 
 _RANGES = {
@@ -10,12 +17,76 @@ _RANGES = {
 }
 
 
-def _notes_in_range(pitch_class: int, low: int, high: int) -> List[int]:
-    notes = []
-    for midi in range(low, high + 1):
-        if midi % 12 == pitch_class:
-            notes.append(midi)
-    return notes
+def _clamp_midi(pitch: int) -> int:
+    return 0 if pitch < 0 else 127 if pitch > 127 else pitch
+
+
+def fold_into_register(pitch: int, low: int, high: int) -> int:
+    """Raise ``pitch`` by octaves until it reaches ``low``, then lower it until it is at most ``high``."""
+    if pitch < low:
+        pitch += 12 * ((low - pitch + 11) // 12)
+    if pitch > high:
+        pitch -= 12 * ((pitch - high + 11) // 12)
+    return pitch
+
+
+def register_chord(pitch_classes: Sequence[int], low: int, high: int) -> List[int]:
+    """Voice each pitch class at its lowest pitch from ``low`` up (folded under ``high``), clamped to MIDI."""
+    if low > high:
+        low, high = high, low
+    voiced: List[int] = []
+    for pc in pitch_classes:
+        pitch = low + (pc - low) % 12
+        if pitch > high:
+            pitch -= 12 * ((pitch - high + 11) // 12)
+        voiced.append(_clamp_midi(pitch))
+    return voiced
+
+
+def fit_register(pitches: Sequence[int], low: int, high: int) -> List[int]:
+    """``fold_into_register`` for every pitch, clamped to MIDI; reversed bounds are not swapped."""
+    return [_clamp_midi(fold_into_register(pitch, low, high)) for pitch in pitches]
+
+
+def _nearest_chord(pitch_classes: Sequence[int], center: int, low: int, high: int) -> List[int]:
+    # Pitch of each class closest to ``center``, then kept inside the register.
+    return fit_register([center + (pc - center + 6) % 12 - 6 for pc in pitch_classes], low, high)
+
+
+def voice_progression(
+    chords: Sequence[Sequence[int]], low: int, high: int, *, voice_leading: bool = False
+) -> List[List[int]]:
+    """Voice every chord (pitch classes) of a progression into ``[low, high]``.
+
+    By default each chord is placed from the bottom of the register.  With
+    ``voice_leading`` every chord after the first non-empty one is instead
+    placed around the centre of the previous chord, keeping voices close.
+    Empty chords (rests) stay empty.
+    """
+    # register_chord already lands inside a register an octave or wider.
+    needs_fit = not (low <= high and high - low >= 11)
+    placed: Dict[Tuple[int, ...], List[int]] = {}
+    voiced: List[List[int]] = []
+    previous: Optional[List[int]] = None
+    for chord in chords:
+        if not chord:
+            voiced.append([])
+            continue
+        if voice_leading and previous:
+            current = _nearest_chord(chord, (min(previous) + max(previous)) // 2, low, high)
+        else:
+            # Progressions repeat chords; each distinct one is voiced once.
+            key = tuple(chord)
+            current = placed.get(key)
+            if current is None:
+                current = register_chord(key, low, high)
+                if needs_fit:
+                    current = fit_register(current, low, high)
+                placed[key] = current
+            current = list(current)
+        voiced.append(current)
+        previous = current
+    return voiced
 
 
 def voice_chord(pitch_classes: List[int], register: str = "mid") -> List[int]:
@@ -24,15 +95,10 @@ def voice_chord(pitch_classes: List[int], register: str = "mid") -> List[int]:
     low, high = _RANGES[register]
     voiced: List[int] = []
     for pc in pitch_classes:
-        candidates = _notes_in_range(pc, low, high)
-        if candidates:
-            voiced.append(candidates[0])
+        # Lowest in-range pitch of the class; only true pitch classes (0-11) can match one.
+        pitch = low + (pc - low) % 12
+        if 0 <= pc < 12 and pitch <= high:
+            voiced.append(pitch)
         else:
-            midi = pc
-            while midi < low:
-                midi += 12
-            while midi > high:
-                midi -= 12
-            voiced.append(midi)
+            voiced.append(fold_into_register(pc, low, high))
     return voiced
-
@@ -248,7 +248,98 @@ class CompileResponse(BaseModel):
     events: List[Event] = Field(default_factory=list)
     debugText: Optional[str] = None
     debugTrace: List[str] = Field(default_factory=list)
+    # Nodes that handled a token or finished a Thought this bar, in firing order;
+    # filled without ``debug`` so the canvas can highlight them cheaply.
+    activeNodeIds: List[str] = Field(default_factory=list)
     runtimeState: Optional["StreamRuntimeState"] = None
+    schedulerStats: Optional["StreamSchedulerStats"] = None
+
+
+class CompileRangeRequest(CompileRequest):
+    barCount: int = 4
+
+    @field_validator("barCount", mode="before")
+    @classmethod
+    def coerce_bar_count(cls, value: Any) -> Any:
+        return 4 if value is None else value
+
+
+class CompileRangeResponse(BaseModel):
+    ok: bool = True
+    barIndex: int = 0
+    barCount: int = 0
+    loopBars: int = 16
+    bars: List[CompileResponse] = Field(default_factory=list)
+    runtimeState: Optional["StreamRuntimeState"] = None
+
+
+# ---------------------------
+# Playback session models
+# ---------------------------
+
+class SessionCreateRequest(BaseModel):
+    seed: int = 0
+    bpm: float = 120.0
+    flowGraph: "FlowGraph"
+    graphRevision: Optional[str] = None
+    startNodeIds: List[str] = Field(default_factory=list)
+    # Bars of unformatted trace kept for GET /sessions/{id}/trace; 0 keeps none.
+    traceBars: int = 0
+
+
+class SessionCreateResponse(BaseModel):
+    sessionId: str
+    graphRevision: str
+
+
+class SessionCompileRequest(BaseModel):
+    barIndex: int = 0
+    graphRevision: Optional[str] = None
+    # Only required when graphRevision differs from the session's revision.
+    flowGraph: Optional["FlowGraph"] = None
+    seed: Optional[int] = None
+    bpm: Optional[float] = None
+    reset: bool = False
+    debug: bool = False
+
+
+class SessionCompileResponse(CompileResponse):
+    sessionId: str = ""
+    graphRevision: str = ""
+
+
+class SessionDeltaRequest(BaseModel):
+    # When set, the delta is rejected unless the session still holds this revision.
+    graphRevision: Optional[str] = None
+    ops: List[Dict[str, Any]] = Field(default_factory=list)
+
+
+class SessionDeltaResponse(BaseModel):
+    sessionId: str
+    graphRevision: str
+    nodeIds: List[str] = Field(default_factory=list)
+
+
+class SessionSeekRequest(BaseModel):
+    # Absolute bar counted from the start of playback, not the loop bar index;
+    # capped at MAX_SEEK_BAR (the response reports the bar actually used).
+    bar: int = 0
+
+
+class SessionSeekResponse(BaseModel):
+    sessionId: str
+    bar: int
+    barIndex: int
+
+
+class SessionTraceBar(BaseModel):
+    barIndex: int
+    trace: List[str] = Field(default_factory=list)
+
+
+class SessionTraceResponse(BaseModel):
+    sessionId: str
+    bars: List[SessionTraceBar] = Field(default_factory=list)
 
 
 # ---------------------------
@@ -331,9 +422,39 @@ class StreamRuntimeState(BaseModel):
     startEdgePositions: Dict[str, int] = Field(default_factory=dict)
     startActiveChains: Dict[str, int] = Field(default_factory=dict)
     counters: Dict[str, int] = Field(default_factory=dict)
-    joins: Dict[str, List[str]] = Field(default_factory=dict)
+    # Join id -> bit mask of arrived inputs, in the order of the join's input ports.
+    joins: Dict[str, int] = Field(default_factory=dict)
     lastSwitchRoutes: Dict[str, str] = Field(default_factory=dict)
     started: bool = False
+    graphRevision: Optional[str] = None
+    # Joins sent in the older list-of-arrived-ports form; the bits depend on the
+    # graph, so the runtime folds these into ``joins`` on the next bar.
+    legacyJoinPorts: Dict[str, List[str]] = Field(default_factory=dict, exclude=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def split_legacy_joins(cls, data: Any) -> Any:
+        joins = data.get("joins") if isinstance(data, dict) else None
+        if not isinstance(joins, dict):
+            return data
+        legacy = {node_id: [str(port) for port in ports] for node_id, ports in joins.items() if isinstance(ports, list)}
+        if not legacy:
+            return data
+        return {
+            **data,
+            "joins": {node_id: mask for node_id, mask in joins.items() if node_id not in legacy},
+            "legacyJoinPorts": {**(data.get("legacyJoinPorts") or {}), **legacy},
+        }
+
+
+class StreamSchedulerStats(BaseModel):
+    tokensProcessed: int = 0
+    tokensImmediate: int = 0
+    tokensDeferred: int = 0
+    tokensDropped: int = 0
+    maxReadyDepth: int = 0
+    nodeFirings: int = 0
+
 
 class EdgeEndpoint(BaseModel):
     nodeId: str
@@ -2,7 +2,8 @@
 API route definitions for the MIND backend.
 
 This module defines the FastAPI router used by ``main.create_app``.
-Separate endpoints handle parsing, compilation and preset retrieval.
+Separate endpoints handle parsing, compilation, playback sessions and
+preset retrieval.
 """
 
 from __future__ import annotations
@@ -11,20 +12,48 @@ import json
 from pathlib import Path
 from typing import List
 
-from fastapi import APIRouter
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 
 from .models import (
     ParseRequest,
     ParseResponse,
     CompileRequest,
     CompileResponse,
+    CompileRangeRequest,
+    CompileRangeResponse,
     PresetsResponse,
     Preset,
+    SessionCompileRequest,
+    SessionCompileResponse,
+    SessionCreateRequest,
+    SessionCreateResponse,
+    SessionDeltaRequest,
+    SessionDeltaResponse,
+    SessionSeekRequest,
+    SessionSeekResponse,
+    SessionTraceBar,
+    SessionTraceResponse,
 )
 from .mind_core.parser import parse_text
 from .mind_core.compiler import compile_request
-from .mind_core.stream_runtime import run_stream_runtime
+from .mind_core.stream_runtime import run_stream_runtime, run_stream_runtime_range
+from .mind_core.stream_runtime.checkpoints import CHECKPOINT_STORE
+from .mind_core.stream_runtime.compiled_graph import COMPILED_GRAPH_CACHE
+from .mind_core.stream_runtime.constants import LOOP_BARS, MAX_RANGE_BARS, MAX_SEEK_BAR
+from .mind_core.stream_runtime.harmony import HARMONY_CACHE
+from .mind_core.stream_runtime.graph_delta import GraphDeltaError
+from .mind_core.stream_runtime.sessions import (
+    SESSION_STORE,
+    StaleGraphRevisionError,
+    UnknownSessionError,
+    apply_session_delta,
+    compile_session_bar,
+)
+from .mind_core.stream_runtime.pattern_cache import PATTERN_CACHE
+from .mind_core.stream_runtime.streaming import StreamPlayback
+from .mind_core.telemetry import TELEMETRY
 
 
 api_router = APIRouter()
@@ -49,6 +78,162 @@ async def api_compile(req: CompileRequest) -> CompileResponse:
     return compile_request(req)
 
 
+@api_router.post("/compile/range", response_model=CompileRangeResponse)
+async def api_compile_range(req: CompileRangeRequest) -> CompileRangeResponse:
+    """Compile ``barCount`` consecutive bars in one round trip.
+
+    V9 graphs thread the runtime state from bar to bar; each entry of
+    ``bars`` carries that bar's events and resulting ``runtimeState``.
+    """
+    if req.flowGraph and req.flowGraph.graphVersion == 9:
+        return run_stream_runtime_range(req)
+    bar_count = max(1, min(MAX_RANGE_BARS, req.barCount))
+    bars = [
+        compile_request(req.model_copy(update={"barIndex": (req.barIndex + offset) % LOOP_BARS}))
+        for offset in range(bar_count)
+    ]
+    return CompileRangeResponse(
+        ok=all(res.ok for res in bars),
+        barIndex=req.barIndex,
+        barCount=bar_count,
+        loopBars=LOOP_BARS,
+        bars=bars,
+        runtimeState=req.runtimeState,
+    )
+
+
+@api_router.post("/sessions", response_model=SessionCreateResponse)
+async def api_create_session(req: SessionCreateRequest) -> SessionCreateResponse:
+    """Open a server-held playback session for a V9 flow graph."""
+    if req.flowGraph.graphVersion != 9:
+        return JSONResponse(status_code=400, content={"ok": False, "error": "Sessions require a V9 flowGraph."})
+    session = SESSION_STORE.create(
+        req.flowGraph,
+        seed=req.seed,
+        bpm=req.bpm,
+        start_node_ids=req.startNodeIds,
+        revision=req.graphRevision,
+        trace_bars=req.traceBars,
+    )
+    return SessionCreateResponse(sessionId=session.session_id, graphRevision=session.graph_revision)
+
+
+@api_router.post("/sessions/{session_id}/compile", response_model=SessionCompileResponse)
+async def api_compile_session(session_id: str, req: SessionCompileRequest) -> SessionCompileResponse:
+    """Compile the next bar of a session; the runtime state stays on the server."""
+    try:
+        session = SESSION_STORE.get(session_id)
+    except UnknownSessionError:
+        return JSONResponse(status_code=404, content={"ok": False, "error": f"Unknown session '{session_id}'."})
+    try:
+        return compile_session_bar(
+            session,
+            bar_index=req.barIndex,
+            revision=req.graphRevision,
+            graph=req.flowGraph,
+            seed=req.seed,
+            bpm=req.bpm,
+            reset=req.reset,
+            debug=req.debug,
+        )
+    except StaleGraphRevisionError as exc:
+        return JSONResponse(status_code=409, content={"ok": False, "error": str(exc)})
+
+
+@api_router.post("/sessions/{session_id}/delta", response_model=SessionDeltaResponse)
+async def api_session_delta(session_id: str, req: SessionDeltaRequest) -> SessionDeltaResponse:
+    """Apply graph edits to a session; playback continues from the next bar."""
+    try:
+        session = SESSION_STORE.get(session_id)
+    except UnknownSessionError:
+        return JSONResponse(status_code=404, content={"ok": False, "error": f"Unknown session '{session_id}'."})
+    try:
+        touched = apply_session_delta(session, req.ops, revision=req.graphRevision)
+    except StaleGraphRevisionError as exc:
+        return JSONResponse(status_code=409, content={"ok": False, "error": str(exc)})
+    except (GraphDeltaError, ValidationError) as exc:
+        return JSONResponse(status_code=400, content={"ok": False, "error": f"Graph delta rejected: {exc}"})
+    return SessionDeltaResponse(
+        sessionId=session.session_id, graphRevision=session.graph_revision, nodeIds=sorted(touched)
+    )
+
+
+@api_router.post("/sessions/{session_id}/seek", response_model=SessionSeekResponse)
+async def api_session_seek(session_id: str, req: SessionSeekRequest) -> SessionSeekResponse:
+    """Move a session to an absolute bar; compile ``barIndex`` next to continue from there."""
+    try:
+        session = SESSION_STORE.get(session_id)
+    except UnknownSessionError:
+        return JSONResponse(status_code=404, content={"ok": False, "error": f"Unknown session '{session_id}'."})
+    bar = max(0, min(MAX_SEEK_BAR, req.bar))
+    session.seek(bar)
+    return SessionSeekResponse(sessionId=session.session_id, bar=bar, barIndex=bar % LOOP_BARS)
+
+
+@api_router.get("/sessions/{session_id}/trace", response_model=SessionTraceResponse)
+async def api_session_trace(session_id: str, bars: int = 1) -> SessionTraceResponse:
+    """Format the last ``bars`` bars of a session's runtime trace."""
+    try:
+        session = SESSION_STORE.get(session_id)
+    except UnknownSessionError:
+        return JSONResponse(status_code=404, content={"ok": False, "error": f"Unknown session '{session_id}'."})
+    if session.trace_buffer is None:
+        return JSONResponse(status_code=400, content={"ok": False, "error": "Session was opened without traceBars."})
+    return SessionTraceResponse(
+        sessionId=session.session_id,
+        bars=[SessionTraceBar(barIndex=trace.bar_index, trace=trace.lines()) for trace in session.trace_buffer.last(bars)],
+    )
+
+
+@api_router.delete("/sessions/{session_id}")
+async def api_delete_session(session_id: str) -> dict:
+    """Close a playback session."""
+    return {"ok": SESSION_STORE.delete(session_id)}
+
+
+@api_router.get("/telemetry")
+async def api_telemetry() -> dict:
+    """Return runtime counters and cache statistics."""
+    return {
+        "counters": TELEMETRY.snapshot(),
+        "caches": {
+            "patterns": {"entries": len(PATTERN_CACHE), "hits": PATTERN_CACHE.hits, "misses": PATTERN_CACHE.misses},
+            "graphs": {
+                "entries": len(COMPILED_GRAPH_CACHE),
+                "hits": COMPILED_GRAPH_CACHE.hits,
+                "misses": COMPILED_GRAPH_CACHE.misses,
+            },
+            "harmony": {"entries": len(HARMONY_CACHE), "hits": HARMONY_CACHE.hits, "misses": HARMONY_CACHE.misses},
+            "checkpoints": {
+                "entries": len(CHECKPOINT_STORE),
+                "hits": CHECKPOINT_STORE.hits,
+                "misses": CHECKPOINT_STORE.misses,
+            },
+        },
+    }
+
+
+@api_router.websocket("/stream")
+async def api_stream(websocket: WebSocket) -> None:
+    """Push compiled bars ahead of the client's playhead over one connection.
+
+    See ``mind_core.stream_runtime.streaming`` for the message protocol.
+    """
+    await websocket.accept()
+    playback = StreamPlayback()
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except ValueError:
+                await websocket.send_json({"type": "error", "error": "messages must be valid JSON."})
+                continue
+            for reply in playback.handle(message):
+                await websocket.send_json(reply)
+    except WebSocketDisconnect:
+        return
+
+
 @api_router.get("/presets", response_model=PresetsResponse)
 async def api_presets() -> PresetsResponse:
     """Return the list of available presets."""
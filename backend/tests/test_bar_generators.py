@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from mind_api.mind_core.music_elements.harmony_plan import HarmonyPlan
+from mind_api.mind_core.stream_runtime.patterns import (
+    _generate_alberti_bass,
+    _generate_gate_mask,
+    _generate_simple_arpeggio,
+    _generate_walking_bass,
+)
+from mind_api.mind_core.stream_runtime.patterns_extra import _generate_hook
+
+
+def _harmony() -> HarmonyPlan:
+    chords = [[48, 52, 55], [53, 57, 60], [55, 59, 62], [45, 48, 52]] * 2
+    return HarmonyPlan.from_chords(chords, steps_per_bar=12)
+
+
+def _signature(events, *, shift: float = 0.0):
+    return [(round(e.tBeat + shift, 6), tuple(e.pitches), e.velocity, round(e.durationBeats, 6)) for e in events]
+
+
+def test_single_bar_matches_timeline_slice() -> None:
+    harmony = _harmony()
+    cases = [
+        (_generate_simple_arpeggio, {"grid": "1/12", "seed": 11, "piece_id": "demo"}),
+        (_generate_alberti_bass, {"grid": "1/12", "seed": 11}),
+        (_generate_gate_mask, {"grid": "1/12", "seed": 11}),
+        (_generate_hook, {"grid": "1/12", "seed": 11}),
+        (_generate_walking_bass, {"seed": 11, "register_min": 36, "register_max": 60}),
+    ]
+    for generator, kwargs in cases:
+        timeline = generator(harmony, bars=8, **kwargs)
+        for bar_index in (0, 5, 7):
+            expected = [e for e in timeline if bar_index * 4.0 <= e.tBeat < (bar_index + 1) * 4.0]
+            single = generator.bar(harmony, bar_index, **kwargs)
+            assert _signature(single, shift=bar_index * 4.0) == _signature(expected), generator.__name__
+            assert all(0.0 <= e.tBeat < 4.0 for e in single)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime, run_stream_runtime_range
+from mind_api.models import CompileRangeRequest, CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None, ports: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={}, ports=ports)
+
+
+def _edge(edge_id: str, from_node: str, from_port: str, to_node: str, to_port: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId=from_port),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId=to_port),
+        },
+    )
+
+
+def _graph() -> FlowGraph:
+    flow_ports = {"inputs": [{"id": "in", "type": "flow"}], "outputs": [{"id": "out", "type": "flow"}]}
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start", ports={"inputs": [], "outputs": [{"id": "out", "type": "flow"}]}),
+            _node("a", "thought", params={"durationBars": 2, "notePatternId": "alberti_bass"}, ports=flow_ports),
+            _node("b", "thought", params={"durationBars": 1, "notePatternId": "pulse"}, ports=flow_ports),
+        ],
+        edges=[_edge("e1", "start", "out", "a", "in"), _edge("e2", "a", "out", "b", "in")],
+    )
+
+
+def _signature(res):
+    return (
+        res.barIndex,
+        [(event.tBeat, tuple(event.pitches), event.sourceNodeId) for event in res.events],
+        res.runtimeState.model_dump() if res.runtimeState else None,
+    )
+
+
+def test_range_matches_bar_by_bar_compilation() -> None:
+    graph = _graph()
+    expected = []
+    state = None
+    for bar_index in range(14, 19):
+        res = run_stream_runtime(
+            CompileRequest(flowGraph=graph, barIndex=bar_index % 16, bpm=120, seed=5, runtimeState=state)
+        )
+        expected.append(_signature(res))
+        state = res.runtimeState
+
+    ranged = run_stream_runtime_range(
+        CompileRangeRequest(flowGraph=graph, barIndex=14, bpm=120, seed=5, barCount=5)
+    )
+    assert ranged.ok
+    assert ranged.barCount == 5
+    assert [_signature(res) for res in ranged.bars] == expected
+    assert [res.barIndex for res in ranged.bars] == [14, 15, 0, 1, 2]
+    assert ranged.runtimeState == ranged.bars[-1].runtimeState
+
+
+def test_range_bar_count_is_clamped() -> None:
+    ranged = run_stream_runtime_range(CompileRangeRequest(flowGraph=_graph(), barCount=0))
+    assert ranged.barCount == 1
+    assert len(ranged.bars) == 1
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.compiled_graph import CompiledGraph, CompiledGraphCache, graph_hash
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None, ui: dict | None = None) -> FlowGraphNode:
+    ports = {"inputs": [{"id": "in", "type": "flow"}], "outputs": [{"id": "out", "type": "flow"}]}
+    if node_type == "start":
+        ports = {"inputs": [], "outputs": [{"id": "out", "type": "flow"}]}
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui=ui or {}, ports=ports)
+
+
+def _edge(edge_id: str, from_node: str, to_node: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId="out"),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId="in"),
+        },
+    )
+
+
+def _graph(duration: int = 2, ui: dict | None = None) -> FlowGraph:
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start"),
+            _node("a", "thought", params={"durationBars": duration, "notePatternId": "alberti_bass"}, ui=ui),
+            _node("b", "thought", params={"durationBars": 1, "notePatternId": "pulse"}),
+        ],
+        edges=[_edge("e1", "start", "a"), _edge("e2", "a", "b")],
+    )
+
+
+def test_graph_hash_ignores_editor_only_fields() -> None:
+    base = _graph()
+    moved = _graph(ui={"x": 120, "y": 40})
+    assert graph_hash(base) == graph_hash(moved)
+    assert graph_hash(base) != graph_hash(_graph(duration=3))
+
+
+def test_cache_reuses_indexes_for_identical_content() -> None:
+    cache = CompiledGraphCache(max_entries=2)
+    first = cache.get(_graph())
+    assert cache.get(_graph(ui={"x": 1})) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get(_graph(duration=4)) is not first
+    assert cache.misses == 2
+    cache.get(_graph(duration=5))
+    assert len(cache) == 2
+    assert cache.get(_graph()) is not first
+
+
+def test_compiled_graph_indexes() -> None:
+    compiled = CompiledGraph.build(_graph(duration=3))
+    assert set(compiled.nodes_by_id) == {"start", "a", "b"}
+    assert [edge.id for edge in compiled.outgoing["a"]] == ["e2"]
+    assert [edge.id for edge in compiled.start_edges_by_id["start"]] == ["e1"]
+    assert compiled.thought_bars == {"a": 3, "b": 1}
+
+
+def test_runtime_with_precompiled_graph_matches_default_path() -> None:
+    graph = _graph()
+    compiled = CompiledGraph.build(graph)
+    state_a = state_b = None
+    for bar_index in range(4):
+        expected = run_stream_runtime(CompileRequest(flowGraph=graph, barIndex=bar_index, seed=3, runtimeState=state_a))
+        res = run_stream_runtime(
+            CompileRequest(flowGraph=graph, barIndex=bar_index, seed=3, runtimeState=state_b), compiled=compiled
+        )
+        state_a, state_b = expected.runtimeState, res.runtimeState
+        assert res.events == expected.events
+        assert res.runtimeState == expected.runtimeState
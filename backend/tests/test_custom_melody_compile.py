@@ -5,6 +5,7 @@ import sys
 sys.path.append("backend")
 
 from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.custom_melody import compile_custom_melody
 from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
 
 
@@ -66,3 +67,44 @@ def test_custom_melody_emits_events_with_holds_and_source() -> None:
     assert starts[1][0] == 3 * step_len
     assert starts[1][2] == [64]
     assert starts[1][3] == "thought-1"
+
+
+def _rows(melody, bar_offset: int, diagnostics: list) -> list[tuple]:
+    events = melody.bar_events(bar_offset, "t", "gm:0:0", diagnostics)
+    return [(ev.tBeat, ev.durationBeats, ev.pitches, ev.velocity, ev.preset, ev.sourceNodeId) for ev in events]
+
+
+def test_custom_melody_compiles_every_bar_once() -> None:
+    node = _node(
+        "t",
+        "thought",
+        params={
+            "melodyMode": "custom",
+            "customMelody": {
+                "grid": "1/4",
+                "bars": [{"rhythm": "x-3.", "notes": ["C4", "bogus", 67]}, {"rhythm": "9-99", "notes": "60 62"}, {}],
+            },
+        },
+    )
+    melody = compile_custom_melody(node)
+    diagnostics: list = []
+    assert _rows(melody, 0, diagnostics) == [
+        (0.0, 2.0, [60], 96, "gm:0:0", "t"),
+        (2.0, 1.0, [67], 51, "gm:0:0", "t"),
+    ]
+    assert diagnostics == []
+    assert _rows(melody, 1, diagnostics) == [(0.0, 2.0, [60], 123, "gm:0:0", "t"), (2.0, 1.0, [62], 123, "gm:0:0", "t")]
+    assert [d.message for d in diagnostics] == ["Thought 't': insufficient notes for custom melody; truncating."]
+    # Bars wrap; the diagnostics were built once and are reported with each bar.
+    again: list = []
+    assert _rows(melody, 4, again) == _rows(melody, 1, [])
+    assert again[0] is diagnostics[0]
+    skipped: list = []
+    assert _rows(melody, 2, skipped) == [] and "empty rhythm" in skipped[0].message
+
+
+def test_custom_melody_without_bars_reports_once_compiled_problem() -> None:
+    melody = compile_custom_melody(_node("t", "thought", params={"melodyMode": "custom"}))
+    diagnostics: list = []
+    assert _rows(melody, 3, diagnostics) == []
+    assert [d.message for d in diagnostics] == ["Thought 't': missing custom melody bars; skipping."]
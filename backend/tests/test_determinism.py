@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+
+from mind_api.mind_core.determinism import (
+    SEED_VERSION_FAST,
+    roll_steps,
+    seed_key,
+    stable_seed,
+    use_seed_version,
+)
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None, ports: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={}, ports=ports)
+
+
+def _edge(edge_id: str, from_node: str, from_port: str, to_node: str, to_port: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId=from_port),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId=to_port),
+        },
+    )
+
+
+def _graph(params: dict) -> FlowGraph:
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start", ports={"inputs": [], "outputs": [{"id": "out", "type": "flow"}]}),
+            _node("thought", "thought", params=params, ports={"inputs": [{"id": "in", "type": "flow"}], "outputs": []}),
+        ],
+        edges=[_edge("e1", "start", "out", "thought", "in")],
+    )
+
+
+def test_seed_key_v1_matches_string_seeds() -> None:
+    assert seed_key("gate", 17, 3, 5) == stable_seed("gate:17:3:5")
+    assert seed_key("piece", 0, 12) == stable_seed("piece:0:12")
+
+
+@pytest.mark.parametrize("version", [1, SEED_VERSION_FAST])
+def test_roll_steps_matches_seed_key(version: int) -> None:
+    with use_seed_version(version):
+        rolls = roll_steps(("demo", 42, 7), 24, 1000)
+        assert rolls == [seed_key("demo", 42, 7, step) % 1000 for step in range(24)]
+
+
+def test_fast_version_is_scoped_and_deterministic() -> None:
+    with use_seed_version(SEED_VERSION_FAST):
+        fast = seed_key("demo", 42, 7)
+        assert seed_key("demo", 42, 7) == fast
+        assert 0 <= fast < 2**32
+    assert seed_key("demo", 42, 7) == stable_seed("demo:42:7")
+    with pytest.raises(ValueError):
+        with use_seed_version(99):
+            pass
+
+
+def test_thought_seed_version_param() -> None:
+    params = {"notePatternId": "gate_mask", "rhythmGrid": "1/16", "durationBars": 1}
+
+    def _render(extra: dict):
+        res = run_stream_runtime(
+            CompileRequest(flowGraph=_graph({**params, **extra}), barIndex=0, bpm=120, seed=3)
+        )
+        return [(event.tBeat, tuple(event.pitches)) for event in res.events], res.diagnostics
+
+    legacy, _ = _render({})
+    assert _render({"seedVersion": 1})[0] == legacy
+    fast, _ = _render({"seedVersion": 2})
+    assert fast == _render({"seedVersion": 2})[0]
+    unknown, diagnostics = _render({"seedVersion": 7})
+    assert unknown == legacy
+    assert any(d.level == "warn" and "seed version" in d.message for d in diagnostics)
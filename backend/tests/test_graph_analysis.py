@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.compiled_graph import CompiledGraph
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={})
+
+
+def _edge(edge_id: str, from_node: str, to_node: str, to_port: str = "in") -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId="out"),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId=to_port),
+        },
+    )
+
+
+def _graph() -> FlowGraph:
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start"),
+            _node("a", "thought", {"durationBars": 2, "notePatternId": "no_such_pattern"}),
+            _node("orphan", "thought", {"notePatternId": "pulse"}),
+            _node("j", "join"),
+            _node("sw", "switch"),
+        ],
+        edges=[_edge("e1", "start", "a"), _edge("e2", "a", "ghost"), _edge("e3", "start", "sw")],
+    )
+
+
+def _messages(diagnostics) -> list[str]:
+    return [d.message for d in diagnostics]
+
+
+def test_static_pass_reports_graph_problems() -> None:
+    compiled = CompiledGraph.build(_graph())
+    assert _messages(compiled.diagnostics) == [
+        "Edge 'e2' references missing node 'ghost'; ignoring it.",
+        "Thought 'a': note pattern id 'no_such_pattern' has no generator.",
+        "Thought 'orphan' is not reachable from any start node.",
+        "Join 'j' has no inputs and will never release.",
+        "Switch 'sw' has no outgoing edges; its tokens are dropped.",
+    ]
+    assert compiled.thought_specs["a"] is None
+    assert compiled.thought_specs["orphan"].note_pattern_id == "pulse"
+    assert "e2" not in compiled.edge_index
+    assert compiled.outgoing.get("a", []) == []
+
+
+def test_static_diagnostics_are_reported_once_per_revision() -> None:
+    graph = _graph()
+    first = run_stream_runtime(CompileRequest(flowGraph=graph, barIndex=0))
+    assert not first.ok
+    assert len(first.diagnostics) == 5
+    second = run_stream_runtime(CompileRequest(flowGraph=graph, barIndex=1, runtimeState=first.runtimeState))
+    assert second.ok
+    assert second.diagnostics == []
+
+    edited = graph.model_copy(update={"nodes": [*graph.nodes[:2], *graph.nodes[3:]]})
+    third = run_stream_runtime(CompileRequest(flowGraph=edited, barIndex=2, runtimeState=second.runtimeState))
+    assert "Thought 'orphan' is not reachable from any start node." not in _messages(third.diagnostics)
+    assert third.runtimeState.graphRevision != first.runtimeState.graphRevision
+    assert len(third.diagnostics) == 4
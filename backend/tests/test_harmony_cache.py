@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from mind_api.mind_core.stream_runtime.harmony import (
+    HARMONY_CACHE,
+    HarmonyPlanCache,
+    _build_progression_harmony,
+    _resolve_progression_harmony,
+    harmony_cache_key,
+)
+
+_PARAMS = {
+    "harmonyMode": "progression_preset",
+    "progressionPresetId": "pop_i_v_vi_iv",
+    "progressionVariantId": "triads",
+    "chordsPerBar": "2",
+    "fillBehavior": "repeat",
+    "key": "A minor",
+    "registerMin": 52,
+}
+
+
+def test_equal_harmony_params_share_one_plan() -> None:
+    HARMONY_CACHE.clear()
+    first = _resolve_progression_harmony(dict(_PARAMS, notePatternId="pulse"), 4, "1/8")
+    # Params that do not feed the harmony, or equal values in another spelling, hit.
+    second = _resolve_progression_harmony(dict(_PARAMS, notePatternId="alberti_bass", registerMin="52"), 4, "1/8")
+    assert second is first
+    assert (HARMONY_CACHE.hits, HARMONY_CACHE.misses) == (1, 1)
+    assert _resolve_progression_harmony(dict(_PARAMS, key="E minor"), 4, "1/8") is not first
+    assert _resolve_progression_harmony(_PARAMS, 8, "1/8") is not first
+    assert _resolve_progression_harmony(_PARAMS, 4, "1/16") is not first
+    assert HARMONY_CACHE.misses == 4
+
+
+def test_cached_plan_matches_fresh_resolution() -> None:
+    HARMONY_CACHE.clear()
+    for params in (_PARAMS, dict(_PARAMS, harmonyMode="progression_custom", progressionCustom="ii V I")):
+        cached = _resolve_progression_harmony(params, 3, "1/8")
+        fresh = _build_progression_harmony(params, 3, "1/8")
+        assert cached.steps == fresh.steps and cached.steps_per_bar == fresh.steps_per_bar
+
+
+def test_cache_is_bounded_lru() -> None:
+    cache = HarmonyPlanCache(max_entries=2)
+    keys = [harmony_cache_key(dict(_PARAMS, key=key), 4, "1/8") for key in ("C major", "D major", "E major")]
+    for key in keys:
+        cache.put(key, _build_progression_harmony(_PARAMS, 4, "1/8"))
+    assert len(cache) == 2 and cache.get(keys[0]) is None and cache.get(keys[2]) is not None
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from mind_api.mind_core.music_elements.harmony_plan import HarmonyPlan, HarmonyStep
+
+
+def _plan() -> HarmonyPlan:
+    return HarmonyPlan(
+        steps_per_bar=8,
+        steps=[
+            HarmonyStep(bar_index=1, step=4, chord=[62, 65, 69]),
+            HarmonyStep(bar_index=0, step=0, chord=[60, 64, 67]),
+            HarmonyStep(bar_index=1, step=2, chord=[55, 59, 62]),
+        ],
+    )
+
+
+def test_chord_at_step_uses_last_change() -> None:
+    plan = _plan()
+    assert plan.chord_at_step(0, 7) == (60, 64, 67)
+    assert plan.chord_at_step(1, 0) == ()
+    assert plan.chord_at_step(1, 3) == (55, 59, 62)
+    assert plan.chord_at_step(1, 4) == (62, 65, 69)
+    assert plan.chord_at_step(1, 20) == (62, 65, 69)
+    assert plan.chord_at_step(5, 0) == ()
+    assert plan.change_steps_for_bar(1) == [2, 4]
+    assert plan.change_steps_for_bar(3) == [0]
+
+
+def test_chords_for_bar_matches_step_lookups() -> None:
+    plan = _plan()
+    chords = plan.chords_for_bar(1)
+    assert len(chords) == 8
+    assert list(chords) == [plan.chord_at_step(1, step) for step in range(8)]
+    assert plan.chords_for_bar(1, 4) == ((), (), (55, 59, 62), (55, 59, 62))
+    assert plan.chords_for_bar(9) == ((),) * 8
+
+
+def test_chords_are_shared_immutable_tuples() -> None:
+    plan = HarmonyPlan.from_chords([[60, 64, 67]], steps_per_bar=4)
+    assert plan.chord_at_step(0, 1) is plan.chord_at_step(0, 2)
+    assert isinstance(plan.steps[0].chord, tuple)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.offline import main, render_song
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={})
+
+
+def _edge(edge_id: str, from_node: str, to_node: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId="out"),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId="in"),
+        },
+    )
+
+
+def _graph() -> FlowGraph:
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start"),
+            _node("a", "thought", {"durationBars": 3, "notePatternId": "alberti_bass", "rhythmGrid": "1/8"}),
+            _node("b", "thought", {"durationBars": 2, "notePatternId": "pulse", "rhythmGrid": "1/8"}),
+        ],
+        edges=[_edge("e1", "start", "a"), _edge("e2", "a", "b")],
+    )
+
+
+def test_render_matches_bar_by_bar_compilation() -> None:
+    graph = _graph()
+    render = render_song(graph, bars=6, seed=4, bpm=100)
+    expected = []
+    state = None
+    for bar in range(6):
+        res = run_stream_runtime(CompileRequest(flowGraph=graph, barIndex=bar, bpm=100, seed=4, runtimeState=state))
+        state = res.runtimeState
+        expected.extend(event.model_copy(update={"tBeat": event.tBeat + bar * 4.0}) for event in res.events)
+    assert render.bars == 6
+    assert render.events == expected
+    assert render.runtime_state == state
+
+
+def test_render_stops_when_start_chains_are_exhausted() -> None:
+    render = render_song(_graph())
+    assert render.exhausted
+    # a sounds in bars 0-2, b in bars 3-4 and leaves nothing queued.
+    assert render.bars == 5
+    assert max(event.tBeat for event in render.events) < 5 * 4.0
+    assert {event.sourceNodeId for event in render.events} == {"a", "b"}
+
+
+def test_cli_writes_timeline(tmp_path) -> None:
+    source = tmp_path / "song.json"
+    source.write_text(json.dumps({"seed": 2, "flowGraph": _graph().model_dump(by_alias=True)}))
+    target = tmp_path / "out.json"
+    assert main([str(source), "--bars", "4", "-o", str(target)]) == 0
+    payload = json.loads(target.read_text())
+    assert payload["bars"] == 4
+    assert payload["seed"] == 2
+    assert payload["events"] == [e.model_dump() for e in render_song(_graph(), bars=4, seed=2).events]
+
+
+@pytest.mark.parametrize("text", ["[1, 2]", "{not json", '{"flowGraph": {"graphVersion": "nine"}}'])
+def test_cli_reports_bad_input_as_usage_error(tmp_path, capsys, text) -> None:
+    source = tmp_path / "graph.json"
+    source.write_text(text, encoding="utf-8")
+    with pytest.raises(SystemExit) as exc:
+        main([str(source)])
+    assert exc.value.code == 2
+    assert "invalid input" in capsys.readouterr().err
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.parallel import make_thought_executor
+from mind_api.mind_core.stream_runtime.pattern_cache import PATTERN_CACHE
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+PATTERNS = ["alberti_bass", "pulse", "walking_bass", "hook", "airy_arp", "comping_chords"]
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={})
+
+
+def _edge(edge_id: str, from_node: str, to_node: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId="out"),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId="in"),
+        },
+    )
+
+
+def _dense_graph(count: int = 24) -> FlowGraph:
+    # A counter fans out to every Thought in the same bar.
+    nodes = [_node("start", "start"), _node("fan", "counter", {"start": 0, "step": 1})]
+    edges = [_edge("e0", "start", "fan")]
+    for index in range(count):
+        params = {
+            "durationBars": 1 + index % 3,
+            "notePatternId": PATTERNS[index % len(PATTERNS)],
+            "styleSeed": index,
+            "rhythmGrid": "1/7" if index == 5 else "1/8",
+        }
+        nodes.append(_node(f"t{index}", "thought", params))
+        edges.append(_edge(f"f{index}", "fan", f"t{index}"))
+    return FlowGraph(graphVersion=9, nodes=nodes, edges=edges)
+
+
+def _run(graph: FlowGraph, bars: int, executor=None):
+    PATTERN_CACHE.clear()
+    state = None
+    out = []
+    for bar_index in range(bars):
+        res = run_stream_runtime(
+            CompileRequest(flowGraph=graph, barIndex=bar_index, seed=5, runtimeState=state), executor=executor
+        )
+        state = res.runtimeState
+        out.append(res)
+    return out
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_pooled_compilation_matches_serial(mode: str) -> None:
+    graph = _dense_graph()
+    expected = _run(graph, 3)
+    with make_thought_executor(mode, max_workers=2) as executor:
+        pooled = _run(graph, 3, executor)
+    for serial_bar, pooled_bar in zip(expected, pooled):
+        assert pooled_bar.events == serial_bar.events
+        assert pooled_bar.diagnostics == serial_bar.diagnostics
+        assert pooled_bar.runtimeState == serial_bar.runtimeState
+    assert any("invalid grid" in d.message for d in expected[0].diagnostics)
+
+
+def test_unknown_executor_mode() -> None:
+    with pytest.raises(ValueError):
+        make_thought_executor("fiber")
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.pattern_cache import PATTERN_CACHE, CompiledPattern, PatternCache
+from mind_api.mind_core.note_event import NoteEvent
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None, ports: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={}, ports=ports)
+
+
+def _edge(edge_id: str, from_node: str, from_port: str, to_node: str, to_port: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId=from_port),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId=to_port),
+        },
+    )
+
+
+def _graph(params: dict) -> FlowGraph:
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start", ports={"inputs": [], "outputs": [{"id": "out", "type": "flow"}]}),
+            _node("thought", "thought", params=params, ports={"inputs": [{"id": "in", "type": "flow"}], "outputs": []}),
+        ],
+        edges=[_edge("e1", "start", "out", "thought", "in")],
+    )
+
+
+def _sequence(events):
+    return [(round(event.tBeat, 3), tuple(event.pitches), round(event.durationBeats, 3)) for event in events]
+
+
+def _play(graph: FlowGraph, bars: int):
+    runtime_state = None
+    sequences = []
+    for bar_index in range(bars):
+        res = run_stream_runtime(
+            CompileRequest(flowGraph=graph, barIndex=bar_index, bpm=120, seed=4, runtimeState=runtime_state)
+        )
+        sequences.append(_sequence(res.events))
+        runtime_state = res.runtimeState
+    return sequences
+
+
+_PARAMS = {
+    "durationBars": 4,
+    "harmonyMode": "progression_preset",
+    "progressionPresetId": "pop_i_v_vi_iv",
+    "rhythmGrid": "1/12",
+    "notePatternId": "simple_arpeggio",
+}
+
+
+def test_multi_bar_thought_is_compiled_once() -> None:
+    PATTERN_CACHE.clear()
+    first = _play(_graph(_PARAMS), 4)
+    assert PATTERN_CACHE.misses == 1
+    assert PATTERN_CACHE.hits == 3
+
+    PATTERN_CACHE.clear()
+    assert _play(_graph(_PARAMS), 4) == first
+    assert all(first), "Every bar of the Thought should produce events."
+
+
+def test_params_change_misses_without_evicting_the_original() -> None:
+    PATTERN_CACHE.clear()
+    original = _play(_graph(_PARAMS), 1)
+    edited = _play(_graph({**_PARAMS, "notePatternId": "pulse"}), 1)
+    assert original != edited
+    assert len(PATTERN_CACHE) == 2
+    # Clients alternating between the two versions both keep hitting.
+    assert _play(_graph(_PARAMS), 1) == original and PATTERN_CACHE.misses == 2
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = PatternCache(max_entries=2)
+    pattern = CompiledPattern(bar_count=1, render_bar=lambda bar_index: [])
+    cache.put(("a", "p", 0, "1/4"), pattern)
+    cache.put(("b", "p", 0, "1/4"), pattern)
+    assert cache.get(("a", "p", 0, "1/4")) is pattern
+    cache.put(("c", "p", 0, "1/4"), pattern)
+    assert ("b", "p", 0, "1/4") not in cache
+    assert ("a", "p", 0, "1/4") in cache
+    # Another seed for the same node is a separate entry, not a replacement.
+    shared = PatternCache(max_entries=4)
+    shared.put(("a", "p", 0, "1/4"), pattern)
+    shared.put(("a", "p", 1, "1/4"), pattern)
+    assert len(shared) == 2
+
+
+def test_compiled_pattern_renders_each_bar_once() -> None:
+    rendered = []
+
+    def _render(bar_index: int):
+        rendered.append(bar_index)
+        return [NoteEvent(tBeat=0.0, lane="note", pitches=[60 + bar_index])]
+
+    pattern = CompiledPattern(bar_count=16, render_bar=_render)
+    assert pattern.events_for_bar(12)[0].pitches == [72]
+    assert pattern.events_for_bar(12)[0].pitches == [72]
+    assert rendered == [12], "Random access should render only the requested bar, once."
+    assert pattern.events_for_bar(16) == []
+
+
+def test_cached_events_are_copies() -> None:
+    pattern = CompiledPattern(bar_count=1, render_bar=lambda bar_index: [NoteEvent(tBeat=0.0, lane="note", pitches=[60])])
+    events = pattern.events_for_bar(0)
+    events[0].tBeat = 2.0
+    events[0].pitches.append(64)
+    assert pattern.events_for_bar(0)[0].tBeat == 0.0
+    assert pattern.events_for_bar(0)[0].pitches == [60]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.pattern_cache import PATTERN_CACHE
+from mind_api.mind_core.stream_runtime.pattern_registry import get_pattern, register_pattern, supported_pattern_ids
+from mind_api.mind_core.note_event import NoteEvent
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None, ports: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={}, ports=ports)
+
+
+def _edge(edge_id: str, from_node: str, from_port: str, to_node: str, to_port: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId=from_port),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId=to_port),
+        },
+    )
+
+
+def _graph(params: dict) -> FlowGraph:
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start", ports={"inputs": [], "outputs": [{"id": "out", "type": "flow"}]}),
+            _node("thought", "thought", params=params, ports={"inputs": [{"id": "in", "type": "flow"}], "outputs": []}),
+        ],
+        edges=[_edge("e1", "start", "out", "thought", "in")],
+    )
+
+
+def test_builtin_patterns_are_registered() -> None:
+    ids = supported_pattern_ids()
+    assert len(ids) >= 51
+    for pattern_id in ("simple_arpeggio", "alberti_bass", "walking_bass", "hook", "gate_mask"):
+        assert pattern_id in ids
+    walking = get_pattern("walking_bass")
+    assert walking is not None
+    kwargs = walking.generator_kwargs(grid="1/12", seed=3, piece_id="p", register_min=48, register_max=84)
+    assert kwargs == {"seed": 3, "register_min": 36, "register_max": 84}
+
+
+def test_registered_pattern_is_dispatched_by_runtime() -> None:
+    calls = []
+
+    @register_pattern("registry_test_pulse", needs_piece_id=True)
+    def _generate_registry_test_pulse(harmony, bar_index, *, grid, seed, piece_id):
+        calls.append((bar_index, grid, piece_id))
+        return [NoteEvent(tBeat=0.0, lane="note", note=60, pitches=[60], durationBeats=1.0)]
+
+    PATTERN_CACHE.clear()
+    res = run_stream_runtime(
+        CompileRequest(
+            flowGraph=_graph({"notePatternId": "registry_test_pulse", "rhythmGrid": "1/8"}),
+            barIndex=0,
+            bpm=120,
+            seed=1,
+        )
+    )
+    assert calls == [(0, "1/8", "thought")]
+    assert [event.pitches for event in res.events] == [[60]]
+    assert all(event.sourceNodeId == "thought" for event in res.events)
+
+
+def test_unknown_pattern_reports_error() -> None:
+    res = run_stream_runtime(
+        CompileRequest(flowGraph=_graph({"notePatternId": "no_such_pattern"}), barIndex=0, bpm=120, seed=1)
+    )
+    assert res.events == []
+    assert any(d.level == "error" and "no_such_pattern" in d.message for d in res.diagnostics)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.checkpoints import CheckpointStore, seek_runtime_state
+from mind_api.mind_core.stream_runtime.constants import MAX_SEEK_BAR
+from mind_api.mind_core.stream_runtime.streaming import StreamPlayback
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={})
+
+
+def _edge(edge_id: str, from_node: str, to_node: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId="out"),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId="in"),
+        },
+    )
+
+
+def _graph() -> FlowGraph:
+    # a -> counter -> b -> a loops forever, so every bar changes the state.
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start"),
+            _node("a", "thought", {"durationBars": 1, "notePatternId": "pulse"}),
+            _node("b", "thought", {"durationBars": 3, "notePatternId": "alberti_bass"}),
+            _node("c", "counter"),
+        ],
+        edges=[_edge("e1", "start", "a"), _edge("e2", "a", "c"), _edge("e3", "c", "b"), _edge("e4", "b", "a")],
+    )
+
+
+def _replay(bars: int):
+    states = [None]
+    for bar in range(bars):
+        req = CompileRequest(flowGraph=_graph(), barIndex=bar % 16, runtimeState=states[-1], seed=5)
+        states.append(run_stream_runtime(req).runtimeState)
+    return states
+
+
+def test_seek_matches_bar_by_bar_replay() -> None:
+    states = _replay(41)
+    store = CheckpointStore(interval=8)
+    for bar in (0, 1, 7, 8, 9, 40, 23):
+        sought = seek_runtime_state(_graph(), bar, seed=5, store=store)
+        expected = states[bar]
+        assert (sought and sought.model_dump()) == (expected and expected.model_dump())
+    assert len(store) == 5 and (store.hits, store.misses) == (3, 3)
+
+
+def test_checkpoints_are_keyed_by_seed_and_start_filter() -> None:
+    store = CheckpointStore(interval=4)
+    seek_runtime_state(_graph(), 9, seed=5, store=store)
+    seek_runtime_state(_graph(), 9, seed=6, store=store)
+    seek_runtime_state(_graph(), 9, seed=5, start_node_ids=["start"], store=store)
+    assert store.hits == 0 and len(store) == 6
+    returned = seek_runtime_state(_graph(), 8, seed=5, store=store)
+    returned.counters["c"] = 99
+    assert seek_runtime_state(_graph(), 8, seed=5, store=store).counters["c"] != 99
+
+
+def test_stream_seek_resumes_like_continuous_playback() -> None:
+    payload = {"type": "subscribe", "flowGraph": _graph().model_dump(by_alias=True), "seed": 5, "lookaheadBars": 1}
+    continuous = StreamPlayback()
+    continuous.handle(payload)
+    bars = {}
+    for bar in range(0, 22):
+        for message in continuous.handle({"type": "ack", "bar": bar}):
+            bars[message["bar"]] = message["events"]
+
+    jumped = StreamPlayback()
+    first = jumped.handle({**payload, "fromBar": 18})
+    assert [(message["bar"], message["events"]) for message in first[1:]] == [(18, bars[18])]
+    assert jumped.handle({"type": "ack", "bar": 18})[0]["events"] == bars[19]
+    reply = jumped.handle({"type": "seek", "bar": 5})
+    assert [(message["bar"], message["events"]) for message in reply] == [(5, bars[5])]
+    assert jumped.handle({"type": "seek", "bar": "x"})[0]["type"] == "error"
+
+
+def test_full_playback_thins_checkpoints_instead_of_refusing_them() -> None:
+    store = CheckpointStore(interval=2, max_checkpoints=4)
+    states = _replay(21)
+    assert seek_runtime_state(_graph(), 20, seed=5, store=store).model_dump() == states[20].model_dump()
+    # 2,4,6,8 filled the playback; the stride doubled to 4 and then to 8.
+    assert len(store) <= 4
+    key = next(iter(store._playbacks))
+    assert store._playbacks[key].stride == 8 and sorted(store._playbacks[key].checkpoints) == [8, 16]
+    assert store.nearest(key, 20)[0] == 16
+
+
+def test_seek_target_is_capped() -> None:
+    store = CheckpointStore(interval=1024)
+    assert seek_runtime_state(_graph(), 10**9, seed=5, store=store).model_dump() == (
+        seek_runtime_state(_graph(), MAX_SEEK_BAR, seed=5, store=store).model_dump()
+    )
+    assert store.hits == 1
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import pytest
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.sessions import (
+    SessionStore,
+    StaleGraphRevisionError,
+    UnknownSessionError,
+    compile_session_bar,
+)
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None, ports: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={}, ports=ports)
+
+
+def _edge(edge_id: str, from_node: str, from_port: str, to_node: str, to_port: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId=from_port),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId=to_port),
+        },
+    )
+
+
+def _graph(pattern: str = "alberti_bass") -> FlowGraph:
+    flow_ports = {"inputs": [{"id": "in", "type": "flow"}], "outputs": [{"id": "out", "type": "flow"}]}
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start", ports={"inputs": [], "outputs": [{"id": "out", "type": "flow"}]}),
+            _node("a", "thought", params={"durationBars": 2, "notePatternId": pattern}, ports=flow_ports),
+            _node("b", "thought", params={"durationBars": 1, "notePatternId": "pulse"}, ports=flow_ports),
+        ],
+        edges=[_edge("e1", "start", "out", "a", "in"), _edge("e2", "a", "out", "b", "in")],
+    )
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_session_matches_stateless_compilation() -> None:
+    graph = _graph()
+    store = SessionStore()
+    session = store.create(graph, seed=9, bpm=100)
+    state = None
+    for bar_index in range(5):
+        expected = run_stream_runtime(
+            CompileRequest(flowGraph=graph, barIndex=bar_index, bpm=100, seed=9, runtimeState=state)
+        )
+        state = expected.runtimeState
+        res = compile_session_bar(store.get(session.session_id), bar_index=bar_index)
+        assert res.runtimeState is None
+        assert res.sessionId == session.session_id
+        assert [e.model_dump() for e in res.events] == [e.model_dump() for e in expected.events]
+    assert session.runtime_state == state
+
+
+def test_graph_revision_must_match_or_be_resent() -> None:
+    store = SessionStore()
+    session = store.create(_graph(), revision="r1")
+    compile_session_bar(session, bar_index=0, revision="r1")
+    with pytest.raises(StaleGraphRevisionError):
+        compile_session_bar(session, bar_index=1, revision="r2")
+    res = compile_session_bar(session, bar_index=1, revision="r2", graph=_graph("pulse"))
+    assert res.graphRevision == "r2"
+    assert session.graph_revision == "r2"
+
+
+def test_store_is_bounded_and_expires_idle_sessions() -> None:
+    clock = _Clock()
+    store = SessionStore(max_sessions=2, idle_seconds=10, clock=clock)
+    first = store.create(_graph())
+    second = store.create(_graph())
+    clock.now = 5
+    store.get(first.session_id)
+    third = store.create(_graph())
+    assert second.session_id not in store
+    assert first.session_id in store and third.session_id in store
+
+    clock.now = 14
+    store.get(third.session_id)
+    clock.now = 16
+    with pytest.raises(UnknownSessionError):
+        store.get(first.session_id)
+    assert len(store) == 1
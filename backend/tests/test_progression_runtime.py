@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from mind_api.mind_core.stream_runtime import run_stream_runtime
 from mind_api.mind_core.theory import parse_key, resolve_roman_chord
+from mind_api.mind_core.theory.voicing import register_chord
 from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
 
 
@@ -29,19 +30,6 @@ def _graph(nodes: list[FlowGraphNode], edges: list[FlowGraphEdge]) -> FlowGraph:
     return FlowGraph(graphVersion=9, nodes=nodes, edges=edges)
 
 
-def _pitch_classes_to_midi(pitch_classes: list[int], register_min: int, register_max: int) -> list[int]:
-    voiced = []
-    base = register_min
-    for pc in pitch_classes:
-        midi = base + ((pc - base) % 12)
-        while midi < register_min:
-            midi += 12
-        while midi > register_max:
-            midi -= 12
-        voiced.append(midi)
-    return voiced
-
-
 def _compile_bar(graph: FlowGraph, bar_index: int, runtime_state=None):
     req = CompileRequest(flowGraph=graph, barIndex=bar_index, bpm=120, runtimeState=runtime_state)
     res = run_stream_runtime(req)
@@ -165,8 +153,8 @@ def test_chords_per_bar_two_changes_mid_bar() -> None:
     )
     res = _compile_bar(graph, 0)
     key = parse_key("C major")
-    chord_a = _pitch_classes_to_midi(resolve_roman_chord(key, "I", "triads"), 60, 72)
-    chord_b = _pitch_classes_to_midi(resolve_roman_chord(key, "V", "triads"), 60, 72)
+    chord_a = register_chord(resolve_roman_chord(key, "I", "triads"), 60, 72)
+    chord_b = register_chord(resolve_roman_chord(key, "V", "triads"), 60, 72)
     early_events = [event for event in res.events if event.tBeat < 2.0]
     late_events = [event for event in res.events if event.tBeat >= 2.0]
     assert early_events
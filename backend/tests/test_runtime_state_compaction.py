@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.compiled_graph import CompiledGraph
+from mind_api.mind_core.stream_runtime.runtime_state import compact_runtime_state, runtime_state_size
+from mind_api.models import (
+    CompileRequest,
+    FlowGraph,
+    FlowGraphEdge,
+    FlowGraphEdgeEndpoint,
+    FlowGraphNode,
+    StreamRuntimeState,
+)
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None, ports: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ports=ports, ui={})
+
+
+def _edge(edge_id: str, from_node: str, to_node: str, to_port: str = "in") -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId="out"),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId=to_port),
+        },
+    )
+
+
+def _graph() -> FlowGraph:
+    join_ports = {"inputs": [{"id": "i1", "type": "flow"}, {"id": "i2", "type": "flow"}], "outputs": []}
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start"),
+            _node("a", "thought", {"durationBars": 1, "notePatternId": "pulse"}),
+            _node("b", "thought", {"durationBars": 2, "notePatternId": "pulse"}),
+            _node("c", "counter"),
+            _node("j", "join", ports=join_ports),
+        ],
+        edges=[
+            _edge("e1", "start", "a"),
+            _edge("e2", "start", "b"),
+            _edge("e3", "a", "c"),
+            _edge("e4", "c", "j", "i1"),
+            _edge("e5", "b", "j", "i2"),
+        ],
+    )
+
+
+def test_compaction_drops_entries_for_missing_nodes() -> None:
+    compiled = CompiledGraph.build(_graph())
+    state = StreamRuntimeState(
+        counters={"c": 3, "gone": 1},
+        joins={"j": 0b111, "old-join": 1},
+        lastSwitchRoutes={"old-switch": "x"},
+        startQueues={"start": ["e2", "e9"], "old-start": ["e7"]},
+        startEdgePositions={"start": 1, "old-start": 1},
+        startActiveChains={"start": 1, "old-start": 2},
+    )
+    compact_runtime_state(state, compiled)
+    assert state.counters == {"c": 3}
+    assert state.joins == {"j": 0b11}
+    assert state.lastSwitchRoutes == {}
+    assert state.startQueues == {"start": ["e2"]}
+    assert state.startEdgePositions == {"start": 1} and state.startActiveChains == {"start": 1}
+
+
+def test_runtime_compacts_state_from_another_revision() -> None:
+    stale = StreamRuntimeState(started=True, counters={"gone": 4}, joins={"gone": 1}, graphRevision="old")
+    res = run_stream_runtime(CompileRequest(flowGraph=_graph(), barIndex=0, runtimeState=stale))
+    assert "gone" not in res.runtimeState.counters and "gone" not in res.runtimeState.joins
+
+
+def test_join_arrivals_are_port_bits() -> None:
+    state = None
+    masks = []
+    for bar in range(5):
+        res = run_stream_runtime(CompileRequest(flowGraph=_graph(), barIndex=bar, runtimeState=state))
+        state = res.runtimeState
+        masks.append(state.joins["j"])
+    # i1 arrives through the counter in bar 1; b then plays bars 2-3 and its token releases the join in bar 4.
+    assert masks == [0, 0b01, 0b01, 0b01, 0]
+
+
+def test_list_form_joins_are_folded_into_masks() -> None:
+    # States saved before joins became bit masks listed the arrived port ids.
+    legacy = StreamRuntimeState.model_validate(
+        {"started": True, "joins": {"j": ["i2"], "gone": ["x"]}, "graphRevision": CompiledGraph.build(_graph()).graph_hash}
+    )
+    assert legacy.joins == {} and legacy.legacyJoinPorts == {"j": ["i2"], "gone": ["x"]}
+    assert "legacyJoinPorts" not in legacy.model_dump()
+    res = run_stream_runtime(CompileRequest(flowGraph=_graph(), barIndex=0, runtimeState=legacy))
+    assert res.runtimeState.joins == {"j": 0b10} and res.runtimeState.legacyJoinPorts == {}
+
+
+def test_state_size_is_flat_over_long_runs() -> None:
+    state = None
+    sizes = []
+    for bar in range(64):
+        state = run_stream_runtime(CompileRequest(flowGraph=_graph(), barIndex=bar % 16, runtimeState=state)).runtimeState
+        sizes.append(runtime_state_size(state))
+    assert max(sizes[16:]) <= max(sizes[:16])
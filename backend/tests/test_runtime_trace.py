@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.sessions import SessionStore, compile_session_bar
+from mind_api.mind_core.stream_runtime.trace import JOIN_WAITING, RuntimeTrace, TraceRecord, TraceRingBuffer
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={})
+
+
+def _edge(edge_id: str, from_node: str, to_node: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId="out"),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId="in"),
+        },
+    )
+
+
+def _graph() -> FlowGraph:
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start"),
+            _node("c", "counter", {"start": 0, "step": 2}),
+            _node("a", "thought", {"durationBars": 2, "notePatternId": "pulse"}),
+        ],
+        edges=[_edge("e1", "start", "c"), _edge("e2", "c", "a")],
+    )
+
+
+def test_trace_is_only_returned_for_debug_requests() -> None:
+    quiet = run_stream_runtime(CompileRequest(flowGraph=_graph(), barIndex=0))
+    assert quiet.debugTrace == []
+    traced = run_stream_runtime(CompileRequest(flowGraph=_graph(), barIndex=0, debug=True))
+    assert traced.debugTrace == [
+        "Start: emitted initial tokens.",
+        "Start start: emitted edge e1.",
+        "Counter c: value 2, emitted 1 tokens.",
+        "Thought a: started (2 bars).",
+    ]
+    assert traced.events == quiet.events
+    assert traced.runtimeState == quiet.runtimeState
+
+
+def test_active_node_ids_are_reported_without_debug() -> None:
+    first = run_stream_runtime(CompileRequest(flowGraph=_graph(), barIndex=0))
+    assert first.activeNodeIds == ["start", "c", "a"]
+    second = run_stream_runtime(CompileRequest(flowGraph=_graph(), barIndex=1, runtimeState=first.runtimeState))
+    # Same nodes the trace names, in the same order.
+    assert second.activeNodeIds == ["a"]
+
+
+def test_records_format_lazily() -> None:
+    record = TraceRecord(JOIN_WAITING, ("j", 0b011, {"i1": 1, "i2": 2, "i3": 4}))
+    assert record.format() == "Join j: waiting (2/3) [i1, i2]."
+
+
+def test_ring_buffer_keeps_the_last_bars() -> None:
+    buffer = TraceRingBuffer(3)
+    for bar in range(5):
+        buffer.push(RuntimeTrace(bar))
+    assert len(buffer) == 3
+    assert [trace.bar_index for trace in buffer.last(2)] == [3, 4]
+    assert buffer.last(0) == []
+
+
+def test_session_collects_trace_without_debug() -> None:
+    store = SessionStore()
+    session = store.create(_graph(), trace_bars=2)
+    responses = [compile_session_bar(session, bar_index=bar) for bar in range(3)]
+    assert all(res.debugTrace == [] for res in responses)
+    bars = session.trace_buffer.last(5)
+    assert [trace.bar_index for trace in bars] == [1, 2]
+    assert [trace.lines() for trace in bars] == [["Thought a: completed, emitted 0 tokens."], []]
+    assert store.create(_graph()).trace_buffer is None
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import pytest
+
+from mind_api.mind_core.stream_runtime.graph_delta import GraphDeltaError
+from mind_api.mind_core.stream_runtime.pattern_cache import PATTERN_CACHE
+from mind_api.mind_core.stream_runtime.sessions import SessionStore, StaleGraphRevisionError, apply_session_delta
+from mind_api.models import FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={})
+
+
+def _edge(edge_id: str, from_node: str, to_node: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId="out"),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId="in"),
+        },
+    )
+
+
+def _graph() -> FlowGraph:
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start"),
+            _node("a", "thought", {"durationBars": 4, "notePatternId": "alberti_bass"}),
+            _node("b", "thought", {"durationBars": 1, "notePatternId": "pulse"}),
+            _node("c", "thought", {"durationBars": 1, "notePatternId": "pulse"}),
+        ],
+        edges=[_edge("e1", "start", "a"), _edge("e2", "a", "b"), _edge("e3", "start", "c")],
+    )
+
+
+def _playing_session():
+    session = SessionStore().create(_graph(), seed=3)
+    session.compile_bar(0)
+    session.compile_bar(1)
+    return session
+
+
+def test_param_edit_matches_resending_the_graph() -> None:
+    ops = [{"op": "set_params", "nodeId": "a", "params": {"notePatternId": "pulse"}}]
+    patched = _playing_session()
+    previous = patched.compiled
+    assert apply_session_delta(patched, ops, revision=patched.graph_revision) == {"a"}
+    assert patched.compiled.thought_specs["b"] is previous.thought_specs["b"]
+    assert patched.compiled.thought_specs["a"] is not previous.thought_specs["a"]
+    assert patched.runtime_state.activeThoughts["a"].barOffset == 2
+
+    resent = _playing_session()
+    resent.set_graph(patched.graph)
+    for bar in range(2, 6):
+        assert patched.compile_bar(bar).events == resent.compile_bar(bar).events
+
+
+def test_an_edit_in_one_session_keeps_other_sessions_patterns() -> None:
+    PATTERN_CACHE.clear()
+    edited, other = _playing_session(), _playing_session()
+    edited.apply_delta([{"op": "set_params", "nodeId": "a", "params": {"notePatternId": "pulse"}}])
+    misses = PATTERN_CACHE.misses
+    other.compile_bar(2)
+    # The untouched session still plays "a" from its cached pattern.
+    assert PATTERN_CACHE.misses == misses
+
+
+def test_removing_an_active_thought_moves_its_start_on() -> None:
+    session = _playing_session()
+    assert "a" in session.runtime_state.activeThoughts
+    session.apply_delta([{"op": "remove_node", "nodeId": "a"}])
+    state = session.runtime_state
+    assert state.activeThoughts == {}
+    assert [(token.nodeId, token.viaEdgeId) for token in state.activeTokens] == [("c", "e3")]
+    assert state.startActiveChains["start"] == 1 and state.startEdgePositions["start"] == 1
+    assert [event.tBeat for event in session.compile_bar(2).events]
+
+
+def test_shortened_thought_finishes_at_next_bar() -> None:
+    session = _playing_session()
+    session.apply_delta([{"op": "set_params", "nodeId": "a", "params": {"durationBars": 1}}])
+    assert session.runtime_state.activeThoughts["a"].remainingBars == 1
+    session.compile_bar(2)
+    assert session.runtime_state.activeThoughts == {}
+    assert [token.nodeId for token in session.runtime_state.activeTokens] == ["b"]
+
+
+def test_rejected_delta_leaves_session_unchanged() -> None:
+    session = _playing_session()
+    revision, state = session.graph_revision, session.runtime_state
+    with pytest.raises(GraphDeltaError):
+        session.apply_delta([{"op": "set_params", "nodeId": "a", "params": {}}, {"op": "remove_edge", "edgeId": "x"}])
+    with pytest.raises(StaleGraphRevisionError):
+        apply_session_delta(session, [{"op": "remove_node", "nodeId": "b"}], revision="old")
+    assert session.graph_revision == revision and session.runtime_state is state
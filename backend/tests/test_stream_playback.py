@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import pytest
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.graph_delta import GraphDeltaError, apply_graph_delta
+from mind_api.mind_core.stream_runtime.constants import MAX_SEEK_BAR
+from mind_api.mind_core.stream_runtime.streaming import StreamPlayback
+from mind_api.models import CompileRequest, FlowGraph
+
+
+def _graph_payload() -> dict:
+    flow_ports = {"inputs": [{"id": "in", "type": "flow"}], "outputs": [{"id": "out", "type": "flow"}]}
+    return {
+        "graphVersion": 9,
+        "nodes": [
+            {"id": "start", "type": "start", "ports": {"inputs": [], "outputs": [{"id": "out", "type": "flow"}]}},
+            {"id": "a", "type": "thought", "params": {"durationBars": 2, "notePatternId": "alberti_bass"}, "ports": flow_ports},
+            {"id": "b", "type": "thought", "params": {"durationBars": 1, "notePatternId": "pulse"}, "ports": flow_ports},
+        ],
+        "edges": [
+            {"id": "e1", "from": {"nodeId": "start", "portId": "out"}, "to": {"nodeId": "a", "portId": "in"}},
+            {"id": "e2", "from": {"nodeId": "a", "portId": "out"}, "to": {"nodeId": "b", "portId": "in"}},
+        ],
+    }
+
+
+def _subscribe(playback: StreamPlayback, **extra):
+    return playback.handle({"type": "subscribe", "flowGraph": _graph_payload(), "seed": 2, "bpm": 120, **extra})
+
+
+def test_subscribe_pushes_lookahead_and_acks_release_more() -> None:
+    playback = StreamPlayback()
+    replies = _subscribe(playback, lookaheadBars=3)
+    assert replies[0]["type"] == "subscribed"
+    assert [reply["bar"] for reply in replies[1:]] == [0, 1, 2]
+    assert playback.handle({"type": "ack", "bar": 0}) and playback.next_bar == 4
+    assert playback.handle({"type": "ack", "bar": 0}) == []
+    assert [reply["bar"] for reply in playback.handle({"type": "ack", "bar": 3})] == [4, 5, 6]
+
+
+def test_streamed_bars_match_stateless_compile() -> None:
+    playback = StreamPlayback()
+    bars = _subscribe(playback, lookaheadBars=4)[1:]
+    graph = FlowGraph.model_validate(_graph_payload())
+    state = None
+    for bar in bars:
+        res = run_stream_runtime(
+            CompileRequest(flowGraph=graph, barIndex=bar["bar"], bpm=120, seed=2, runtimeState=state)
+        )
+        state = res.runtimeState
+        assert bar["events"] == [event.model_dump() for event in res.events]
+
+
+def test_graph_delta_applies_to_following_bars() -> None:
+    playback = StreamPlayback()
+    _subscribe(playback, lookaheadBars=1)
+    reply = playback.handle(
+        {"type": "graph_delta", "ops": [{"op": "set_params", "nodeId": "a", "params": {"notePatternId": "pulse"}}]}
+    )
+    assert reply[0]["type"] == "graph_applied"
+    assert reply[0]["nodeIds"] == ["a"] and reply[0]["fromBar"] == 1
+    assert playback.session.graph.nodes[1].params["notePatternId"] == "pulse"
+    assert playback.handle({"type": "graph_delta", "ops": [{"op": "remove_edge", "edgeId": "nope"}]})[0]["type"] == "error"
+
+
+def test_messages_before_subscribe_are_rejected() -> None:
+    playback = StreamPlayback()
+    assert playback.handle({"type": "ack", "bar": 1})[0]["type"] == "error"
+    assert playback.handle([1, 2])[0]["type"] == "error"
+
+
+def test_apply_graph_delta_removes_node_edges() -> None:
+    graph = FlowGraph.model_validate(_graph_payload())
+    updated, touched = apply_graph_delta(graph, [{"op": "remove_node", "nodeId": "b"}])
+    assert [node.id for node in updated.nodes] == ["start", "a"]
+    assert [edge.id for edge in updated.edges] == ["e1"]
+    assert touched == {"a", "b"}
+    assert len(graph.nodes) == 3
+    with pytest.raises(GraphDeltaError):
+        apply_graph_delta(graph, [{"op": "explode"}])
+
+
+def test_acks_past_the_last_sent_bar_are_capped() -> None:
+    playback = StreamPlayback()
+    _subscribe(playback, lookaheadBars=2)
+    assert [reply["bar"] for reply in playback.handle({"type": "ack", "bar": 5000})] == [2, 3]
+    assert playback.acked_bar == 1 and playback.next_bar == 4
+    replies = _subscribe(StreamPlayback(), lookaheadBars=1, fromBar=10**9)
+    assert [reply["bar"] for reply in replies[1:]] == [MAX_SEEK_BAR]
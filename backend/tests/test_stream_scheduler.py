@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.constants import MAX_TOKENS_PER_BAR
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _node(node_id: str, node_type: str, params: dict | None = None) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type=node_type, params=params or {}, ui={})
+
+
+def _edge(edge_id: str, from_node: str, to_node: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId=from_node, portId="out"),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId="in"),
+        },
+    )
+
+
+def test_fan_out_loop_halts_once_at_the_token_cap() -> None:
+    # A counter feeding itself twice doubles the ready queue on every firing.
+    graph = FlowGraph(
+        graphVersion=9,
+        nodes=[_node("start", "start"), _node("c", "counter", {"start": 0, "step": 1})],
+        edges=[_edge("e0", "start", "c"), _edge("loop1", "c", "c"), _edge("loop2", "c", "c")],
+    )
+    res = run_stream_runtime(CompileRequest(flowGraph=graph, barIndex=0, debug=True))
+    caps = [d for d in res.diagnostics if d.message.startswith("Safety cap reached")]
+    assert len(caps) == 1
+    stats = res.schedulerStats
+    assert stats is not None
+    assert stats.tokensImmediate >= MAX_TOKENS_PER_BAR - 1
+    assert stats.tokensDropped > 0
+    assert stats.tokensProcessed == stats.nodeFirings + 1
+    assert res.runtimeState.activeTokens == []
+
+
+def test_stats_track_deferred_tokens_and_only_ship_in_debug() -> None:
+    graph = FlowGraph(
+        graphVersion=9,
+        nodes=[
+            _node("start", "start"),
+            _node("a", "thought", {"durationBars": 1, "notePatternId": "pulse"}),
+            _node("b", "thought", {"durationBars": 1, "notePatternId": "pulse"}),
+        ],
+        edges=[_edge("e1", "start", "a"), _edge("e2", "a", "b")],
+    )
+    res = run_stream_runtime(CompileRequest(flowGraph=graph, barIndex=0, debug=True))
+    stats = res.schedulerStats
+    assert (stats.tokensProcessed, stats.tokensImmediate, stats.tokensDeferred) == (2, 1, 1)
+    assert [token.nodeId for token in res.runtimeState.activeTokens] == ["b"]
+    assert res.runtimeState.startQueues == {"start": []}
+
+    quiet = run_stream_runtime(CompileRequest(flowGraph=graph, barIndex=0))
+    assert quiet.schedulerStats is None
+    assert quiet.events == res.events
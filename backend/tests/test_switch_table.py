@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from mind_api.mind_core.stream_runtime.switch_table import ALWAYS, NEVER, RANDOM, compile_switch
+from mind_api.models import FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _edge(edge_id: str, from_port: str, to_node: str) -> FlowGraphEdge:
+    return FlowGraphEdge(
+        id=edge_id,
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId="sw", portId=from_port),
+            "to": FlowGraphEdgeEndpoint(nodeId=to_node, portId="in"),
+        },
+    )
+
+
+def _switch(params: dict) -> FlowGraphNode:
+    return FlowGraphNode(id="sw", type="switch", params=params, ui={})
+
+
+OUTGOING = [_edge("ea", "a", "x"), _edge("eb", "b", "y"), _edge("eb2", "b", "z"), _edge("ed", "default", "w")]
+
+
+def _ids(edges) -> list[str]:
+    return [edge.id for edge in edges]
+
+
+def test_branch_table_groups_edges_and_precomputes_conditions() -> None:
+    table = compile_switch(
+        _switch(
+            {
+                "branches": [
+                    {"id": "a", "condition": {"type": "manual", "value": "go"}},
+                    {"id": "b", "condition": {"type": "random", "value": "0.25"}},
+                    {"id": "c", "condition": {"type": "counter", "op": "~", "value": 1}},
+                    {"id": "d"},
+                ],
+                "manualSelection": "stop",
+            }
+        ),
+        OUTGOING,
+    )
+    kinds = [branch.kind for branch in table.branches]
+    assert kinds == [NEVER, RANDOM, NEVER, ALWAYS]
+    assert _ids(table.branches[1].edges) == ["eb", "eb2"]
+    assert table.branches[1].threshold == 0.25
+    assert table.branches[1].salt == sum(ord(ch) for ch in "swb")
+    assert _ids(table.fallback_edges) == ["ed"]
+
+
+def test_first_match_wins() -> None:
+    branches = [
+        {"id": "a", "condition": {"type": "counter", "counterId": "c", "op": ">=", "value": 2}},
+        {"id": "b", "condition": {"type": "barIndex", "op": "==", "value": 3}},
+    ]
+    first = compile_switch(_switch({"branches": branches}), OUTGOING)
+    assert first.evaluate({"c": 2}, 3, 0) == ([OUTGOING[0]], ["a"])
+    assert first.evaluate({"c": 1}, 3, 0) == (OUTGOING[1:3], ["b"])
+    assert first.evaluate({}, 0, 0) == ([OUTGOING[3]], ["default"])
+
+
+def test_random_branch_follows_seeded_threshold() -> None:
+    certain = compile_switch(_switch({"branches": [{"id": "a", "condition": {"type": "random", "threshold": 1}}]}), OUTGOING)
+    never = compile_switch(_switch({"branches": [{"id": "a", "condition": {"type": "random", "threshold": 0}}]}), OUTGOING)
+    for bar in range(16):
+        assert certain.evaluate({}, bar, 7)[1] == ["a"]
+        assert never.evaluate({}, bar, 7)[1] == ["default"]
+
+
+def test_fallback_without_default_port() -> None:
+    table = compile_switch(_switch({"branches": [{"id": "q", "condition": {"type": "always", "value": False}}]}), OUTGOING[:2])
+    assert table.evaluate({}, 0, 0) == ([OUTGOING[0]], ["a"])
+    assert compile_switch(_switch({}), []).evaluate({}, 0, 0) == ([], ["default"])
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from mind_api.main import create_app
+from mind_api.mind_core.stream_runtime import run_stream_runtime
+from mind_api.mind_core.stream_runtime.pattern_cache import PATTERN_CACHE
+from mind_api.mind_core.stream_runtime.runtime_state import runtime_state_size
+from mind_api.mind_core.telemetry import TELEMETRY, RuntimeTelemetry, configure_logging, sampled_debug
+from mind_api.models import CompileRequest, FlowGraph, FlowGraphEdge, FlowGraphEdgeEndpoint, FlowGraphNode
+
+
+def _graph() -> FlowGraph:
+    edge = FlowGraphEdge(
+        id="e1",
+        **{
+            "from": FlowGraphEdgeEndpoint(nodeId="start", portId="out"),
+            "to": FlowGraphEdgeEndpoint(nodeId="a", portId="in"),
+        },
+    )
+    return FlowGraph(
+        graphVersion=9,
+        nodes=[
+            FlowGraphNode(id="start", type="start", params={}, ui={}),
+            FlowGraphNode(id="a", type="thought", params={"durationBars": 2, "notePatternId": "pulse"}, ui={}),
+        ],
+        edges=[edge],
+    )
+
+
+def test_importing_the_runtime_leaves_root_logging_alone() -> None:
+    assert logging.getLogger().level == logging.WARNING
+
+
+def test_app_applies_log_levels_on_startup() -> None:
+    logger = logging.getLogger("mind_api.test_startup")
+    app = create_app({"mind_api.test_startup": "DEBUG"})
+    assert logger.level == logging.NOTSET, "Building the app should not touch logging."
+
+    async def _start() -> None:
+        async with app.router.lifespan_context(app):
+            assert logger.level == logging.DEBUG
+
+    try:
+        asyncio.run(_start())
+    finally:
+        logger.setLevel(logging.NOTSET)
+
+
+def test_compiles_count_instead_of_logging(caplog) -> None:
+    PATTERN_CACHE.clear()
+    TELEMETRY.reset()
+    with caplog.at_level(logging.INFO, logger="mind_api"):
+        state = None
+        for bar in range(2):
+            state = run_stream_runtime(CompileRequest(flowGraph=_graph(), barIndex=bar, runtimeState=state)).runtimeState
+    assert caplog.records == []
+    counters = TELEMETRY.snapshot()
+    assert counters["runtime.bars"] == 2
+    assert counters["runtime.thought_jobs"] == 2
+    assert counters["thought.patterns_compiled"] == 1
+    assert counters["thought.bars_rendered"] == 2
+
+
+def test_debug_records_are_sampled(caplog) -> None:
+    logger = logging.getLogger("mind_api.test_sampling")
+    telemetry_rate = TELEMETRY.sample_every
+    TELEMETRY.reset()
+    configure_logging({"mind_api.test_sampling": "DEBUG"}, sample_every=3)
+    try:
+        with caplog.at_level(logging.DEBUG, logger="mind_api.test_sampling"):
+            for index in range(7):
+                sampled_debug(logger, "key", "record %s", index)
+        assert [record.getMessage() for record in caplog.records] == ["record 0", "record 3", "record 6"]
+    finally:
+        configure_logging({"mind_api.test_sampling": logging.NOTSET}, sample_every=telemetry_rate)
+
+
+def test_runtime_state_size_is_sampled(caplog) -> None:
+    telemetry_rate = TELEMETRY.sample_every
+    TELEMETRY.reset()
+    configure_logging(sample_every=2)
+    try:
+        sizes = []
+        with caplog.at_level(logging.DEBUG, logger="mind_api.mind_core.stream_runtime.runtime"):
+            state = None
+            for bar in range(3):
+                state = run_stream_runtime(CompileRequest(flowGraph=_graph(), barIndex=bar, runtimeState=state)).runtimeState
+                sizes.append(runtime_state_size(state))
+        assert [record.getMessage() for record in caplog.records] == [
+            f"runtime state after bar 0: {sizes[0]} bytes",
+            f"runtime state after bar 2: {sizes[2]} bytes",
+        ]
+    finally:
+        configure_logging(sample_every=telemetry_rate)
+
+
+def test_counters_accumulate() -> None:
+    telemetry = RuntimeTelemetry()
+    telemetry.incr("a")
+    telemetry.incr("a", 4)
+    assert telemetry.snapshot() == {"a": 5}
+    telemetry.reset()
+    assert telemetry.snapshot() == {}
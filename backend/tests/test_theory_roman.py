@@ -3,11 +3,33 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from mind_api.mind_core.theory.key import parse_key  # noqa: E402
-from mind_api.mind_core.theory.roman import resolve_roman  # noqa: E402
+import pytest  # noqa: E402
+
+from mind_api.mind_core.theory.key import Key, parse_key  # noqa: E402
+from mind_api.mind_core.theory.roman import resolve_roman, resolve_roman_chord, roman_chord_pcs  # noqa: E402
 
 
 def test_roman_c_sharp_minor_i():
     key = parse_key("C# minor")
     pcs = resolve_roman(key, "i")
     assert set(pcs) == {1, 4, 8}
+
+
+def test_parse_key_interns_keys():
+    assert parse_key("A minor") is parse_key(" a  MINOR ")
+    assert parse_key("Bb major") is parse_key("A# major")
+
+
+def test_roman_chord_table_matches_scale_construction():
+    # In minor keys, upper-case V... symbols take the harmonic-minor leading tone.
+    key = parse_key("A minor")
+    assert resolve_roman_chord(key, "V7", "7ths") == [4, 8, 11, 2]
+    assert resolve_roman_chord(key, "v") == [4, 7, 11]
+    assert resolve_roman_chord(key, "ii", "9ths_soft") == [11, 2, 5, 9, 0]
+    assert resolve_roman_chord(key, "iv", "unknown_style") == [2, 5, 9]
+    assert roman_chord_pcs(Key(tonic=14, mode="dorian"), "ii") == (4, 7, 10)
+
+
+def test_unsupported_roman_still_raises():
+    with pytest.raises(ValueError):
+        resolve_roman_chord(parse_key("C major"), "x")
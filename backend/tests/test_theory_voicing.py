@@ -3,7 +3,21 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from mind_api.mind_core.theory.voicing import voice_chord  # noqa: E402
+from mind_api.mind_core.theory.voicing import (  # noqa: E402
+    fit_register,
+    register_chord,
+    voice_chord,
+    voice_progression,
+)
+
+
+def _loop_fold(pitch, low, high):
+    # The per-note loops the closed forms replace.
+    while pitch < low:
+        pitch += 12
+    while pitch > high:
+        pitch -= 12
+    return pitch
 
 
 def test_voice_chord_preserves_input_order():
@@ -16,3 +30,40 @@ def test_voice_chord_keeps_dominant_seventh_spelling_order():
     pitch_classes = [8, 0, 3, 6]
     voiced = voice_chord(pitch_classes, register="mid")
     assert [note % 12 for note in voiced] == pitch_classes
+
+
+def test_closed_form_folds_match_octave_loops():
+    for low in range(30, 70, 7):
+        for high in (low - 5, low, low + 4, low + 11, low + 12, low + 30):
+            for pc in range(-14, 30):
+                lo, hi = min(low, high), max(low, high)
+                expected = _loop_fold(lo + (pc - lo) % 12, lo, hi)
+                assert register_chord([pc], low, high) == [max(0, min(127, expected))]
+                assert fit_register([pc + 40], low, high) == [max(0, min(127, _loop_fold(pc + 40, low, high)))]
+
+
+def test_voice_chord_matches_range_scan():
+    for register in ("low", "mid", "high", "other"):
+        low, high = {"low": (36, 52), "high": (60, 76)}.get(register, (48, 64))
+        for pc in range(-14, 30):
+            in_range = [midi for midi in range(low, high + 1) if midi % 12 == pc]
+            expected = in_range[0] if in_range else _loop_fold(pc, low, high)
+            assert voice_chord([pc], register=register) == [expected]
+
+
+def test_voice_leading_keeps_chords_close():
+    progression = [(0, 4, 7), (7, 11, 2), (), (5, 9, 0)]
+    plain = voice_progression(progression, 48, 84)
+    led = voice_progression(progression, 48, 84, voice_leading=True)
+    assert plain[0] == led[0] == [48, 52, 55]
+    assert led[2] == [] and led[1] == [55, 59, 50]
+    assert led[3] == [53, 57, 48]
+    assert all(48 <= pitch <= 84 for chord in led for pitch in chord)
+    assert [[pitch % 12 for pitch in chord] for chord in led] == [list(chord) for chord in progression]
+
+
+def test_voice_progression_matches_per_slot_voicing():
+    progression = [(0, 4, 7), (), (7, 11, 2, 5), (0, 4, 7)]
+    for low, high in ((48, 84), (60, 64), (70, 55), (120, 140)):
+        expected = [fit_register(register_chord(chord, low, high), low, high) for chord in progression]
+        assert voice_progression(progression, low, high) == expected
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from mind_api.mind_core.determinism import seed_key, use_seed_version
+from mind_api.mind_core.stream_runtime.compiled_graph import CompiledGraph
+from mind_api.mind_core.stream_runtime.melody import _compile_thought_bar
+from mind_api.mind_core.stream_runtime.pattern_cache import PATTERN_CACHE
+from mind_api.mind_core.stream_runtime.thought_spec import build_thought_spec
+from mind_api.mind_core.stream_runtime.utils import _combined_seed
+from mind_api.models import FlowGraph, FlowGraphNode
+
+
+def _node(node_id: str, params: dict) -> FlowGraphNode:
+    return FlowGraphNode(id=node_id, type="thought", params=params, ui={})
+
+
+def test_spec_holds_coerced_params() -> None:
+    spec, diagnostics = build_thought_spec(
+        _node(
+            "t",
+            {
+                "durationBars": "3",
+                "registerMin": "40",
+                "styleSeed": "7",
+                "notePatternId": " Pulse ",
+                "timingIntensity": "0.5",
+                "harmonyMode": "progression_preset",
+                "instrumentPreset": "",
+            },
+        )
+    )
+    assert diagnostics == []
+    assert (spec.duration_bars, spec.register_min, spec.register_max, spec.style_seed) == (3, 40, 84, 7)
+    assert (spec.note_pattern_id, spec.grid, spec.timing_intensity, spec.lane) == ("pulse", "1/12", 0.5, "note")
+    assert not spec.single_chord and spec.instrument_preset is None
+    assert build_thought_spec(_node("t", {"timingIntensity": "loud"}))[0].timing_intensity == 0.0
+    with pytest.raises(FrozenInstanceError):
+        spec.lane = "bass"
+
+
+def test_pattern_seed_matches_per_bar_derivation() -> None:
+    spec, _ = build_thought_spec(_node("t", {"styleSeed": 3, "seedVersion": 1}))
+    with use_seed_version(1):
+        expected = seed_key(_combined_seed(9, 3, "t"), "simple_arpeggio") % 2147483647
+    assert spec.pattern_seed(9) == expected
+    assert spec.pattern_seed(10) != expected
+
+
+def test_spec_drives_compilation_without_reparsing() -> None:
+    node = _node("t", {"durationBars": 2, "notePatternId": "pulse", "instrumentPreset": "piano"})
+    spec, _ = build_thought_spec(node)
+    PATTERN_CACHE.clear()
+    with_spec = [_compile_thought_bar(node, bar, 120.0, [], 4, spec) for bar in range(2)]
+    PATTERN_CACHE.clear()
+    without_spec = [_compile_thought_bar(node, bar, 120.0, [], 4) for bar in range(2)]
+    assert with_spec == without_spec and with_spec[0]
+    assert all(event.preset == "piano" for bar in with_spec for event in bar)
+
+
+def test_compiled_graph_reuses_specs_of_equal_nodes() -> None:
+    graph = FlowGraph(graphVersion=9, nodes=[_node("a", {"notePatternId": "pulse"}), _node("b", {})], edges=[])
+    first = CompiledGraph.build(graph)
+    edited = graph.model_copy(update={"nodes": [_node("a", {"notePatternId": "pulse"}), _node("b", {"lane": "bass"})]})
+    second = CompiledGraph.build(edited, previous=first, touched=frozenset({"a", "b"}))
+    assert second.thought_specs["a"] is first.thought_specs["a"]
+    assert second.thought_specs["b"].lane == "bass"
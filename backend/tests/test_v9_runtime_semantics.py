@@ -117,7 +117,7 @@ def test_join_waits_for_all_inputs() -> None:
     req = CompileRequest(flowGraph=graph, barIndex=0, bpm=120)
     res = run_stream_runtime(req)
     assert res.runtimeState is not None
-    assert res.runtimeState.joins.get("join") in ([], ["in-1"], ["in-2"], ["in-1", "in-2"])
+    assert res.runtimeState.joins.get("join") in (0, 0b01, 0b10, 0b11)
 
 
 def test_or_merge_allows_single_input() -> None:
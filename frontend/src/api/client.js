@@ -33,6 +33,16 @@ export async function compileSession(req) {
   return await postJson('/api/compile', body);
 }
 
+export async function compileSessionRange(req, barCount) {
+  const body = {
+    ...req,
+    barCount,
+    edges: Array.isArray(req.edges) ? req.edges : [],
+    startNodeIds: Array.isArray(req.startNodeIds) ? req.startNodeIds : [],
+  };
+  return await postJson('/api/compile/range', body);
+}
+
 export async function getPresets() {
   return await getJson('/api/presets');
 }
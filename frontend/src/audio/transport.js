@@ -1,8 +1,10 @@
-import { compileSession } from '../api/client.js';
+import { compileSessionRange } from '../api/client.js';
 import { buildCompilePayload } from '../state/compilePayload.js';
 
 const TICK_INTERVAL_MS = 25;
 const LOOKAHEAD_SEC = 0.2;
+// Bars fetched per /api/compile/range round trip; later bars wait in `prefetchedBars`.
+const PREFETCH_BARS = 4;
 const BEATS_PER_BAR = 4;
 const LOG_INTERVAL_MS = 1000;
 
@@ -93,6 +95,38 @@ export function createTransportScheduler({
   // ---------------------------------------------------------------------------
   let compiledBars = new Set(); // stores absolute bar numbers already compiled in this session
 
+  // Responses for upcoming absolute bars from the last range request. They are
+  // only valid for the inputs they were compiled from, so any change to the
+  // graph, seed, tempo or start nodes discards them.
+  let prefetchedBars = new Map();
+  let prefetchSignature = null;
+
+  const compileSignature = (req) => {
+    const { runtimeState: _state, barIndex: _bar, beatStart: _start, beatEnd: _end, ...inputs } = req;
+    const flowGraph = inputs.flowGraph ? { ...inputs.flowGraph, runtime: undefined } : inputs.flowGraph;
+    return JSON.stringify({ ...inputs, flowGraph });
+  };
+
+  const compileBar = async (req, absoluteBar) => {
+    const signature = compileSignature(req);
+    const cached = signature === prefetchSignature ? prefetchedBars.get(absoluteBar) : null;
+    prefetchedBars.delete(absoluteBar);
+    // The backend wraps ranges at its own loop length; only reuse a bar compiled for this barIndex.
+    if (cached && cached.barIndex === req.barIndex) {
+      return cached.res;
+    }
+    const range = await compileSessionRange(req, PREFETCH_BARS);
+    const bars = Array.isArray(range.bars) ? range.bars : [];
+    const rangeLoopBars = toNumber(range.loopBars, loopBars);
+    prefetchedBars = new Map();
+    prefetchSignature = signature;
+    bars.slice(1).forEach((res, offset) => {
+      const barIndex = (req.barIndex + 1 + offset) % rangeLoopBars;
+      prefetchedBars.set(absoluteBar + 1 + offset, { barIndex, res });
+    });
+    return bars[0] || { events: [], diagnostics: [] };
+  };
+
   const describeRenderSinks = () => {
     const noteCard = nodeCards.find(card => card.lane === 'note');
     if (!noteCard || !Array.isArray(noteCard.blocks)) {
@@ -314,9 +348,11 @@ export function createTransportScheduler({
           startNodeIds,
           legacyNodes: graphInputs.legacyNodes,
           useNodeGraph,
+          // Only the executions panel reads the trace; the canvas uses activeNodeIds.
+          debug: Boolean(executionsPanel?.isTraceVisible?.()),
         });
 
-        const res = await compileSession(req);
+        const res = await compileBar(req, absoluteBar);
 
         if (!isPlaying || sessionId !== playbackSession) {
           return;
@@ -333,7 +369,11 @@ export function createTransportScheduler({
           runtimeState = res.runtimeState;
         }
         if (typeof flowStore?.setRuntimeState === 'function') {
-          flowStore.setRuntimeState({ runtimeState, debugTrace: lastDebugTrace });
+          flowStore.setRuntimeState({
+            runtimeState,
+            debugTrace: lastDebugTrace,
+            activeNodeIds: Array.isArray(res.activeNodeIds) ? res.activeNodeIds : [],
+          });
         }
 
         const scheduled = events.map(ev => {
@@ -466,6 +506,8 @@ export function createTransportScheduler({
 
     // Reset compiled bar guard for this playback session.
     compiledBars = new Set();
+    prefetchedBars = new Map();
+    prefetchSignature = null;
 
     if (typeof flowStore?.setPlaybackState === 'function') {
       const fallbackStartNodeId = flowStore.getState?.().runtime?.activeStartNodeId || null;
@@ -476,7 +518,7 @@ export function createTransportScheduler({
     }
 
     if (typeof flowStore?.setRuntimeState === 'function') {
-      flowStore.setRuntimeState({ runtimeState: null, debugTrace: [], playingNodeIds: [] });
+      flowStore.setRuntimeState({ runtimeState: null, debugTrace: [], activeNodeIds: [], playingNodeIds: [] });
     }
 
     const engine = getAudioEngine();
@@ -523,6 +565,8 @@ export function createTransportScheduler({
 
     // Reset compiled bar guard so a new session starts cleanly.
     compiledBars = new Set();
+    prefetchedBars = new Map();
+    prefetchSignature = null;
 
     if (typeof flowStore?.setPlaybackState === 'function') {
       const currentStartNodeId = flowStore.getState?.().runtime?.activeStartNodeId || null;
@@ -530,7 +574,7 @@ export function createTransportScheduler({
     }
 
     if (typeof flowStore?.setRuntimeState === 'function') {
-      flowStore.setRuntimeState({ runtimeState: null, debugTrace: [], playingNodeIds: [] });
+      flowStore.setRuntimeState({ runtimeState: null, debugTrace: [], activeNodeIds: [], playingNodeIds: [] });
     }
 
     updateExecutionsPanel(0, 0);
@@ -42,6 +42,7 @@ export function buildCompilePayload({
   edges = [],
   startNodeIds = [],
   useNodeGraph = false,
+  debug = false,
 }) {
   const normalizedFlowGraph = normalizeFlowGraph(flowGraph);
   if (!useNodeGraph) {
@@ -54,6 +55,7 @@ export function buildCompilePayload({
       flowGraph: normalizedFlowGraph,
       runtimeState,
       nodes: legacyNodes,
+      debug,
     };
   }
 
@@ -70,5 +72,6 @@ export function buildCompilePayload({
     nodes,
     edges,
     startNodeIds: uniqueStartNodeIds,
+    debug,
   };
 }
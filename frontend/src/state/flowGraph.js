@@ -20,6 +20,7 @@ const DEFAULT_STATE = {
   runtime: {
     state: null,
     debugTrace: [],
+    activeNodeIds: [],
     activeStartNodeId: null,
     isPlaying: false,
     playingNodeIds: [],
@@ -108,6 +109,7 @@ function normalizeGraphState(data) {
     runtime: {
       state: null,
       debugTrace: [],
+      activeNodeIds: [],
       activeStartNodeId: null,
       isPlaying: false,
       playingNodeIds: [],
@@ -482,7 +484,7 @@ function createFlowGraphStore({ storageKey = 'mind.flowGraph' } = {}) {
     }, { recordHistory: false });
   };
 
-  const setRuntimeState = ({ runtimeState, debugTrace, playingNodeIds } = {}) => {
+  const setRuntimeState = ({ runtimeState, debugTrace, activeNodeIds, playingNodeIds } = {}) => {
     applyState({
       ...state,
       runtime: {
@@ -491,6 +493,9 @@ function createFlowGraphStore({ storageKey = 'mind.flowGraph' } = {}) {
         debugTrace: debugTrace !== undefined
           ? (Array.isArray(debugTrace) ? debugTrace : [])
           : state.runtime?.debugTrace || [],
+        activeNodeIds: activeNodeIds !== undefined
+          ? (Array.isArray(activeNodeIds) ? activeNodeIds : [])
+          : state.runtime?.activeNodeIds || [],
         playingNodeIds: playingNodeIds !== undefined
           ? (Array.isArray(playingNodeIds) ? playingNodeIds : [])
           : state.runtime?.playingNodeIds || [],
@@ -61,5 +61,15 @@ export function createExecutionsPanel() {
     diagnosticsValue.textContent = diagnosticsText;
   };
 
-  return { element: panel, update };
+  // The runtime trace costs the server extra work per bar; only request it while it can be seen.
+  let onScreen = typeof IntersectionObserver !== 'function';
+  if (!onScreen) {
+    const observer = new IntersectionObserver((entries) => {
+      onScreen = entries.some(entry => entry.isIntersecting);
+    });
+    observer.observe(panel);
+  }
+  const isTraceVisible = () => onScreen && panel.isConnected;
+
+  return { element: panel, update, isTraceVisible };
 }
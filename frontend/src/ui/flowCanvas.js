@@ -251,15 +251,8 @@ export function createFlowCanvas({
     const nodes = currentState.nodes || [];
     const seen = new Set();
     const runtimeState = currentState.runtime?.state || {};
-    const debugTrace = currentState.runtime?.debugTrace || [];
     const playingNodeIds = new Set(currentState.runtime?.playingNodeIds || []);
-    const activeNodeIds = new Set();
-    debugTrace.forEach((line) => {
-      const match = /^(Start|Thought|Counter|Switch|Join)\\s+([^:]+)/.exec(line);
-      if (match) {
-        activeNodeIds.add(match[2]);
-      }
-    });
+    const activeNodeIds = new Set(currentState.runtime?.activeNodeIds || []);
 
     const buildPort = (node, port, direction) => {
       const portEl = document.createElement('div');
@@ -572,12 +565,14 @@ export function createFlowCanvas({
           }
         }
         if (node.type === 'join') {
-          const arrived = runtimeState.joins?.[node.id];
+          // Arrivals are a bit mask over the join's input ports.
+          const arrivedMask = runtimeState.joins?.[node.id];
           const total = node.ports?.inputs?.length || 0;
-          if (Array.isArray(arrived) && total > 0) {
+          if (Number.isInteger(arrivedMask) && total > 0) {
+            const arrived = arrivedMask.toString(2).split('').filter((bit) => bit === '1').length;
             const badge = document.createElement('span');
             badge.className = 'flow-node-badge flow-node-badge-warn';
-            badge.textContent = `Waiting ${arrived.length}/${total}`;
+            badge.textContent = `Waiting ${arrived}/${total}`;
             badgeContainer.appendChild(badge);
           }
         }